@@ -0,0 +1,28 @@
+# django_backend_starter/management/commands/archive_audits.py
+from django.core.management.base import BaseCommand
+
+from django_backend_starter.core.repositories.audit_archive import ARCHIVED_TABLES, AuditArchive
+
+
+class Command(BaseCommand):
+    help = "Moves old LoginAudit/AdminAudit rows into compressed, date-partitioned archive segments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--table", choices=[*ARCHIVED_TABLES, "all"], default="all")
+        parser.add_argument("--older-than-days", type=int, help="defaults to AUDIT_ARCHIVE['RETENTION_DAYS']")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--max-batches", type=int, help="stop after this many batches (rerun to resume)")
+        parser.add_argument("--dir", help="archive directory, defaults to AUDIT_ARCHIVE['DIR']")
+
+    def handle(self, *args, **options):
+        archive = AuditArchive(options["dir"])
+        tables = list(ARCHIVED_TABLES) if options["table"] == "all" else [options["table"]]
+        for table in tables:
+            moved = archive.archive(
+                table,
+                older_than_days=options["older_than_days"],
+                batch_size=options["batch_size"],
+                max_batches=options["max_batches"],
+                on_batch=lambda count, last_id, t=table: self.stdout.write(f"{t}: archived {count} rows up to id {last_id}"),
+            )
+            self.stdout.write(self.style.SUCCESS(f"{table}: {moved} rows moved to {archive.root / table}"))
@@ -0,0 +1,28 @@
+# django_backend_starter/management/commands/backfill_audit_dimensions.py
+import argparse
+
+from django.core.management.base import BaseCommand
+
+from django_backend_starter.core.repositories.audit_dimensions import backfill, ip_addresses, user_agents
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the user agents (and IPs) of LoginAudit rows still stored inline into the lookup tables. "
+        "Migration 0007 does this once; run it again after turning AUDIT_DIMENSIONS options on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="rows per transaction, defaults to AUDIT_DIMENSIONS['BACKFILL_BATCH']")
+        parser.add_argument("--ips", action=argparse.BooleanOptionalAction,
+                            help="also intern IPs (defaults to AUDIT_DIMENSIONS['IP_ADDRESSES'])")
+
+    def handle(self, *args, **options):
+        moved = backfill(
+            batch_size=options["batch_size"],
+            include_ips=options["ips"],
+            on_batch=lambda count, last_id: self.stdout.write(f"interned {count} rows up to id {last_id}"),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {moved} audit rows; user agents {user_agents.stats()}, IPs {ip_addresses.stats()}"
+        ))
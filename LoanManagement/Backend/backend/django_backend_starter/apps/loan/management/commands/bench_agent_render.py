@@ -0,0 +1,89 @@
+# django_backend_starter/management/commands/bench_agent_render.py
+import statistics
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from django_backend_starter.core.entities.user import UserEntity
+from django_backend_starter.core.utils.json_render import FastJSONRenderer, iter_json
+
+
+@dataclass
+class DictUserEntity:
+    """The previous dict-backed UserEntity, rendered the way the views used to (entity.__dict__)."""
+    id: str
+    email: str
+    employee_id: str
+    first_name: str
+    last_name: str
+    contact_number: str
+    role: str
+    branch: str
+    region: str
+    is_active: bool
+
+
+def _rows(count):
+    return [
+        (uuid.uuid4(), f"agent{n}@bench.local", f"EMP{n:06d}", "Tendai", "Moyo",
+         "+263771234567", "agent", f"Branch {n % 40}", f"Region {n % 8}", n % 7 != 0)
+        for n in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compares building and rendering agent lists: dict dataclass + JSONRenderer vs slotted entities + FastJSONRenderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        for size in options["sizes"]:
+            rows = _rows(size)
+            old_bytes = self._build_size(lambda: [DictUserEntity(str(r[0]), *r[1:]) for r in rows])
+            new_bytes = self._build_size(lambda: [UserEntity.from_row(r) for r in rows])
+            self.stdout.write(
+                f"{size} agents: entities {old_bytes / size:.0f} B/agent (dict) vs {new_bytes / size:.0f} B/agent (slots)"
+            )
+
+            old_entities = [DictUserEntity(str(r[0]), *r[1:]) for r in rows]
+            new_entities = [UserEntity.from_row(r) for r in rows]
+            old = JSONRenderer()
+            new = FastJSONRenderer()
+
+            cases = {
+                "JSONRenderer(__dict__)": lambda: old.render(
+                    {"results": [u.__dict__ for u in old_entities], "next_cursor": None}
+                ),
+                "FastJSONRenderer": lambda: new.render({"results": new_entities, "next_cursor": None}),
+                "iter_json (streamed)": lambda: b"".join(
+                    iter_json({}, "results", new_entities, tail=lambda: {"next_cursor": None})
+                ),
+            }
+            outputs = {}
+            for name, render in cases.items():
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    outputs[name] = render()
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"  {name:<24} median {statistics.median(timings):8.1f} ms, "
+                    f"{len(outputs[name]) / 1024:.0f} KiB"
+                )
+            if len(set(outputs.values())) != 1:
+                self.stderr.write("  outputs differ between renderers")
+
+    @staticmethod
+    def _build_size(build):
+        tracemalloc.start()
+        entities = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del entities
+        return size
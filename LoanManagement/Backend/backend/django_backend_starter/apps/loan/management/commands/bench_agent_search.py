@@ -0,0 +1,108 @@
+# django_backend_starter/management/commands/bench_agent_search.py
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.repositories.agent_search import agent_search_index
+
+DOMAIN = "bench-search.local"
+
+FIRST_NAMES = (
+    "Tendai", "Farai", "Rudo", "Tatenda", "Chipo", "Tafadzwa", "Nyasha", "Kudzai", "Rutendo", "Tinashe",
+    "John", "Mary", "Peter", "Grace", "James", "Ruth", "David", "Esther", "Joseph", "Sarah",
+    "Blessing", "Precious", "Memory", "Prosper", "Gift", "Patience", "Simba", "Tapiwa", "Vimbai", "Ropafadzo",
+)
+LAST_NAMES = (
+    "Moyo", "Ncube", "Sibanda", "Dube", "Ndlovu", "Mpofu", "Nyathi", "Chikwanha", "Mutasa", "Chirwa",
+    "Banda", "Phiri", "Zulu", "Mhlanga", "Maphosa", "Gumbo", "Marufu", "Mlambo", "Shumba", "Mukanya",
+    "Smith", "Brown", "Johnson", "Williams", "Taylor", "Mavhunga", "Chinembiri", "Makoni", "Zvobgo", "Tsvangirai",
+)
+REGIONS = ("Harare", "Bulawayo", "Manicaland", "Mashonaland East", "Mashonaland West", "Masvingo",
+           "Matabeleland North", "Matabeleland South", "Midlands", "Mashonaland Central")
+
+
+class Command(BaseCommand):
+    help = "Seeds agents and measures agent search latency (prefix, exact, fuzzy and filtered queries)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100000, help="agents to seed (e.g. 500000)")
+        parser.add_argument("--queries", type=int, default=200, help="measured searches per query kind")
+        parser.add_argument("--keep", action="store_true", help="leave the seeded agents in place")
+
+    def handle(self, *args, **options):
+        if not agent_search_index.supported():
+            raise CommandError("The default database is not SQLite; there is no search index to measure")
+
+        rng = random.Random(7)
+        started = time.perf_counter()
+        self._seed(options["users"], rng)
+        self.stdout.write(f"seeded and indexed {options['users']} agents in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        total = agent_search_index.rebuild()
+        self.stdout.write(f"rebuild_agent_search: {total} users in {time.perf_counter() - started:.1f}s")
+
+        try:
+            kinds = {
+                "name prefix (3)": lambda: {"query": rng.choice(LAST_NAMES)[:3]},
+                "first + last": lambda: {"query": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"},
+                "employee id": lambda: {"query": f"S{rng.randrange(options['users']):08d}"[:7]},
+                "email prefix": lambda: {"query": f"{rng.choice(FIRST_NAMES).lower()}.{rng.choice(LAST_NAMES)[:4]}"},
+                "region + name": lambda: {"query": f"{rng.choice(REGIONS)} {rng.choice(FIRST_NAMES)}"},
+                "fuzzy (typo)": lambda: {"query": self._typo(rng.choice(LAST_NAMES), rng), "fuzzy": True},
+                "filtered": lambda: {"query": rng.choice(FIRST_NAMES), "role": "agent",
+                                     "is_active": True, "is_suspended": False},
+            }
+            self.stdout.write(f"{'query':<18}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'hits/page':>11}")
+            for name, make in kinds.items():
+                agent_search_index.search(**make())  # vocabulary and page cache warm-up
+                timings, hits = [], []
+                for _ in range(options["queries"]):
+                    params = make()
+                    t = time.perf_counter()
+                    results, _ = agent_search_index.search(limit=20, **params)
+                    timings.append((time.perf_counter() - t) * 1000)
+                    hits.append(len(results))
+                timings.sort()
+                self.stdout.write(
+                    f"{name:<18}{statistics.median(timings):>9.2f}{timings[int(len(timings) * 0.95)]:>9.2f}"
+                    f"{timings[-1]:>9.2f}{statistics.mean(hits):>11.1f}"
+                )
+        finally:
+            if not options["keep"]:
+                self._cleanup()
+
+    @staticmethod
+    def _typo(word, rng):
+        i = rng.randrange(1, len(word) - 1)
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]  # swap two letters
+
+    def _seed(self, count, rng):
+        batch = []
+        for n in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            region = rng.choice(REGIONS)
+            batch.append(UserModel(
+                email=f"{first.lower()}.{last.lower()}{n}@{DOMAIN}", employee_id=f"S{n:08d}",
+                first_name=first, last_name=last, contact_number="0", role="agent",
+                branch=f"{region} {rng.randrange(1, 20)}", region=region,
+                is_suspended=rng.random() < 0.05,
+            ))
+            if len(batch) == 5000:
+                with transaction.atomic():
+                    UserModel.objects.bulk_create(batch)  # indexes the batch as well
+                batch = []
+        if batch:
+            with transaction.atomic():
+                UserModel.objects.bulk_create(batch)
+
+    def _cleanup(self):
+        users = UserModel.objects.filter(email__endswith=f"@{DOMAIN}")
+        pks = list(users.values_list("pk", flat=True))
+        with transaction.atomic():
+            agent_search_index.remove_users(pks)
+            users._raw_delete(users.db)  # seeded agents have no related rows
+        self.stdout.write(f"removed {len(pks)} seeded agents")
@@ -0,0 +1,222 @@
+# django_backend_starter/management/commands/bench_asgi.py
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from django_backend_starter.apps.loan.models import LoginAudit, UserModel
+from django_backend_starter.core.repositories.audit_repository import AuditRepository
+
+PASSWORD = "Bench@12345"
+DOMAIN = "bench-asgi.local"
+
+ENDPOINTS = ("login", "jwt-audited-create", "session-me", "list-agents")
+MODES = ("wsgi", "asgi")
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares how many concurrent connections the WSGI (sync views, thread pool) and "
+        "ASGI (async views, event loop) deployments serve within a latency target"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", choices=ENDPOINTS, default="login")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 128],
+                            help="concurrent connections (closed loop: each sends its next request on a reply)")
+        parser.add_argument("--seconds", type=float, default=10.0, help="duration of each run")
+        parser.add_argument("--wsgi-threads", type=int, default=8,
+                            help="request threads of the WSGI worker (e.g. gunicorn --threads)")
+        parser.add_argument("--slo-ms", type=float, default=1000.0,
+                            help="p95 latency a concurrency level must stay under to count as served")
+        parser.add_argument("--fast-hasher", action="store_true",
+                            help="use MD5 instead of PASSWORD_HASHERS, to look at everything but hashing")
+        parser.add_argument("--output", help="write the results to this JSON file")
+        parser.add_argument("--child", choices=MODES, help="internal: run one mode in this process")
+
+    def handle(self, *args, **options):
+        if options["child"]:
+            return self._child(options)
+
+        # One process per mode and level: the URLconf picks sync or async views at import
+        results = {mode: [] for mode in MODES}
+        for concurrency in options["concurrency"]:
+            for mode in MODES:
+                results[mode].append(self._spawn(mode, concurrency, options))
+
+        self.stdout.write(
+            f"{options['endpoint']}, {options['seconds']:.0f}s per run, "
+            f"WSGI worker with {options['wsgi_threads']} threads vs one ASGI event loop"
+        )
+        self.stdout.write(f"{'mode':<6}{'conns':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for mode in MODES:
+            for r in results[mode]:
+                self.stdout.write(
+                    f"{mode:<6}{r['concurrency']:>7}{r['throughput_rps']:>9.1f}{r['p50_ms']:>9.1f}"
+                    f"{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+                )
+        for mode in MODES:
+            served = [r["concurrency"] for r in results[mode] if r["p95_ms"] <= options["slo_ms"]]
+            self.stdout.write(
+                f"{mode}: {max(served) if served else 'no'} concurrent connections within p95 {options['slo_ms']:.0f} ms"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+    def _spawn(self, mode, concurrency, options):
+        argv = [
+            sys.executable, "-m", "django", "bench_asgi", "--child", mode,
+            "--endpoint", options["endpoint"], "--concurrency", str(concurrency),
+            "--seconds", str(options["seconds"]), "--wsgi-threads", str(options["wsgi_threads"]),
+        ]
+        if options["fast_hasher"]:
+            argv.append("--fast-hasher")
+        env = {
+            **os.environ,
+            "ASYNC_VIEWS": "on" if mode == "asgi" else "off",
+            "PYTHONPATH": os.pathsep.join(filter(None, sys.path)),  # same settings module as this process
+        }
+        result = subprocess.run(argv, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(f"{mode} run at {concurrency} connections failed:\n{result.stderr[-2000:]}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    # ----------------------
+    # CHILD
+    # ----------------------
+    def _child(self, options):
+        hashers = settings.PASSWORD_HASHERS
+        if options["fast_hasher"]:
+            hashers = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+        # The test clients send Host: testserver, which the deployment's ALLOWED_HOSTS would reject
+        with override_settings(PASSWORD_HASHERS=hashers, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            fixtures = self._seed()
+            try:
+                concurrency = options["concurrency"][0]
+                run = self._run_wsgi if options["child"] == "wsgi" else self._run_asgi
+                run(options["endpoint"], fixtures, concurrency, options["wsgi_threads"], 1.0)  # warm-up
+                started = time.perf_counter()
+                timings = run(
+                    options["endpoint"], fixtures, concurrency, options["wsgi_threads"], options["seconds"]
+                )
+                elapsed = time.perf_counter() - started
+            finally:
+                self._cleanup()
+
+        timings.sort()
+        self.stdout.write(json.dumps({
+            "concurrency": concurrency,
+            "requests": len(timings),
+            "throughput_rps": round(len(timings) / elapsed, 2),
+            "p50_ms": round(_percentile(timings, 50), 2),
+            "p95_ms": round(_percentile(timings, 95), 2),
+            "p99_ms": round(_percentile(timings, 99), 2),
+        }))
+
+    def _seed(self):
+        tag = uuid.uuid4().hex[:8]
+        user = UserModel.objects.create_user(email=f"user-{tag}@{DOMAIN}", password=PASSWORD, role="agent")
+        admin = UserModel.objects.create_user(email=f"admin-{tag}@{DOMAIN}", password=PASSWORD, role="admin")
+        UserModel.objects.bulk_create([
+            UserModel(email=f"agent{n}-{tag}@{DOMAIN}", employee_id=f"A{tag}{n:06d}", contact_number="0")
+            for n in range(200)
+        ], batch_size=500)
+        cookies = {}
+        for name, account in (("user", user), ("admin", admin)):
+            client = Client()
+            response = client.post(reverse("session-login"), {"email": account.email, "password": PASSWORD},
+                                   content_type="application/json")
+            if response.status_code != 200:
+                self._cleanup()
+                raise CommandError(f"Seeding failed: session login for {name} returned {response.status_code}")
+            cookies[name] = client.cookies
+        return {"email": user.email, "cookies": cookies}
+
+    def _cleanup(self):
+        AuditRepository().flush()
+        users = UserModel.objects.filter(email__endswith=f"@{DOMAIN}")
+        OutstandingToken.objects.filter(user__in=users).delete()
+        LoginAudit.objects.filter(email_attempted__endswith=f"@{DOMAIN}").delete()
+        users.delete()
+
+    @staticmethod
+    def _check(endpoint, response, expected):
+        # A rejected request is cheap, so timing it would flatter whichever mode rejects more
+        if response.status_code != expected:
+            raise CommandError(
+                f"{endpoint} returned {response.status_code}, expected {expected}: {response.content[:200]!r}"
+            )
+
+    @staticmethod
+    def _request_args(endpoint, fixtures):
+        """(method, path, kwargs, cookies, expected status) for one request to `endpoint`."""
+        if endpoint in ("login", "jwt-audited-create"):
+            data = {"email": fixtures["email"], "password": PASSWORD}
+            return "post", reverse(endpoint), {"data": data, "content_type": "application/json"}, None, 200
+        if endpoint == "session-me":
+            return "get", reverse(endpoint), {}, fixtures["cookies"]["user"], 200
+        return "get", reverse(endpoint), {"data": {"limit": 50}}, fixtures["cookies"]["admin"], 200
+
+    def _run_wsgi(self, endpoint, fixtures, concurrency, threads, seconds):
+        """`concurrency` connections share `threads` request threads; latency includes the wait for one."""
+        method, path, kwargs, cookies, expected = self._request_args(endpoint, fixtures)
+
+        def send(queued_at):
+            client = Client()
+            if cookies:
+                client.cookies = cookies
+            response = getattr(client, method)(path, **kwargs)
+            self._check(endpoint, response, expected)
+            return (time.perf_counter() - queued_at) * 1000
+
+        timings = []
+        deadline = time.perf_counter() + seconds
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            pending = {pool.submit(send, time.perf_counter()) for _ in range(concurrency)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    timings.append(future.result())
+                    if time.perf_counter() < deadline:
+                        pending.add(pool.submit(send, time.perf_counter()))
+        return timings
+
+    def _run_asgi(self, endpoint, fixtures, concurrency, threads, seconds):
+        """`concurrency` connections served by the ASGI handler on one event loop."""
+        method, path, kwargs, cookies, expected = self._request_args(endpoint, fixtures)
+        timings = []
+
+        async def connection(deadline):
+            client = AsyncClient()
+            if cookies:
+                client.cookies = cookies
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await getattr(client, method)(path, **kwargs)
+                self._check(endpoint, response, expected)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        async def main():
+            deadline = time.perf_counter() + seconds
+            await asyncio.gather(*(connection(deadline) for _ in range(concurrency)))
+
+        asyncio.run(main())
+        return timings
@@ -0,0 +1,235 @@
+# django_backend_starter/management/commands/bench_auth.py
+import json
+import platform
+import statistics
+import time
+import uuid
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from django_backend_starter.apps.loan.models import LoginAudit, UserModel
+from django_backend_starter.core.repositories.audit_repository import AuditRepository
+from django_backend_starter.core.services.hashing_service import password_hashing
+
+PASSWORD = "Bench@12345"
+DOMAIN = "bench-auth.local"
+
+ENDPOINTS = (
+    "login", "session-login", "session-me", "jwt-audited-create", "jwt-refresh", "list-agents", "add-agent",
+)
+
+# A run regresses when p95 latency grows or throughput drops by more than --tolerance,
+# or when an endpoint runs an extra query per request. The slack absorbs queries that
+# only some requests make (e.g. employee-id block allocation).
+QUERY_SLACK = 0.5
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _hashing_ms():
+    stats = password_hashing.stats()
+    return sum(stats[op]["total_wait_ms"] + stats[op]["total_compute_ms"] for op in ("make", "check"))
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the auth and agent endpoints in-process and compares the results with a stored baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per endpoint first")
+        parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+        parser.add_argument("--agents", type=int, default=500, help="agents seeded for list-agents")
+        parser.add_argument("--fast-hasher", action="store_true",
+                            help="use MD5 instead of PASSWORD_HASHERS, to look at everything but hashing")
+        parser.add_argument("--output", help="write the results to this JSON file")
+        parser.add_argument("--baseline", help="compare with the results in this JSON file")
+        parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+
+    def handle(self, *args, **options):
+        hashers = settings.PASSWORD_HASHERS
+        if options["fast_hasher"]:
+            hashers = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+        # Writes run on the request thread so every query is counted; the test client sends Host: testserver
+        with override_settings(
+            PASSWORD_HASHERS=hashers,
+            SQLITE_WRITER={"ENABLED": False},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        ):
+            fixtures = self._seed(options["agents"])
+            try:
+                results = {
+                    name: self._measure(name, fixtures, options["requests"], options["warmup"])
+                    for name in options["endpoints"]
+                }
+            finally:
+                self._cleanup()
+
+        report = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "hasher": hashers[0].rsplit(".", 1)[-1],
+                "hashing_backend": password_hashing.backend,
+                "requests": options["requests"],
+            },
+            "endpoints": results,
+        }
+        self._print(results)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"results written to {options['output']}")
+        if options["baseline"]:
+            self._compare(results, options["baseline"], options["tolerance"])
+
+    # ----------------------
+    # FIXTURES
+    # ----------------------
+    def _seed(self, agents):
+        tag = uuid.uuid4().hex[:8]
+        admin = UserModel.objects.create_user(email=f"admin-{tag}@{DOMAIN}", password=PASSWORD, role="admin")
+        user = UserModel.objects.create_user(email=f"user-{tag}@{DOMAIN}", password=PASSWORD, role="agent")
+        UserModel.objects.bulk_create([
+            UserModel(email=f"agent{n}-{tag}@{DOMAIN}", employee_id=f"B{tag}{n:06d}", contact_number="0",
+                      branch=f"Branch {n % 10}", region=f"Region {n % 4}")
+            for n in range(agents)
+        ], batch_size=500)
+
+        admin_client = Client(HTTP_USER_AGENT="bench_auth")
+        admin_client.force_login(admin)
+        session_client = Client(HTTP_USER_AGENT="bench_auth")
+        session_login = session_client.post(reverse("session-login"), {"email": user.email, "password": PASSWORD},
+                                            content_type="application/json")
+        tokens = Client().post(reverse("jwt-audited-create"), {"email": user.email, "password": PASSWORD},
+                               content_type="application/json")
+        for name, response in (("session-login", session_login), ("jwt-audited-create", tokens)):
+            if response.status_code != 200:
+                self._cleanup()
+                raise CommandError(f"Seeding failed: {name} returned {response.status_code}")
+        tokens = tokens.json()
+        return {"user": user, "admin_client": admin_client, "session_client": session_client,
+                "refresh": tokens["refresh"], "tag": tag}
+
+    def _cleanup(self):
+        AuditRepository().flush()
+        users = UserModel.objects.filter(email__endswith=f"@{DOMAIN}")
+        OutstandingToken.objects.filter(user__in=users).delete()
+        LoginAudit.objects.filter(email_attempted__endswith=f"@{DOMAIN}").delete()
+        users.delete()
+
+    # ----------------------
+    # REQUESTS
+    # ----------------------
+    def _request(self, name, fixtures, n):
+        """Sends request `n` to endpoint `name`; returns (response, expected status)."""
+        credentials = {"email": fixtures["user"].email, "password": PASSWORD}
+        if name in ("login", "session-login", "jwt-audited-create"):
+            return Client(HTTP_USER_AGENT="bench_auth").post(
+                reverse(name), credentials, content_type="application/json"
+            ), 200
+        if name == "session-me":
+            return fixtures["session_client"].get(reverse(name)), 200
+        if name == "jwt-refresh":
+            response = Client().post(reverse(name), {"refresh": fixtures["refresh"]}, content_type="application/json")
+            if response.status_code == 200:
+                fixtures["refresh"] = response.json()["refresh"]  # rotation blacklists the old one
+            return response, 200
+        if name == "list-agents":
+            return fixtures["admin_client"].get(reverse(name), {"limit": 50}), 200
+        if name == "add-agent":
+            return fixtures["admin_client"].post(reverse(name), {
+                "email": f"new{n}-{fixtures['tag']}@{DOMAIN}", "first_name": "Bench", "last_name": "Agent",
+                "branch": "Branch 0", "region": "Region 0", "phone_number": "0",
+            }, content_type="application/json"), 201
+        raise CommandError(f"Unknown endpoint {name}")
+
+    def _measure(self, name, fixtures, requests, warmup):
+        for n in range(warmup):
+            self._request(name, fixtures, -n - 1)
+
+        timings, queries = [], []
+        errors = 0
+        hashing_before = _hashing_ms()
+        started = time.perf_counter()
+        for n in range(requests):
+            t = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                response, expected = self._request(name, fixtures, n)
+            timings.append((time.perf_counter() - t) * 1000)
+            queries.append(len(ctx.captured_queries))
+            errors += response.status_code != expected
+        elapsed = time.perf_counter() - started
+        hashing = (_hashing_ms() - hashing_before) / requests
+
+        timings.sort()
+        mean = statistics.mean(timings)
+        return {
+            "requests": requests,
+            "errors": errors,
+            "throughput_rps": round(requests / elapsed, 2),
+            "mean_ms": round(mean, 3),
+            "p50_ms": round(_percentile(timings, 50), 3),
+            "p95_ms": round(_percentile(timings, 95), 3),
+            "p99_ms": round(_percentile(timings, 99), 3),
+            "queries_per_request": round(statistics.mean(queries), 2),
+            "hashing_ms_per_request": round(hashing, 3),
+            "other_ms_per_request": round(max(mean - hashing, 0.0), 3),
+        }
+
+    # ----------------------
+    # REPORTING
+    # ----------------------
+    def _print(self, results):
+        self.stdout.write(
+            f"{'endpoint':<20}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'hash ms':>9}{'other ms':>10}"
+        )
+        for name, r in results.items():
+            line = (
+                f"{name:<20}{r['throughput_rps']:>9.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                f"{r['queries_per_request']:>9.1f}{r['hashing_ms_per_request']:>9.2f}{r['other_ms_per_request']:>10.2f}"
+            )
+            if r["errors"]:
+                line += f"  ({r['errors']} unexpected statuses)"
+            self.stdout.write(line)
+
+    def _compare(self, results, path, tolerance):
+        with open(path) as fh:
+            baseline = json.load(fh)["endpoints"]
+
+        regressions = []
+        for name, current in results.items():
+            base = baseline.get(name)
+            if base is None:
+                continue
+            if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{name}: p95_ms {base['p95_ms']} -> {current['p95_ms']}")
+            if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(f"{name}: throughput_rps {base['throughput_rps']} -> {current['throughput_rps']}")
+            if current["queries_per_request"] > base["queries_per_request"] + QUERY_SLACK:
+                regressions.append(
+                    f"{name}: queries_per_request {base['queries_per_request']} -> {current['queries_per_request']}"
+                )
+            if current["errors"] > base.get("errors", 0):
+                regressions.append(f"{name}: errors {base.get('errors', 0)} -> {current['errors']}")
+
+        if regressions:
+            for line in regressions:
+                self.stderr.write(f"REGRESSION {line}")
+            raise CommandError(f"{len(regressions)} regression(s) against {path}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path} (tolerance {tolerance:.0%})"))
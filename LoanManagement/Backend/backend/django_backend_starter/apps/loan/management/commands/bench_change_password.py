@@ -0,0 +1,51 @@
+# django_backend_starter/management/commands/bench_change_password.py
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from django_backend_starter.apps.loan.models import PasswordHistory, UserModel
+
+
+class Command(BaseCommand):
+    help = "Measures end-to-end latency of ChangePasswordView with a full password history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--history", type=int, default=4, help="history rows seeded before the run")
+
+    def handle(self, *args, **options):
+        timings, queries = [], []
+        # The test client sends Host: testserver, which the deployment's ALLOWED_HOSTS would reject
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]), transaction.atomic():
+            user = UserModel.objects.create_user(email=f"{uuid.uuid4().hex}@bench.local", password="Start@12345")
+            for n in range(options["history"]):
+                user.set_password(f"Old@{n}-12345")
+                PasswordHistory.objects.create(user=user, password_hash=user.password)
+
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+            url = reverse("change-password")
+            for n in range(options["iterations"]):
+                started = time.perf_counter()
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.post(url, {"new_password": f"New@{n}-{uuid.uuid4().hex[:8]}"},
+                                           content_type="application/json")
+                if response.status_code != 200:
+                    raise CommandError(f"HTTP {response.status_code}: {response.content[:200]!r}")
+                timings.append((time.perf_counter() - started) * 1000)
+                queries.append(len(ctx.captured_queries))
+            transaction.set_rollback(True)
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"change-password: mean {statistics.mean(timings):.1f} ms, p50 {statistics.median(timings):.1f} ms, "
+            f"p95 {p95:.1f} ms, {statistics.mean(queries):.1f} queries/request over {len(timings)} requests"
+        )
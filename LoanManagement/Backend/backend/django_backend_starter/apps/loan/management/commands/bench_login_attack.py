@@ -0,0 +1,79 @@
+# django_backend_starter/management/commands/bench_login_attack.py
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from django_backend_starter.apps.loan.models import LoginAudit, UserModel
+from django_backend_starter.core.repositories.audit_repository import AuditRepository
+from django_backend_starter.core.services.auth_services import AuthService
+from django_backend_starter.core.services.login_throttle import (
+    LoginThrottle, LoginThrottled, get_throttle_settings,
+)
+
+PASSWORD = "Bench@12345"
+
+
+class Command(BaseCommand):
+    help = "Measures login throughput during a password-spraying attack, with and without the throttle"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--attempts", type=int, default=300, help="attacker login attempts per run")
+        parser.add_argument("--attacker-ips", type=int, default=4)
+        parser.add_argument("--legit-every", type=int, default=10, help="one legitimate login per N attacker attempts")
+
+    def handle(self, *args, **options):
+        for enabled in (False, True):
+            conf = get_throttle_settings()
+            conf["ENABLED"] = enabled
+            conf["KEY_PREFIX"] = f"bench-{uuid.uuid4().hex}"  # fresh counters for every run
+            self.run(LoginThrottle(conf), options, label="throttle on " if enabled else "throttle off")
+
+    def run(self, throttle, options, label):
+        # No wrapping transaction: every audit and lockout write commits as it would in production.
+        # Writes run on this thread (not the single-writer queue) so every query is counted.
+        domain = f"{uuid.uuid4().hex[:8]}.bench.local"
+        with override_settings(SQLITE_WRITER={"ENABLED": False}):
+            victim = UserModel.objects.create_user(email=f"victim@{domain}", password=PASSWORD)
+            legit = UserModel.objects.create_user(email=f"legit@{domain}", password=PASSWORD)
+            service = AuthService(throttle=throttle)
+            try:
+                rejected = legit_ok = 0
+                legit_time = 0.0
+                started = time.perf_counter()
+                with CaptureQueriesContext(connection) as ctx:
+                    for i in range(options["attempts"]):
+                        # Spray: the victim plus unknown emails, rotating through a few attacker IPs
+                        email = victim.email if i % 2 else f"nobody{i}@{domain}"
+                        ip = f"203.0.113.{i % options['attacker_ips']}"
+                        try:
+                            service.login(email, "wrong-password", ip=ip, ua="bench")
+                        except LoginThrottled:
+                            rejected += 1
+                        except ValueError:
+                            pass
+                        if i % options["legit_every"] == 0:
+                            t = time.perf_counter()
+                            try:
+                                service.login(legit.email, PASSWORD, ip="198.51.100.7", ua="bench")
+                                legit_ok += 1
+                            except ValueError:
+                                pass
+                            legit_time += time.perf_counter() - t
+                    AuditRepository().flush()
+                elapsed = time.perf_counter() - started
+                audits = LoginAudit.objects.filter(email_attempted__endswith=f"@{domain}")
+                throttled_rows = audits.filter(event_type="THROTTLED").count()
+            finally:
+                LoginAudit.objects.filter(email_attempted__endswith=f"@{domain}").delete()
+                UserModel.objects.filter(email__endswith=f"@{domain}").delete()
+
+        attack_time = max(elapsed - legit_time, 1e-9)
+        self.stdout.write(
+            f"{label}: {options['attempts'] / attack_time:8.1f} attacker attempts/s, "
+            f"{rejected} rejected by the throttle ({throttled_rows} THROTTLED audit rows), "
+            f"{len(ctx.captured_queries)} queries total, "
+            f"legit logins {legit_ok} ok, avg {1000 * legit_time / max(legit_ok, 1):.1f} ms"
+        )
@@ -0,0 +1,129 @@
+# django_backend_starter/management/commands/bench_sqlite_logins.py
+import statistics
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from django_backend_starter.apps.loan.models import LoginAudit, UserModel
+from django_backend_starter.core.authentication.tokens import CompactRefreshToken
+from django_backend_starter.core.repositories.audit_repository import AuditRepository
+from django_backend_starter.core.repositories.sqlite_writer import (
+    get_sqlite_writer_settings, is_lock_error, sqlite_writer,
+)
+from django_backend_starter.core.services.auth_services import AuthService
+from django_backend_starter.core.services.login_throttle import LoginThrottle, get_throttle_settings
+
+PASSWORD = "Bench@12345"
+DOMAIN = "sqlite-bench.local"
+
+
+class Command(BaseCommand):
+    help = "Measures concurrent JWT logins per second against the SQLite database, with and without the writer queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="concurrent login threads")
+        parser.add_argument("--seconds", type=float, default=10.0, help="duration of each run")
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--fail-every", type=int, default=4, help="one wrong password per N logins")
+        parser.add_argument("--real-hasher", action="store_true",
+                            help="keep PASSWORD_HASHERS (default: MD5 so the database is the bottleneck)")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stderr.write("The default database is not SQLite; nothing to measure")
+            return
+        with connection.cursor() as cursor:
+            pragmas = {}
+            for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size"):
+                cursor.execute(f"PRAGMA {name}")
+                pragmas[name] = cursor.fetchone()[0]
+        self.stdout.write(f"pragmas: {pragmas}")
+
+        hashers = settings.PASSWORD_HASHERS
+        if not options["real_hasher"]:
+            hashers = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+        with override_settings(PASSWORD_HASHERS=hashers):
+            for enabled in (False, True):
+                writer = dict(get_sqlite_writer_settings(), ENABLED=enabled)
+                # fresh users per run, so lockouts from one run don't carry into the next
+                emails = self._seed(options["users"])
+                try:
+                    with override_settings(SQLITE_WRITER=writer):
+                        self._run("writer queue" if enabled else "direct writes", emails, options)
+                finally:
+                    self._cleanup()
+        self.stdout.write(f"writer: {sqlite_writer.stats()}")
+
+    def _seed(self, count):
+        password = make_password(PASSWORD)
+        users = [
+            UserModel(email=f"u{n}-{uuid.uuid4().hex[:8]}@{DOMAIN}", password=password, contact_number="0")
+            for n in range(count)
+        ]
+        UserModel.objects.bulk_create(users, batch_size=500)
+        return [u.email for u in users]
+
+    def _run(self, label, emails, options):
+        throttle_conf = dict(get_throttle_settings(), ENABLED=False)  # count failures on the user row
+        deadline = time.perf_counter() + options["seconds"]
+        results = {"ok": 0, "rejected": 0, "locked": 0, "errors": 0}
+        latencies = []
+        lock = threading.Lock()
+
+        def worker(index):
+            service = AuthService(throttle=LoginThrottle(throttle_conf))
+            local = dict.fromkeys(results, 0)
+            timings = []
+            n = index
+            try:
+                while time.perf_counter() < deadline:
+                    email = emails[n % len(emails)]
+                    password = "wrong" if len(timings) % options["fail_every"] == 0 else PASSWORD
+                    started = time.perf_counter()
+                    try:
+                        service.login(email, password, ip=f"10.0.0.{index}", ua="bench",
+                                      issue=CompactRefreshToken.for_user)
+                        local["ok"] += 1
+                    except ValueError:
+                        local["rejected"] += 1
+                    except OperationalError as exc:
+                        local["locked" if is_lock_error(exc) else "errors"] += 1
+                    timings.append((time.perf_counter() - started) * 1000)
+                    n += options["threads"]
+            finally:
+                connections.close_all()
+                with lock:
+                    for key, value in local.items():
+                        results[key] += value
+                    latencies.extend(timings)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options["threads"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        AuditRepository().flush()
+
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        self.stdout.write(
+            f"{label}: {len(latencies) / elapsed:7.1f} logins/s with {options['threads']} threads, "
+            f"median {statistics.median(latencies) if latencies else 0:.1f} ms, p95 {p95:.1f} ms, "
+            f"{results['ok']} ok, {results['rejected']} rejected, "
+            f"{results['locked']} 'database is locked', {results['errors']} other errors"
+        )
+
+    def _cleanup(self):
+        users = UserModel.objects.filter(email__endswith=f"@{DOMAIN}")
+        OutstandingToken.objects.filter(user__in=users).delete()
+        LoginAudit.objects.filter(email_attempted__endswith=f"@{DOMAIN}").delete()
+        users.delete()
@@ -0,0 +1,104 @@
+# django_backend_starter/management/commands/bench_token_refresh.py
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.authentication.tokens import CompactRefreshToken, CompactTokenRefreshSerializer
+from django_backend_starter.core.repositories.token_blacklist_filter import blacklist_filter
+
+BENCH_PREFIX = "bench-"
+
+# Savepoints only appear because the whole run sits in one rolled-back transaction
+IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures JWT refresh throughput against a large OutstandingToken/BlacklistedToken history. "
+        "Everything it writes is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--historical", type=int, default=100_000, help="historical tokens to seed")
+        parser.add_argument("--refreshes", type=int, default=500, help="refresh rotations per mode")
+        parser.add_argument("--blacklisted-every", type=int, default=2, help="blacklist every Nth seeded token")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            try:
+                self._bench(options)
+            finally:
+                transaction.set_rollback(True)
+
+    def _bench(self, options):
+        self._seed(options["historical"], options["blacklisted_every"])
+
+        started = time.perf_counter()
+        blacklist_filter.rebuild()
+        self.stdout.write(
+            f"filter rebuild: {(time.perf_counter() - started) * 1000:.0f} ms, {blacklist_filter.stats()}"
+        )
+
+        user = UserModel.objects.create_user(email=f"{uuid.uuid4().hex}@bench.local", password="Bench@12345")
+        # writes inline, so the query counts include them
+        with override_settings(SQLITE_WRITER={"ENABLED": False}):
+            for name, serializer_class in (("stock", TokenRefreshSerializer),
+                                           ("filtered", CompactTokenRefreshSerializer)):
+                self._run(name, serializer_class, user, options["refreshes"])
+
+    def _seed(self, total, blacklisted_every):
+        outstanding = OutstandingToken._meta.db_table
+        blacklisted = BlacklistedToken._meta.db_table
+        now = timezone.now()
+        started = time.perf_counter()
+        chunk = 50_000
+        for offset in range(0, total, chunk):
+            rows = [
+                # a third of the history is already expired, the rest is still live
+                (f"{BENCH_PREFIX}{n:012d}", "x", now - timedelta(days=8),
+                 now - timedelta(days=1) if n % 3 == 0 else now + timedelta(days=1))
+                for n in range(offset, min(offset + chunk, total))
+            ]
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {outstanding} (jti, token, created_at, expires_at) VALUES (%s, %s, %s, %s)", rows
+                )
+            self.stdout.write(f"seeded {offset + len(rows)}/{total}", ending="\r")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {blacklisted} (token_id, blacklisted_at) "
+                f"SELECT id, %s FROM {outstanding} WHERE jti LIKE %s AND id %% %s = 0 "
+                f"AND id NOT IN (SELECT token_id FROM {blacklisted})",
+                [now, f"{BENCH_PREFIX}%", blacklisted_every],
+            )
+        self.stdout.write(f"\nseeded {total} tokens in {time.perf_counter() - started:.1f}s")
+
+    def _run(self, name, serializer_class, user, refreshes):
+        refresh = str(CompactRefreshToken.for_user(user))
+        timings, queries = [], []
+        for _ in range(refreshes):
+            t = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                serializer = serializer_class(data={"refresh": refresh})
+                serializer.is_valid(raise_exception=True)
+            timings.append((time.perf_counter() - t) * 1000)
+            queries.append(len([q for q in ctx.captured_queries if not q["sql"].startswith(IGNORED_PREFIXES)]))
+            refresh = serializer.validated_data["refresh"]
+
+        total = sum(timings) / 1000
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{name}: {refreshes / total:.0f} refresh/s, mean {statistics.mean(timings):.2f} ms, "
+            f"p95 {p95:.2f} ms, {statistics.mean(queries):.1f} queries/refresh"
+        )
@@ -0,0 +1,29 @@
+# django_backend_starter/management/commands/compact_tokens.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_backend_starter.core.repositories.token_repository import TokenRepository
+
+
+class Command(BaseCommand):
+    help = "Deletes expired outstanding and blacklisted JWT refresh tokens in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--max-chunks", type=int, help="stop after this many chunks (rerun to continue)")
+        parser.add_argument("--sleep", type=float, default=0.0, help="seconds to pause between chunks")
+
+    def handle(self, *args, **options):
+        def report(count, last_id):
+            self.stdout.write(f"deleted {count} tokens up to id {last_id}")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        started = time.perf_counter()
+        deleted = TokenRepository().delete_expired(
+            chunk_size=options["chunk_size"], max_chunks=options["max_chunks"], on_chunk=report
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} expired tokens in {time.perf_counter() - started:.1f}s"
+        ))
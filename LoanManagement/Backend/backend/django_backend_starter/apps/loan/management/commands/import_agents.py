@@ -0,0 +1,62 @@
+# django_backend_starter/management/commands/import_agents.py
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl
+from django_backend_starter.core.services.agent_import_jobs import ImportJob
+from django_backend_starter.core.services.agent_import_service import AgentImportService, detect_format
+
+
+class Command(BaseCommand):
+    help = "Bulk-imports agents from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with header row) or JSONL file")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--admin-email", help="admin recorded on the CREATE_AGENT audit rows")
+        parser.add_argument("--job", help="id of the upload job (see ImportJob) whose status to keep current")
+
+    def handle(self, *args, **options):
+        job = None
+        if options["job"]:
+            job = ImportJob(options["job"], directory=Path(options["path"]).parent)  # the upload sits in the job's directory
+            if job.status() is None:
+                raise CommandError(f"No import job {options['job']}")
+            job.update(status="running", started_at=timezone.now().isoformat())
+        try:
+            summary = self._import(options, job)
+        except Exception as e:
+            if job:
+                job.finish(status="failed", error=str(e))
+            raise
+        if job:
+            job.finish(status="done", summary=summary)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['created']} agents created, {summary['failed']} rows rejected ({summary['rows']} rows read)"
+        ))
+
+    def _import(self, options, job):
+        admin = None
+        if options["admin_email"]:
+            admin = UserModel.objects.filter(email=options["admin_email"], role="admin").first()
+            if admin is None:
+                raise CommandError(f"No admin with email {options['admin_email']}")
+
+        fmt = detect_format(options["path"], options["format"])
+        service = AgentImportService(UserRepositoryImpl(), chunk_size=options["chunk_size"])
+
+        def on_error(number, email, message):
+            self.stderr.write(f"row {number} ({email or '-'}): {message}")
+
+        def on_chunk(summary):
+            job.update(summary=summary)
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+            return service.import_stream(
+                stream, fmt, admin=admin, on_error=on_error, on_chunk=on_chunk if job else None
+            )
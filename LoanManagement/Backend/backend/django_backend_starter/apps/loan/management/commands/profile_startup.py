@@ -0,0 +1,142 @@
+# django_backend_starter/management/commands/profile_startup.py
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boots the app the way wsgi.py does (setup + warm_up) in a fresh interpreter and
+# prints one JSON line: RSS per stage, memory allocated per module (tracemalloc)
+# and project modules loaded under more than one name.
+CHILD = r"""
+import json, os, sys, time
+
+def rss_kib():
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return 0
+
+trace = os.environ.get("PROFILE_TRACEMALLOC") == "1"
+if trace:
+    import tracemalloc
+    tracemalloc.start()
+
+stages = [("interpreter", rss_kib(), 0.0)]
+started = time.perf_counter()
+import django
+django.setup()
+stages.append(("django.setup", rss_kib(), time.perf_counter() - started))
+from django_backend_starter.project.warmup import warm_up
+warm_up(freeze=False)
+stages.append(("warm_up", rss_kib(), time.perf_counter() - started))
+
+by_file = {}
+names = {}
+for name, module in list(sys.modules.items()):
+    path = getattr(module, "__file__", None)
+    if path:
+        path = os.path.realpath(path)
+        by_file.setdefault(path, []).append(name)
+        names[path] = min(by_file[path], key=len)
+
+modules = {}
+if trace:
+    for stat in tracemalloc.take_snapshot().statistics("filename"):
+        path = os.path.realpath(stat.traceback[0].filename)
+        if path in names:
+            modules[names[path]] = modules.get(names[path], 0) + stat.size
+
+print(json.dumps({
+    "stages": stages,
+    "module_bytes": modules,
+    "module_count": len(sys.modules),
+    "duplicates": sorted(
+        sorted(n) for path, n in by_file.items() if len(n) > 1 and path.startswith(os.getcwd() + os.sep)
+    ),
+}))
+"""
+
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Command(BaseCommand):
+    help = "Reports import time and memory per module for a fresh worker boot (django.setup + warm_up)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="modules to list per table")
+        parser.add_argument("--json", dest="output", help="also write the full report to this file")
+
+    def handle(self, *args, **options):
+        timing = self._child(["-X", "importtime"], {})
+        memory = self._child([], {"PROFILE_TRACEMALLOC": "1"})
+        imports = self._parse_importtime(timing["stderr"])
+        report = {**timing["report"], "imports": imports, "module_bytes": memory["report"]["module_bytes"]}
+
+        top = options["top"]
+        self.stdout.write("stage            RSS MiB   elapsed s")
+        for stage, rss, elapsed in report["stages"]:
+            self.stdout.write(f"{stage:<16}{rss / 1024:>8.1f}{elapsed:>12.3f}")
+        self.stdout.write(f"{report['module_count']} modules loaded")
+
+        packages = defaultdict(int)
+        for entry in imports:
+            if entry["depth"] == 0:
+                packages[entry["module"].split(".")[0]] += entry["cumulative_us"]
+        self.stdout.write("\nimport time by top-level package (ms)")
+        for package, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+            self.stdout.write(f"  {us / 1000:>9.1f}  {package}")
+
+        self.stdout.write("\nslowest modules, self time (ms)")
+        for entry in sorted(imports, key=lambda e: -e["self_us"])[:top]:
+            self.stdout.write(f"  {entry['self_us'] / 1000:>9.1f}  {entry['module']}")
+
+        self.stdout.write("\nmemory allocated while importing/warming, per module (KiB)")
+        for module, size in sorted(report["module_bytes"].items(), key=lambda kv: -kv[1])[:top]:
+            self.stdout.write(f"  {size / 1024:>9.1f}  {module}")
+
+        if report["duplicates"]:
+            self.stderr.write("\nmodules imported under more than one name:")
+            for names in report["duplicates"]:
+                self.stderr.write(f"  {' = '.join(names)}")
+        else:
+            self.stdout.write(self.style.SUCCESS("\nevery module is imported under a single name"))
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2)
+
+    @staticmethod
+    def _child(flags, extra_env):
+        env = {**os.environ, **extra_env, "DJANGO_SETTINGS_MODULE": os.environ["DJANGO_SETTINGS_MODULE"]}
+        result = subprocess.run(
+            [sys.executable, *flags, "-c", CHILD],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Startup profile failed:\n{result.stderr[-2000:]}")
+        return {"report": json.loads(result.stdout.strip().splitlines()[-1]), "stderr": result.stderr}
+
+    @staticmethod
+    def _parse_importtime(stderr):
+        imports = []
+        for line in stderr.splitlines():
+            match = IMPORTTIME.match(line)
+            if match:
+                self_us, cumulative_us, indent, module = match.groups()
+                imports.append({
+                    "module": module,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": (len(indent) - 1) // 2,
+                })
+        return imports
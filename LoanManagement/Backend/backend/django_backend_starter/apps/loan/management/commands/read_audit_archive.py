@@ -0,0 +1,30 @@
+# django_backend_starter/management/commands/read_audit_archive.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_backend_starter.core.repositories.audit_archive import ARCHIVED_TABLES, AuditArchive
+from django_backend_starter.core.utils.pagination import parse_datetime_param
+
+
+class Command(BaseCommand):
+    help = "Prints archived audit rows as JSON lines, filtered by time range and column values"
+
+    def add_arguments(self, parser):
+        parser.add_argument("table", choices=list(ARCHIVED_TABLES))
+        parser.add_argument("--since", help="ISO-8601 datetime (inclusive)")
+        parser.add_argument("--until", help="ISO-8601 datetime (exclusive)")
+        parser.add_argument("--filter", action="append", default=[], metavar="COLUMN=VALUE",
+                            help="exact match on an archived column, e.g. ip_address=10.0.0.1")
+        parser.add_argument("--dir", help="archive directory, defaults to AUDIT_ARCHIVE['DIR']")
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_datetime_param(options["since"], "since")
+            until = parse_datetime_param(options["until"], "until")
+            filters = dict(f.split("=", 1) for f in options["filter"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for row in AuditArchive(options["dir"]).iter_rows(options["table"], since=since, until=until, **filters):
+            self.stdout.write(json.dumps(row))
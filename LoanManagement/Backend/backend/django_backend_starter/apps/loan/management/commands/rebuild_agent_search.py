@@ -0,0 +1,25 @@
+# django_backend_starter/management/commands/rebuild_agent_search.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_backend_starter.core.repositories.agent_search import agent_search_index
+
+
+class Command(BaseCommand):
+    help = "Drops and refills the agent search index (agents/search/) from the user table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--batch-size", type=int, default=5000, help="users indexed per statement")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if not agent_search_index.supported(using):
+            raise CommandError(f"Database '{using}' is not SQLite; agent search queries the user table directly")
+        started = time.perf_counter()
+        indexed = agent_search_index.rebuild(using, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} users in {time.perf_counter() - started:.1f}s"
+        ))
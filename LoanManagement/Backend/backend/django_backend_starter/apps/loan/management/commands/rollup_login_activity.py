@@ -0,0 +1,26 @@
+# django_backend_starter/management/commands/rollup_login_activity.py
+from django.core.management.base import BaseCommand
+
+from django_backend_starter.core.repositories.login_rollup import LoginRollupRepository
+
+
+class Command(BaseCommand):
+    help = "Folds new LoginAudit rows into the hourly login rollups, or rebuilds them from raw rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="recompute every bucket from LoginAudit")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--max-batches", type=int)
+
+    def handle(self, *args, **options):
+        repo = LoginRollupRepository(batch_size=options["batch_size"])
+        if options["rebuild"]:
+            created = repo.rebuild()
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt {created} rollup rows up to audit id {repo.watermark()}"
+            ))
+            return
+        processed = repo.catch_up(max_batches=options["max_batches"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Folded in {processed} audit rows; watermark at {repo.watermark()}"
+        ))
@@ -0,0 +1,46 @@
+# django_backend_starter/management/commands/sync_sqlite_replicas.py
+import sqlite3
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_backend_starter.core.repositories.db_routing import get_routing_settings, read_alias
+
+
+class Command(BaseCommand):
+    help = "Copies the SQLite primary into each SQLite replica (DB_REPLICAS) for trying replica routing locally"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sample", type=int, default=0,
+                            help="also route this many agents.list reads and print the replica split")
+
+    def handle(self, *args, **options):
+        replicas = get_routing_settings()["REPLICAS"]
+        if not replicas:
+            raise CommandError("No replicas configured; set DB_REPLICAS")
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        if primary["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("Only SQLite primaries can be copied; use the database's own replication")
+
+        connections[DEFAULT_DB_ALIAS].close()
+        source = sqlite3.connect(str(primary["NAME"]))
+        try:
+            for alias in replicas:
+                connections[alias].close()
+                started = time.perf_counter()
+                target = sqlite3.connect(str(settings.DATABASES[alias]["NAME"]))
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: copied in {(time.perf_counter() - started) * 1000:.0f} ms")
+        finally:
+            source.close()
+
+        if options["sample"]:
+            split = Counter(read_alias("agents.list") for _ in range(options["sample"]))
+            weights = ", ".join(f"{alias}={weight}" for alias, weight in replicas.items())
+            self.stdout.write(f"weights {weights}; routed {dict(split)}")
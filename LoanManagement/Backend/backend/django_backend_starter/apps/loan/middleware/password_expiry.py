@@ -1,14 +1,44 @@
 # apps/loan/middleware/password_expiry.py
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.shortcuts import redirect
-from django.urls import reverse
+from django.urls import NoReverseMatch, reverse
 
 class PasswordExpiryMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self._change_password_path = None
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @property
+    def change_password_path(self):
+        # Reversed once per process instead of on every request
+        if self._change_password_path is None:
+            try:
+                self._change_password_path = reverse('change-password')
+            except NoReverseMatch:
+                self._change_password_path = ""
+        return self._change_password_path
 
     def __call__(self, request):
-        if request.user.is_authenticated:
-            if request.user.is_password_expired() and request.path != reverse('change-password'):
-                return redirect('change-password')
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # request.user comes from CachedModelBackend, so this costs no user SELECT
+        if self._expired(request, request.user):
+            return redirect(self.change_password_path)
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self._expired(request, await request.auser()):
+            return redirect(self.change_password_path)
+        return await self.get_response(request)
+
+    def _expired(self, request, user):
+        if not user.is_authenticated:
+            return False
+        path = self.change_password_path
+        return bool(path) and request.path != path and user.is_password_expired()
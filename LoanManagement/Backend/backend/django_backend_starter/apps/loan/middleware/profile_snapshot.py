@@ -0,0 +1,50 @@
+# apps/loan/middleware/profile_snapshot.py
+
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+from django_backend_starter.core.repositories.session_profile import snapshot_user, store_profile_snapshot
+
+
+def _get_user(request):
+    user = snapshot_user(request.session)
+    if user is not None:
+        return user
+    user = get_user(request)
+    if user.is_authenticated and not user.can_login():
+        return AnonymousUser()  # suspended or locked out since the session was created
+    if user.is_authenticated:
+        # Snapshot was missing or stale: take a fresh one for the following requests
+        store_profile_snapshot(request.session, user)
+    return user
+
+
+def _get_cached_user(request):
+    if not hasattr(request, "_snapshot_user"):
+        request._snapshot_user = _get_user(request)
+    return request._snapshot_user
+
+
+async def _aget_user(request):
+    if not hasattr(request, "_snapshot_user"):
+        await sync_to_async(_get_cached_user)(request)
+    return request._snapshot_user
+
+
+class ProfileSnapshotAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware that resolves request.user from the profile snapshot
+    kept in the session, so session-authenticated requests (SessionMeView, role
+    permissions, password expiry) need no user lookup at all.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        # request.user and (for async code) request.auser() share one lookup
+        request.user = SimpleLazyObject(lambda: _get_cached_user(request))
+        request.auser = partial(_aget_user, request)
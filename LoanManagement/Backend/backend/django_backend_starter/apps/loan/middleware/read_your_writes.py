@@ -0,0 +1,53 @@
+# apps/loan/middleware/read_your_writes.py
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.functional import SimpleLazyObject
+
+from django_backend_starter.core.repositories.db_routing import _current_request, pin_to_primary
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesMiddleware:
+    """
+    Exposes the request to ReplicaRouter and, after a successful unsafe request,
+    pins its user to the primary for DATABASE_ROUTING["READ_YOUR_WRITES_SECONDS"]
+    so their next reads see what they just changed, whatever the replica lag and
+    whichever worker serves them (see pin_to_primary).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk, response)
+        return response
+
+    async def __acall__(self, request):
+        # ORM calls made through sync_to_async copy this context, so the router still sees the request
+        token = _current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, "user", None)
+            if isinstance(user, SimpleLazyObject):
+                user = await request.auser()  # otherwise login() has replaced it with the user it logged in
+            if user is not None and user.is_authenticated:
+                await sync_to_async(pin_to_primary)(user.pk, response)
+        return response
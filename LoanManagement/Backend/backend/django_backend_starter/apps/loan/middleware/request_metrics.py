@@ -0,0 +1,149 @@
+# apps/loan/middleware/request_metrics.py
+import contextvars
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from django_backend_starter.core.services.hashing_service import password_hashing
+from django_backend_starter.core.utils.metrics import get_metrics_settings, request_metrics
+
+# The timer of the request being served. Async views run their queries on the sync
+# thread through sync_to_async, which copies this context, so the queries are still
+# attributed to the request that made them.
+_current_timer = contextvars.ContextVar("request_query_timer", default=None)
+
+
+class _QueryTimer:
+    """Counts the queries and DB time of one request."""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+def _timed_execute(execute, sql, params, many, context):
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += time.perf_counter() - started
+        timer.queries += 1
+
+
+def _install_timer(sender, connection, **kwargs):
+    # Installed once per connection wrapper, for every alias and thread
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _timed_execute)
+
+
+connection_created.connect(_install_timer, dispatch_uid="request_metrics_timer")
+
+
+def _timed_content(content, timer):
+    # The server iterates the response after the middleware has returned
+    iterator = iter(content)
+    while True:
+        token = _current_timer.set(timer)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _current_timer.reset(token)
+        yield chunk
+
+
+async def _atimed_content(content, timer):
+    iterator = aiter(content)
+    while True:
+        token = _current_timer.set(timer)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            _current_timer.reset(token)
+        yield chunk
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, DB queries/time and password-hashing time per view into the
+    per-process aggregates behind /api/metrics/. Views are labelled by URL name,
+    so the series stay bounded whatever the paths requested.
+
+    A streaming response is recorded when the server closes it, so its latency and
+    queries include producing the whole body.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = get_metrics_settings()["ENABLED"]
+        for connection in connections.all(initialized_only=True):
+            _install_timer(None, connection)  # opened before this module was imported
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        timer, token, hashing_before, started = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._record(request, response, timer, hashing_before, started)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        timer, token, hashing_before, started = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._record(request, response, timer, hashing_before, started)
+        return response
+
+    @staticmethod
+    def _start():
+        timer = _QueryTimer()
+        return timer, _current_timer.set(timer), password_hashing.context_time_ms(), time.perf_counter()
+
+    @classmethod
+    def _record(cls, request, response, timer, hashing_before, started):
+        # Hashing time is per thread/task, so take it now; streaming never hashes
+        hash_seconds = (password_hashing.context_time_ms() - hashing_before) / 1000
+        if not response.streaming:
+            cls._store(request, response, timer, hash_seconds, started)
+            return
+        timed = _atimed_content if response.is_async else _timed_content
+        response.streaming_content = timed(response.streaming_content, timer)
+        response._resource_closers.append(lambda: cls._store(request, response, timer, hash_seconds, started))
+
+    @staticmethod
+    def _store(request, response, timer, hash_seconds, started):
+        elapsed = time.perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        request_metrics.record(
+            view=(match.view_name or match._func_path) if match else "unmatched",
+            method=request.method,
+            status=f"{response.status_code // 100}xx",
+            seconds=elapsed,
+            queries=timer.queries,
+            db_seconds=timer.seconds,
+            hash_seconds=hash_seconds,
+        )
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loan', '0003_agent_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminaudit',
+            index=models.Index(fields=['timestamp', 'id'], name='adminaudit_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adminaudit',
+            index=models.Index(fields=['action', 'timestamp'], name='adminaudit_action_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adminaudit',
+            index=models.Index(fields=['admin', 'timestamp'], name='adminaudit_admin_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adminaudit',
+            index=models.Index(fields=['target_user', 'timestamp'], name='adminaudit_target_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginaudit',
+            index=models.Index(fields=['timestamp', 'id'], name='loginaudit_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginaudit',
+            index=models.Index(fields=['event_type', 'timestamp'], name='loginaudit_event_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginaudit',
+            index=models.Index(fields=['email_attempted', 'timestamp'], name='loginaudit_email_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginaudit',
+            index=models.Index(fields=['ip_address', 'timestamp'], name='loginaudit_ip_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginaudit',
+            index=models.Index(fields=['user', 'timestamp'], name='loginaudit_user_ts_idx'),
+        ),
+    ]
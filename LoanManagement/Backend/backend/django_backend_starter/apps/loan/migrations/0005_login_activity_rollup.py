@@ -0,0 +1,36 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loan', '0004_audit_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LoginActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('dimension', models.CharField(choices=[('all', 'All Logins'), ('branch', 'Branch'), ('region', 'Region'), ('ip', 'IP Address')], max_length=10)),
+                ('key', models.CharField(blank=True, max_length=100)),
+                ('success', models.PositiveIntegerField(default=0)),
+                ('failure', models.PositiveIntegerField(default=0)),
+                ('lockout', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dimension', 'bucket'], name='loginrollup_dim_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key', 'bucket'), name='loginrollup_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loan', '0005_login_activity_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditIPAddress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.GenericIPAddressField(unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuditUserAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('value', models.TextField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='loginaudit',
+            name='ip_ref',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='loan.auditipaddress'),
+        ),
+        migrations.AddField(
+            model_name='loginaudit',
+            name='user_agent_ref',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='loan.audituseragent'),
+        ),
+        migrations.AddIndex(
+            model_name='loginaudit',
+            index=models.Index(fields=['ip_ref', 'timestamp'], name='loginaudit_ipref_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+
+
+def intern_existing(apps, schema_editor):
+    from django_backend_starter.core.repositories.audit_dimensions import DimensionTable, backfill
+
+    backfill(
+        audit_model=apps.get_model("loan", "LoginAudit"),
+        tables={
+            "user_agent": DimensionTable(apps.get_model("loan", "AuditUserAgent"), hashed=True),
+            "ip_address": DimensionTable(apps.get_model("loan", "AuditIPAddress")),
+        },
+    )
+
+
+def restore_inline(apps, schema_editor):
+    LoginAudit = apps.get_model("loan", "LoginAudit")
+    for column, ref, model in (
+        ("user_agent", "user_agent_ref", apps.get_model("loan", "AuditUserAgent")),
+        ("ip_address", "ip_ref", apps.get_model("loan", "AuditIPAddress")),
+    ):
+        value = Subquery(model.objects.filter(pk=OuterRef(ref)).values("value")[:1])
+        with transaction.atomic():
+            LoginAudit.objects.filter(**{f"{ref}__isnull": False}).update(**{column: value, ref: None})
+
+
+class Migration(migrations.Migration):
+    """
+    Interns the user agents (and, with AUDIT_DIMENSIONS["IP_ADDRESSES"], the IPs) of
+    existing audit rows, one committed keyset batch at a time, so a large table is
+    never rewritten in a single transaction.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('loan', '0006_audit_dimensions'),
+    ]
+
+    operations = [
+        migrations.RunPython(intern_existing, restore_inline),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:57
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('loan', '0007_backfill_audit_dimensions'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='usermodel',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='user_email_lower_unique'),
+        ),
+    ]
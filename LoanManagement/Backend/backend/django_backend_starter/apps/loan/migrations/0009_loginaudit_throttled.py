@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loan', '0008_user_email_lower_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loginaudit',
+            name='event_type',
+            field=models.CharField(choices=[('SUCCESS', 'Successful Login'), ('FAILURE', 'Failed Login'), ('LOCKOUT', 'Account Locked'), ('THROTTLED', 'Rejected by Login Throttle')], max_length=20),
+        ),
+    ]
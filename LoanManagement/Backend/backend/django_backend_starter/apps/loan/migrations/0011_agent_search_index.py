@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from django_backend_starter.core.repositories.agent_search import agent_search_index
+
+    using = schema_editor.connection.alias
+    if agent_search_index.supported(using):
+        agent_search_index.rebuild(using, model=apps.get_model("loan", "UserModel"))
+
+
+def drop_index(apps, schema_editor):
+    from django_backend_starter.core.repositories.agent_search import agent_search_index
+
+    using = schema_editor.connection.alias
+    if agent_search_index.supported(using):
+        agent_search_index.drop(using)
+
+
+class Migration(migrations.Migration):
+    """Creates and fills the FTS5 agent search index, so no request has to."""
+
+    dependencies = [
+        ('loan', '0010_rollupwatermark_gaps'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -1,8 +1,10 @@
 from datetime import timedelta
+import math
 import uuid
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
-from django.db.models import Max
+from django.contrib.auth.hashers import get_hasher, identify_hasher
 from django.utils import timezone
 
 class UserManager(BaseUserManager):
@@ -20,7 +22,35 @@ class UserManager(BaseUserManager):
         extra_fields.setdefault("is_superuser", True)
         extra_fields.setdefault("is_staff", True)
         return self.create_user(email, password, **extra_fields)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create bypasses save(), so hand out employee IDs for the whole batch up front
+        from django_backend_starter.core.repositories.employee_id_allocator import employee_id_allocator
+        from django_backend_starter.core.repositories.agent_search import agent_search_index
+        from django_backend_starter.core.repositories.org_summary import org_summary
+
+        objs = list(objs)
+        missing = [u for u in objs if not u.employee_id]
+        for user, employee_id in zip(missing, employee_id_allocator.allocate_many(len(missing))):
+            user.employee_id = employee_id
+        created = super().bulk_create(objs, *args, **kwargs)
+        agent_search_index.index_users([u.pk for u in created], using=self.db)
+        if created:
+            org_summary.invalidate()
+        return created
     
+def password_needs_rehash(encoded):
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher("default")
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+# Columns the agent search index is built from (core/repositories/agent_search.py)
+SEARCH_SOURCE_FIELDS = frozenset({"first_name", "last_name", "email", "employee_id", "branch", "region"})
+
 MAX_FAILED_ATTEMPTS = 5
 LOCKOUT_TIME = timedelta(minutes=15)
 
@@ -86,9 +116,25 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
         return False
 
     def register_failed_attempt(self):
-        self.failed_login_attempts += 1
-        if self.failed_login_attempts >= MAX_FAILED_ATTEMPTS:
-            self.lockout_until = timezone.now() + LOCKOUT_TIME
+        # One UPDATE on the current row, so concurrent failures are all counted
+        # (the CASE sees the count before the increment)
+        UserModel.objects.filter(pk=self.pk).update(
+            failed_login_attempts=models.F('failed_login_attempts') + 1,
+            lockout_until=models.Case(
+                models.When(
+                    failed_login_attempts__gte=MAX_FAILED_ATTEMPTS - 1,
+                    then=models.Value(timezone.now() + LOCKOUT_TIME),
+                ),
+                default=models.F('lockout_until'),
+            ),
+        )
+        self.refresh_from_db(fields=['failed_login_attempts', 'lockout_until'])
+        self._saved(['failed_login_attempts', 'lockout_until'])
+
+    def lock_out(self, failed_attempts):
+        # Sliding-window counts are fractional; the column is an integer
+        self.failed_login_attempts = math.ceil(failed_attempts)
+        self.lockout_until = timezone.now() + LOCKOUT_TIME
         self.save(update_fields=['failed_login_attempts', 'lockout_until'])
 
     def reset_failed_attempts(self):
@@ -96,17 +142,104 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
         self.lockout_until = None
         self.save(update_fields=['failed_login_attempts', 'lockout_until'])
 
+    def set_password(self, raw_password):
+        # Hashing runs on the configured hashing executor (see PASSWORD_HASHING)
+        from django_backend_starter.core.services.hashing_service import password_hashing
+
+        self.password = password_hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        from django_backend_starter.core.services.hashing_service import password_hashing
+
+        if not password_hashing.check_password(raw_password, self.password):
+            return False
+        if password_needs_rehash(self.password):
+            # Same upgrade AbstractBaseUser.check_password does for outdated hashers/iterations
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+        return True
+
+    async def acheck_password(self, raw_password):
+        """check_password() for async callers: the hash check is awaited on the hashing executor."""
+        from django_backend_starter.core.services.hashing_service import password_hashing
+
+        if not await password_hashing.acheck_password(raw_password, self.password):
+            return False
+        if password_needs_rehash(self.password):
+            self.password = await password_hashing.amake_password(raw_password)
+            self._password = None
+            await self.asave(update_fields=["password"])
+        return True
+
+    def get_session_auth_hash(self):
+        # Principals built from the cache carry the hash instead of the (deferred) password column
+        if "password" not in self.__dict__ and "_cached_session_auth_hash" in self.__dict__:
+            return self._cached_session_auth_hash
+        return super().get_session_auth_hash()
+
     def save(self, *args, **kwargs):
         if not self.employee_id:
-            last_emp = UserModel.objects.aggregate(max_id=Max('employee_id'))['max_id']
-            num = int(last_emp.replace('EMP', '')) + 1 if last_emp else 1
-            self.employee_id = f"EMP{num:03d}"
+            from django_backend_starter.core.repositories.employee_id_allocator import employee_id_allocator
+            self.employee_id = employee_id_allocator.allocate()
         super().save(*args, **kwargs)
+        self._saved(kwargs.get("update_fields"))
+
+    def _saved(self, update_fields):
+        from django_backend_starter.core.repositories.org_summary import org_summary
+        from django_backend_starter.core.repositories.principal_cache import invalidate_principal
+
+        # Covers suspend/reactivate, lockout changes and password changes
+        invalidate_principal(self.pk)
+        org_summary.user_saved(self, update_fields)
+        if update_fields is None or SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            from django_backend_starter.core.repositories.agent_search import agent_search_index
+            agent_search_index.index_users([self.pk], using=self._state.db)
+
+    def delete(self, *args, **kwargs):
+        from django_backend_starter.core.repositories.agent_search import agent_search_index
+        from django_backend_starter.core.repositories.org_summary import org_summary
+        from django_backend_starter.core.repositories.principal_cache import invalidate_principal
+
+        pk = self.pk
+        using = self._state.db
+        result = super().delete(*args, **kwargs)
+        invalidate_principal(pk)
+        agent_search_index.remove_users([pk], using=using)
+        org_summary.invalidate()
+        return result
+
+    class Meta:
+        constraints = [
+            # Emails are unique whatever their case; imports store them lowercased
+            models.UniqueConstraint(Lower("email"), name="user_email_lower_unique"),
+        ]
+        indexes = [
+            # Keyset pagination and filters for the agent listing (all/agents/)
+            models.Index(fields=["role", "employee_id"], name="user_role_empid_idx"),
+            models.Index(fields=["role", "id"], name="user_role_id_idx"),
+            models.Index(fields=["role", "branch", "employee_id"], name="user_role_branch_idx"),
+            models.Index(fields=["role", "region", "employee_id"], name="user_role_region_idx"),
+            models.Index(fields=["role", "is_active", "is_suspended", "employee_id"], name="user_role_status_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.employee_id})"
 
 
+class EmployeeIdSequence(models.Model):
+    """
+    Counter row for employee IDs. Workers reserve blocks of numbers from it
+    (see core/repositories/employee_id_allocator.py) instead of scanning MAX(employee_id).
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    next_value = models.PositiveBigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name} -> {self.next_value}"
+
+
 class PasswordHistory(models.Model):
     user = models.ForeignKey(UserModel, on_delete=models.CASCADE, related_name="password_history")
     password_hash = models.CharField(max_length=128)  # store hashed password
@@ -138,14 +271,51 @@ class AdminAudit(models.Model):
     reason = models.TextField(blank=True, null=True)
     timestamp = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination (newest first) and filters for audit/admin/
+            models.Index(fields=["timestamp", "id"], name="adminaudit_ts_idx"),
+            models.Index(fields=["action", "timestamp"], name="adminaudit_action_ts_idx"),
+            models.Index(fields=["admin", "timestamp"], name="adminaudit_admin_ts_idx"),
+            models.Index(fields=["target_user", "timestamp"], name="adminaudit_target_ts_idx"),
+        ]
+
     def __str__(self):
         return f"[{self.timestamp}] {self.admin} performed {self.action} on {self.target_user}"
 
+class AuditUserAgent(models.Model):
+    """One row per distinct User-Agent string in LoginAudit (see core/repositories/audit_dimensions.py)."""
+    digest = models.CharField(max_length=64, unique=True)  # sha256 of value; UA strings are too long to index
+    value = models.TextField()
+
+    def __str__(self):
+        return self.value
+
+
+class AuditIPAddress(models.Model):
+    """One row per distinct client IP in LoginAudit, when AUDIT_DIMENSIONS["IP_ADDRESSES"] is on."""
+    value = models.GenericIPAddressField(unique=True)
+
+    def __str__(self):
+        return self.value
+
+
+class LoginAuditManager(models.Manager):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create bypasses save(), so intern the batch's user agents and IPs up front
+        from django_backend_starter.core.repositories.audit_dimensions import intern_login_audits
+
+        objs = list(objs)
+        intern_login_audits(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class LoginAudit(models.Model):
     EVENT_CHOICES = [
         ("SUCCESS", "Successful Login"),
         ("FAILURE", "Failed Login"),
         ("LOCKOUT", "Account Locked"),
+        ("THROTTLED", "Rejected by Login Throttle"),
     ]
 
     user = models.ForeignKey(
@@ -157,6 +327,78 @@ class LoginAudit(models.Model):
     user_agent = models.TextField(null=True, blank=True)
     timestamp = models.DateTimeField(default=timezone.now)
 
+    # Interned user_agent / ip_address; when set, the column itself is left empty.
+    # Read them back through core/repositories/audit_dimensions.py (original_rows, with_original).
+    user_agent_ref = models.ForeignKey(
+        AuditUserAgent, on_delete=models.PROTECT, null=True, blank=True, related_name="+", db_index=False
+    )
+    ip_ref = models.ForeignKey(
+        AuditIPAddress, on_delete=models.PROTECT, null=True, blank=True, related_name="+", db_index=False
+    )
+
+    objects = LoginAuditManager()
+
+    def save(self, *args, **kwargs):
+        from django_backend_starter.core.repositories.audit_dimensions import intern_login_audits
+
+        if kwargs.get("update_fields") is None:
+            intern_login_audits([self])
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination (newest first) and filters for audit/logins/
+            models.Index(fields=["timestamp", "id"], name="loginaudit_ts_idx"),
+            models.Index(fields=["event_type", "timestamp"], name="loginaudit_event_ts_idx"),
+            models.Index(fields=["email_attempted", "timestamp"], name="loginaudit_email_ts_idx"),
+            models.Index(fields=["ip_address", "timestamp"], name="loginaudit_ip_ts_idx"),
+            models.Index(fields=["ip_ref", "timestamp"], name="loginaudit_ipref_ts_idx"),
+            models.Index(fields=["user", "timestamp"], name="loginaudit_user_ts_idx"),
+        ]
+
     def __str__(self):
         return f"[{self.timestamp}] {self.email_attempted} - {self.event_type}"
 
+
+
+class LoginActivityRollup(models.Model):
+    """
+    Hourly login counts per dimension value, maintained from LoginAudit by
+    core/repositories/login_rollup.py. dimension "all" has a single empty key.
+    """
+    DIMENSION_CHOICES = [
+        ("all", "All Logins"),
+        ("branch", "Branch"),
+        ("region", "Region"),
+        ("ip", "IP Address"),
+    ]
+
+    bucket = models.DateTimeField()  # start of the UTC hour
+    dimension = models.CharField(max_length=10, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=100, blank=True)
+    success = models.PositiveIntegerField(default=0)
+    failure = models.PositiveIntegerField(default=0)
+    lockout = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also serves time-series reads for one dimension value
+            models.UniqueConstraint(fields=["dimension", "key", "bucket"], name="loginrollup_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["dimension", "bucket"], name="loginrollup_dim_bucket_idx"),
+        ]
+
+    def __str__(self):
+        return f"[{self.bucket}] {self.dimension}={self.key}: {self.success}/{self.failure}/{self.lockout}"
+
+
+class RollupWatermark(models.Model):
+    """Highest source row id already folded into a rollup."""
+    name = models.CharField(max_length=50, primary_key=True)
+    last_id = models.BigIntegerField(default=0)
+    gaps = models.JSONField(default=dict)  # ids skipped below last_id and still awaited: {id: first seen}
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} -> {self.last_id}"
@@ -0,0 +1,122 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from django_backend_starter.apps.loan.models import AdminAudit, UserModel
+from django_backend_starter.core.services.agent_import_jobs import ImportJob
+from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl
+from django_backend_starter.core.services.agent_import_service import AgentImportService
+
+HEADER = "email,first_name,last_name,contact_number,branch,region\n"
+
+
+class AgentImportEmailCaseTests(TestCase):
+    def test_existing_email_in_other_case_is_rejected(self):
+        UserModel.objects.create(email="Jane.Doe@Example.com", role="agent")
+        stream = io.StringIO(HEADER + "JANE.DOE@example.com,Jane,Doe,0700000000,Central,North\n")
+
+        summary = AgentImportService(UserRepositoryImpl()).import_stream(stream, "csv")
+
+        self.assertEqual((summary["created"], summary["failed"]), (0, 1))
+        self.assertEqual(summary["errors"][0]["error"], "Email already registered")
+
+    def test_existing_emails_matches_any_case(self):
+        UserModel.objects.create(email="Jane.Doe@Example.com", role="agent")
+        self.assertEqual(
+            UserRepositoryImpl().existing_emails(["jane.doe@example.com", "other@example.com"]),
+            {"jane.doe@example.com"},
+        )
+
+    def test_emails_differing_only_in_case_are_unique(self):
+        UserModel.objects.create(email="Jane.Doe@Example.com", role="agent")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            UserModel.objects.create(email="jane.doe@example.com", role="agent")
+
+
+class ImportAgentsViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserModel.objects.create(email="admin@example.com", role="admin", is_staff=True)
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        settings_override = override_settings(AGENT_IMPORT={"DIR": self.dir})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, content, name="agents.csv"):
+        # The job's process would use the real database; run its command here instead
+        with mock.patch("django_backend_starter.core.services.agent_import_jobs.subprocess.Popen") as popen:
+            response = self.client.post(
+                reverse("import-agents"), {"file": SimpleUploadedFile(name, content.encode())}, format="multipart"
+            )
+        return response, popen
+
+    def job_status(self, job_id):
+        return self.client.get(reverse("import-agents-job", args=[job_id]))
+
+    def test_upload_is_imported_by_a_background_job(self):
+        response, popen = self.upload(
+            HEADER + "one@example.com,One,Agent,0700000001,Central,North\n"
+            "two@example.com,Two,Agent,0700000002,Central,North\n"
+            "not-an-email,Bad,Row,0700000003,Central,North\n"
+        )
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["id"]
+        self.assertEqual(response.json()["status"], "queued")
+        self.assertEqual(response["Location"], reverse("import-agents-job", args=[job_id]))
+        self.assertEqual(popen.call_args.args[0][-len(ImportJob(job_id).command()):], ImportJob(job_id).command())
+        self.assertFalse(UserModel.objects.filter(role="agent").exists())
+        self.assertEqual(self.job_status(job_id).json()["status"], "queued")
+
+        call_command(*ImportJob(job_id).command(), stdout=io.StringIO(), stderr=io.StringIO())
+
+        job = self.job_status(job_id).json()
+        self.assertEqual(job["status"], "done")
+        self.assertEqual((job["summary"]["created"], job["summary"]["failed"]), (2, 1))
+        self.assertEqual(job["summary"]["errors"][0]["row"], 4)
+        self.assertEqual(UserModel.objects.filter(role="agent").count(), 2)
+        self.assertEqual(AdminAudit.objects.filter(action="CREATE_AGENT", admin=self.admin).count(), 2)
+        self.assertEqual(list(self.dir.glob("*.csv")), [])  # the upload is removed once imported
+
+    def test_failed_import_is_reported(self):
+        response, _ = self.upload('{"email": "one@example.com"}\n', name="agents.jsonl")
+        job_id = response.json()["id"]
+        (self.dir / f"{job_id}.jsonl").unlink()
+
+        with self.assertRaises(FileNotFoundError):
+            call_command(*ImportJob(job_id).command(), stdout=io.StringIO())
+        job = self.job_status(job_id).json()
+        self.assertEqual((job["status"], job["format"]), ("failed", "jsonl"))
+        self.assertIn("No such file", job["error"])
+
+    def test_rejects_missing_file_or_format(self):
+        self.assertEqual(self.client.post(reverse("import-agents"), {}, format="multipart").status_code, 400)
+        response = self.client.post(
+            reverse("import-agents"), {"file": SimpleUploadedFile("a.csv", b""), "format": "xlsx"}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+    def test_unknown_job_is_404(self):
+        self.assertEqual(self.job_status("0" * 32).status_code, 404)
+        self.assertEqual(self.job_status("..%2Fsettings").status_code, 404)
+
+    def test_agents_cannot_import(self):
+        self.client.force_authenticate(UserModel.objects.create(email="agent@example.com", role="agent"))
+        response, popen = self.upload(HEADER)
+        self.assertEqual(response.status_code, 403)
+        popen.assert_not_called()
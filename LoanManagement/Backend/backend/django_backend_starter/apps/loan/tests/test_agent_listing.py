@@ -0,0 +1,40 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.utils.pagination import encode_cursor
+
+
+class ListAgentsCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserModel.objects.create(email="admin@example.com", role="admin", is_staff=True)
+        for n in range(5):
+            UserModel.objects.create(email=f"agent{n}@example.com", role="agent")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse("list-agents")
+
+    def test_pages_follow_the_cursor(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += [agent["employee_id"] for agent in response.json()["results"]]
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, sorted(UserModel.objects.filter(role="agent").values_list("employee_id", flat=True)))
+
+    def test_cursor_for_another_ordering_is_rejected(self):
+        cursor = self.client.get(self.url, {"limit": 2}).json()["next_cursor"]
+        response = self.client.get(self.url, {"limit": 2, "order_by": "id", "cursor": cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_malformed_id_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"order_by": "id", "cursor": encode_cursor("id", "EMP001")})
+        self.assertEqual(response.status_code, 400)
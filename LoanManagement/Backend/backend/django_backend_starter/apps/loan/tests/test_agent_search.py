@@ -0,0 +1,36 @@
+from django.db import connection
+from django.test import TestCase
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.repositories.agent_search import agent_search_index
+
+
+def index_exists():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [agent_search_index.conf["TABLE"]])
+        return cursor.fetchone() is not None
+
+
+class AgentSearchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = UserModel.objects.create(
+            email="grace@example.com", first_name="Grace", last_name="Hopper", role="agent", branch="Arlington",
+        )
+
+    def search(self, query):
+        users, _ = agent_search_index.search(query)
+        return [user.email for user in users]
+
+    def test_migrations_create_the_index(self):
+        self.assertTrue(index_exists())
+        self.assertEqual(self.search("hopper"), [self.agent.email])
+
+    def test_requests_never_build_a_missing_index(self):
+        agent_search_index.drop()
+        self.addCleanup(agent_search_index._ready.clear)  # the drop is rolled back with the test
+
+        UserModel.objects.create(email="ada@example.com", first_name="Ada", last_name="Lovelace", role="agent")
+        self.assertEqual(self.search("lovelace"), ["ada@example.com"])
+        self.assertEqual(self.search("arling"), [self.agent.email])
+        self.assertFalse(index_exists())
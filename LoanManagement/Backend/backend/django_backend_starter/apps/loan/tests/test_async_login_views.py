@@ -0,0 +1,86 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.apps.loan.views.audit_view import AsyncAuditedJWTLoginView
+from django_backend_starter.apps.loan.views.auth_view import AsyncLoginView, AsyncSessionLoginView
+from django_backend_starter.core.repositories.audit_dimensions import ip_addresses, user_agents
+from django_backend_starter.core.services.login_throttle import LoginThrottle, get_throttle_settings
+
+PASSWORD = "Async@12345"
+ASYNC_LOGIN_VIEWS = (AsyncLoginView, AsyncSessionLoginView, AsyncAuditedJWTLoginView)
+
+
+@override_settings(AUDIT_BUFFER={"MODE": "sync"})
+class AsyncLoginViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create_user(email="agent@example.com", password=PASSWORD, role="agent")
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        # Lookup rows interned during a test are rolled back with it
+        self.addCleanup(user_agents.clear)
+        self.addCleanup(ip_addresses.clear)
+
+    async def post(self, view, **data):
+        request = AsyncRequestFactory().post("/", data, content_type="application/json")
+        SessionMiddleware(lambda request: None).process_request(request)
+        response = await view.as_view()(request)
+        return request, response.render()
+
+    async def test_successful_logins(self):
+        request, response = await self.post(AsyncLoginView, email=self.user.email, password=PASSWORD)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user"]["email"], self.user.email)
+
+        request, response = await self.post(AsyncSessionLoginView, email=self.user.email, password=PASSWORD)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.session[SESSION_KEY], str(self.user.pk))
+
+        request, response = await self.post(AsyncAuditedJWTLoginView, email=self.user.email, password=PASSWORD)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {"access", "refresh"})
+
+    async def test_missing_credentials(self):
+        for view, expected in ((AsyncLoginView, 400), (AsyncSessionLoginView, 400), (AsyncAuditedJWTLoginView, 401)):
+            with self.subTest(view=view.__name__):
+                _, response = await self.post(view, email=self.user.email)
+                self.assertEqual(response.status_code, expected)
+
+    async def test_throttled_logins(self):
+        for _ in range(get_throttle_settings()["LIMITS"]["email"]):
+            _, response = await self.post(AsyncLoginView, email=self.user.email, password="wrong")
+            self.assertEqual(response.status_code, 401)
+
+        for view in ASYNC_LOGIN_VIEWS:
+            with self.subTest(view=view.__name__):
+                _, response = await self.post(view, email=self.user.email, password=PASSWORD)
+                self.assertEqual(response.status_code, 429)
+
+    async def test_throttle_cache_calls_stay_off_the_event_loop(self):
+        on_loop = []
+
+        def spy(method):
+            original = getattr(LoginThrottle, method)
+
+            def wrapper(throttle, *args):
+                try:
+                    asyncio.get_running_loop()
+                    on_loop.append(method)
+                except RuntimeError:
+                    pass
+                return original(throttle, *args)
+            return mock.patch.object(LoginThrottle, method, wrapper)
+
+        with spy("check"), spy("register_failure"), spy("reset"):
+            await self.post(AsyncLoginView, email=self.user.email, password="wrong")
+            await self.post(AsyncLoginView, email="nobody@example.com", password="wrong")
+            await self.post(AsyncLoginView, email=self.user.email, password=PASSWORD)
+        self.assertEqual(on_loop, [])
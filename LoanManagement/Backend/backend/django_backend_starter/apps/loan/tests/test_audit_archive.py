@@ -0,0 +1,109 @@
+import json
+import tempfile
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from django_backend_starter.apps.loan.models import LoginAudit
+from django_backend_starter.core.repositories import audit_archive
+from django_backend_starter.core.repositories.audit_archive import CHECKPOINT_FILE, AuditArchive
+
+
+class Crash(Exception):
+    pass
+
+
+@override_settings(AUDIT_BUFFER={"MODE": "sync"})
+class AuditArchiveTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.archive = AuditArchive(tmp.name)
+        # Three old days, two rows each, plus one row inside the retention period
+        self.start = (timezone.now() - timedelta(days=200)).replace(hour=12, minute=0, second=0, microsecond=0)
+        for n in range(6):
+            LoginAudit.objects.create(
+                email_attempted=f"user{n}@example.com", event_type="SUCCESS" if n % 2 else "FAILURE",
+                ip_address=f"10.0.0.{n % 3}", timestamp=self.start + timedelta(days=n // 2, minutes=n),
+            )
+        self.recent = LoginAudit.objects.create(email_attempted="recent@example.com", event_type="SUCCESS")
+        self.old_ids = list(LoginAudit.objects.exclude(pk=self.recent.pk).order_by("id").values_list("id", flat=True))
+
+    def archived_ids(self, **filters):
+        return [row["id"] for row in self.archive.iter_rows("login", **filters)]
+
+    def assertArchivedOnce(self):
+        counts = Counter(self.archived_ids())
+        self.assertEqual(sorted(counts), self.old_ids)
+        self.assertEqual(set(counts.values()), {1})
+        self.assertEqual(list(LoginAudit.objects.values_list("id", flat=True)), [self.recent.pk])
+        self.assertFalse((self.archive.root / "login" / CHECKPOINT_FILE).exists())
+
+    def test_archive_moves_old_rows_into_day_segments(self):
+        self.assertEqual(self.archive.archive("login", batch_size=4), 6)
+
+        self.assertArchivedOnce()
+        self.assertEqual(len(list(self.archive.root.glob("login/*/*/*/segment-*.jsonl.gz"))), 3)
+        row = next(self.archive.iter_rows("login"))
+        self.assertEqual((row["email_attempted"], row["ip_address"]), ("user0@example.com", "10.0.0.0"))
+
+    def test_iter_rows_applies_time_and_filter_bounds(self):
+        self.archive.archive("login", batch_size=4)
+        ids = self.old_ids
+
+        day2 = self.start + timedelta(days=1)
+        self.assertEqual(self.archived_ids(since=day2), ids[2:])
+        self.assertEqual(self.archived_ids(until=day2), ids[:2])
+        self.assertEqual(self.archived_ids(since=day2, until=day2 + timedelta(minutes=3)), ids[2:3])
+        self.assertEqual(self.archived_ids(event_type="SUCCESS"), ids[1::2])
+        self.assertEqual(self.archived_ids(ip_address="10.0.0.1", since=day2), [ids[4]])
+        self.assertEqual(self.archived_ids(ip_address=None), ids)
+        self.assertEqual(self.archived_ids(since=self.start + timedelta(days=3)), [])
+
+    def test_crash_between_checkpoint_and_delete_resumes_without_loss(self):
+        with mock.patch.object(AuditArchive, "_delete", side_effect=Crash):
+            with self.assertRaises(Crash):
+                self.archive.archive("login", batch_size=4)
+        checkpoint = json.loads((self.archive.root / "login" / CHECKPOINT_FILE).read_text())
+        self.assertEqual(checkpoint["ids"], self.old_ids[:4])
+        self.assertEqual(LoginAudit.objects.count(), 7)
+
+        self.assertEqual(self.archive.archive("login", batch_size=4), 6)
+        self.assertArchivedOnce()
+
+    def test_crash_while_writing_segments_rearchives_the_same_batch(self):
+        write_segments = AuditArchive._write_segments
+
+        def crash_after_writing(archive, table, rows):
+            write_segments(archive, table, rows)
+            raise Crash
+
+        # A batch of 3 splits the second day; its segment covers only the first of that day's rows
+        with mock.patch.object(AuditArchive, "_write_segments", crash_after_writing):
+            with self.assertRaises(Crash):
+                self.archive.archive("login", batch_size=3)
+        self.assertEqual(LoginAudit.objects.count(), 7)
+
+        # The rerun finishes the checkpointed batch before taking a larger one
+        self.assertEqual(self.archive.archive("login", batch_size=6), 6)
+        self.assertArchivedOnce()
+
+    def test_crash_before_the_checkpoint_rearchives_without_duplicates(self):
+        write_atomic = audit_archive._write_atomic
+
+        def crash_on_checkpoint(path, data):
+            if path.name == CHECKPOINT_FILE:
+                raise Crash
+            write_atomic(path, data)
+
+        with mock.patch.object(audit_archive, "_write_atomic", crash_on_checkpoint):
+            with self.assertRaises(Crash):
+                self.archive.archive("login", batch_size=3)
+        self.assertEqual(LoginAudit.objects.count(), 7)
+
+        # The rerun splits the second day differently, so no segment from the crashed run may survive
+        self.assertEqual(self.archive.archive("login", batch_size=6), 6)
+        self.assertArchivedOnce()
@@ -0,0 +1,215 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.test import TransactionTestCase, override_settings
+
+from django_backend_starter.apps.loan.models import LoginAudit
+from django_backend_starter.core.repositories.audit_buffer import BufferedAuditWriter
+
+
+def event(n):
+    return LoginAudit(email_attempted=f"user{n}@example.com", event_type="FAILURE")
+
+
+def raising(exc):
+    def save(*args, **kwargs):
+        raise exc
+    return save
+
+
+def saved_emails():
+    return list(LoginAudit.objects.order_by("id").values_list("email_attempted", flat=True))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the audit writer")
+        time.sleep(0.01)
+
+
+# Writes on the calling thread, so a test sees (and rolls back) exactly what the writer did
+@override_settings(SQLITE_WRITER={"ENABLED": False})
+class BufferedAuditWriterTests(TransactionTestCase):
+    def writer(self, start_thread=False, **options):
+        options = {"mode": "buffered", "batch_size": 100, "flush_interval": 60.0, **options}
+        writer = BufferedAuditWriter(LoginAudit, **options)
+        if not start_thread:
+            patcher = mock.patch.object(writer, "_ensure_thread")
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(writer.shutdown, timeout=1.0)
+        return writer
+
+    def queued_emails(self, writer):
+        return [obj.email_attempted for obj in writer._queue]
+
+    # ----------------------
+    # OVERFLOW POLICIES
+    # ----------------------
+    def test_drop_newest_keeps_the_queue(self):
+        writer = self.writer(max_queue=2, overflow="drop_newest")
+        for n in range(3):
+            writer.write(event(n))
+
+        self.assertEqual(self.queued_emails(writer), ["user0@example.com", "user1@example.com"])
+        self.assertEqual(writer.stats()["dropped"], 1)
+
+    def test_drop_oldest_makes_room(self):
+        writer = self.writer(max_queue=2, overflow="drop_oldest")
+        for n in range(3):
+            writer.write(event(n))
+
+        self.assertEqual(self.queued_emails(writer), ["user1@example.com", "user2@example.com"])
+        self.assertEqual(writer.stats()["dropped"], 1)
+
+    def test_block_drops_after_the_timeout(self):
+        writer = self.writer(max_queue=2, overflow="block", block_timeout=0.05)
+        for n in range(3):
+            writer.write(event(n))
+
+        self.assertEqual(len(writer._queue), 2)
+        self.assertEqual(writer.stats()["dropped"], 1)
+
+    def test_block_waits_for_a_flush_to_make_room(self):
+        writer = self.writer(max_queue=2, overflow="block", block_timeout=5.0)
+        for n in range(2):
+            writer.write(event(n))
+
+        def flush():
+            try:
+                writer.flush()
+            finally:
+                connection.close()
+
+        flusher = threading.Timer(0.05, flush)
+        flusher.start()
+        writer.write(event(2))
+        flusher.join()
+
+        self.assertEqual(self.queued_emails(writer), ["user2@example.com"])
+        self.assertEqual(saved_emails(), ["user0@example.com", "user1@example.com"])
+        self.assertEqual(writer.stats()["dropped"], 0)
+
+    def test_sync_overflow_flushes_on_the_caller(self):
+        writer = self.writer(max_queue=2, overflow="sync")
+        for n in range(3):
+            writer.write(event(n))
+
+        self.assertEqual(saved_emails(), ["user0@example.com", "user1@example.com"])
+        self.assertEqual(self.queued_emails(writer), ["user2@example.com"])
+        stats = writer.stats()
+        self.assertEqual((stats["overflow_sync_writes"], stats["dropped"]), (1, 0))
+
+    # ----------------------
+    # FAILED BATCHES
+    # ----------------------
+    def test_failed_batch_is_written_one_event_at_a_time_and_requeued(self):
+        writer = self.writer()
+        events = [event(n) for n in range(4)]
+        events[1].save = raising(IntegrityError("rejected"))
+        events[2].save = raising(OperationalError("database is locked"))
+        for obj in events:
+            writer.write(obj)
+
+        with mock.patch.object(LoginAudit.objects, "bulk_create", side_effect=OperationalError("locked")), \
+                self.assertLogs("django_backend_starter.core.repositories.audit_buffer", "ERROR"):
+            self.assertEqual(writer.flush(), 4)
+
+        self.assertEqual(saved_emails(), ["user0@example.com"])
+        self.assertEqual(self.queued_emails(writer), ["user2@example.com", "user3@example.com"])
+        stats = writer.stats()
+        self.assertEqual(
+            (stats["written"], stats["failed"], stats["requeued"], stats["flush_errors"]), (1, 1, 2, 1)
+        )
+
+        # Once the database is back the requeued events are written in order
+        del events[2].save
+        writer.flush()
+        self.assertEqual(saved_emails(), ["user0@example.com", "user2@example.com", "user3@example.com"])
+        self.assertEqual(writer.stats()["written"], 3)
+
+    def test_requeue_past_max_queue_drops_the_newest(self):
+        writer = self.writer(max_queue=2)
+        events = [event(n) for n in range(3)]
+        for obj in events:
+            obj.save = raising(OperationalError("database is locked"))
+        with self.assertLogs("django_backend_starter.core.repositories.audit_buffer", "ERROR"):
+            writer._write_each(events)
+
+        self.assertEqual(self.queued_emails(writer), ["user0@example.com", "user1@example.com"])
+        stats = writer.stats()
+        self.assertEqual((stats["requeued"], stats["dropped"]), (3, 1))
+
+    # ----------------------
+    # FLUSH TRIGGERS
+    # ----------------------
+    def test_flushes_when_a_batch_is_full(self):
+        writer = self.writer(start_thread=True, batch_size=3)
+        for n in range(3):
+            writer.write(event(n))
+
+        wait_for(lambda: writer.stats()["written"] == 3)
+        self.assertEqual(len(saved_emails()), 3)
+
+    def test_flushes_after_the_interval(self):
+        writer = self.writer(start_thread=True, flush_interval=0.05)
+        writer.write(event(0))
+
+        wait_for(lambda: writer.stats()["written"] == 1)
+        self.assertEqual(saved_emails(), ["user0@example.com"])
+
+    def test_shutdown_flushes_and_later_writes_are_inline(self):
+        writer = self.writer(start_thread=True)
+        writer.write(event(0))
+        writer.write(event(1))
+        self.assertEqual(saved_emails(), [])
+
+        writer.shutdown()
+        self.assertEqual(saved_emails(), ["user0@example.com", "user1@example.com"])
+
+        writer.write(event(2))
+        self.assertEqual(len(saved_emails()), 3)
+        self.assertEqual(len(writer._queue), 0)
+
+    # ----------------------
+    # INLINE WRITES
+    # ----------------------
+    def test_sync_mode_saves_inline(self):
+        writer = self.writer(mode="sync")
+        writer.write(event(0))
+        async_to_sync(writer.awrite)(event(1))
+
+        self.assertEqual(saved_emails(), ["user0@example.com", "user1@example.com"])
+        self.assertEqual((len(writer._queue), writer.stats()["written"]), (0, 2))
+
+    def test_buffered_write_in_a_transaction_is_saved_with_it(self):
+        writer = self.writer()
+        with transaction.atomic():
+            writer.write(event(0))
+            self.assertEqual(saved_emails(), ["user0@example.com"])
+            transaction.set_rollback(True)
+
+        self.assertEqual(saved_emails(), [])
+        self.assertEqual(len(writer._queue), 0)
+
+    def test_counters_from_concurrent_writers_add_up(self):
+        writer = self.writer(mode="sync")
+
+        def write(n):
+            try:
+                for i in range(25):
+                    writer.write(event(n * 100 + i))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(write, range(8)))
+
+        self.assertEqual(writer.stats()["written"], 200)
+        self.assertEqual(LoginAudit.objects.count(), 200)
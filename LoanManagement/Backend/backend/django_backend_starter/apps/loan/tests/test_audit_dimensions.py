@@ -0,0 +1,122 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from django_backend_starter.apps.loan.models import AuditIPAddress, AuditUserAgent, LoginAudit
+from django_backend_starter.core.repositories.audit_dimensions import (
+    DimensionTable, backfill, intern_login_audits, ip_addresses, ip_filter, original_rows, user_agents,
+)
+
+UA = "Mozilla/5.0 (X11; Linux x86_64)"
+OTHER_UA = "curl/8.0"
+
+
+class DimensionTestCase(TestCase):
+    def setUp(self):
+        # Ids interned during a test are rolled back with it
+        self.addCleanup(user_agents.clear)
+        self.addCleanup(ip_addresses.clear)
+
+    def inline_audit(self, user_agent=UA, ip="10.0.0.1"):
+        """A row as written before interning was on."""
+        audit = LoginAudit.objects.create(email_attempted="a@example.com", event_type="FAILURE")
+        LoginAudit.objects.filter(pk=audit.pk).update(user_agent=user_agent, ip_address=ip)
+        return audit.pk
+
+
+class InternTests(DimensionTestCase):
+    def test_user_agents_are_stored_once(self):
+        audits = [LoginAudit(event_type="SUCCESS", user_agent=UA, ip_address="10.0.0.1") for _ in range(3)]
+        intern_login_audits(audits)
+
+        self.assertEqual(AuditUserAgent.objects.count(), 1)
+        self.assertEqual({audit.user_agent_ref_id for audit in audits}, {AuditUserAgent.objects.get().pk})
+        self.assertEqual({audit.user_agent for audit in audits}, {None})
+        # IPs stay inline unless AUDIT_DIMENSIONS["IP_ADDRESSES"] is on
+        self.assertEqual({audit.ip_address for audit in audits}, {"10.0.0.1"})
+
+    @override_settings(AUDIT_DIMENSIONS={"IP_ADDRESSES": True})
+    def test_ips_are_interned_when_enabled(self):
+        audit = LoginAudit(event_type="SUCCESS", user_agent=UA, ip_address="10.0.0.1")
+        intern_login_audits([audit])
+        self.assertEqual(audit.ip_ref_id, AuditIPAddress.objects.get(value="10.0.0.1").pk)
+        self.assertIsNone(audit.ip_address)
+
+
+@override_settings(AUDIT_DIMENSIONS={"CACHE_SIZE": 2})
+class DimensionTableCacheTests(DimensionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.table = DimensionTable(AuditUserAgent, hashed=True)
+
+    def intern(self, *values):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.table.ids_for(values)
+
+    def test_known_values_cost_no_query(self):
+        ids = self.intern(UA)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.table.ids_for([UA]), ids)
+        self.assertEqual(self.table.stats()["hits"], 1)
+
+    def test_least_recently_used_values_are_evicted(self):
+        self.intern("a", "b")
+        self.intern("a")  # now the most recently used
+        self.intern("c")
+        self.assertEqual(list(self.table._ids), ["a", "c"])
+
+    def test_ids_are_only_cached_once_committed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.table.ids_for([UA])
+                transaction.set_rollback(True)
+        self.assertEqual(self.table.stats()["cached"], 0)
+        self.assertFalse(AuditUserAgent.objects.exists())
+
+
+class ReadBackTests(DimensionTestCase):
+    def test_original_rows_read_interned_and_inline_values(self):
+        interned = LoginAudit.objects.create(event_type="SUCCESS", user_agent=UA).pk
+        inline = self.inline_audit(user_agent=OTHER_UA)
+
+        rows = original_rows(LoginAudit.objects.order_by("id"), ["id", "user_agent"], 10)
+        self.assertEqual(rows, [{"id": interned, "user_agent": UA}, {"id": inline, "user_agent": OTHER_UA}])
+
+    @override_settings(AUDIT_DIMENSIONS={"IP_ADDRESSES": True})
+    def test_ip_filter_matches_interned_and_inline_rows(self):
+        interned = LoginAudit.objects.create(event_type="SUCCESS", ip_address="10.0.0.1").pk
+        inline = self.inline_audit(ip="10.0.0.1")
+        self.inline_audit(ip="10.0.0.2")
+
+        matched = set(LoginAudit.objects.filter(ip_filter("10.0.0.1")).values_list("id", flat=True))
+        self.assertEqual(matched, {interned, inline})
+
+
+class BackfillTests(DimensionTestCase):
+    def test_backfill_interns_inline_rows_in_batches(self):
+        pks = [self.inline_audit(), self.inline_audit(), self.inline_audit(user_agent=OTHER_UA)]
+        batches = []
+
+        moved = backfill(batch_size=2, on_batch=lambda count, last_id: batches.append((count, last_id)))
+
+        self.assertEqual(moved, 3)
+        self.assertEqual(batches, [(2, pks[1]), (1, pks[2])])
+        self.assertEqual(AuditUserAgent.objects.count(), 2)
+        self.assertFalse(LoginAudit.objects.filter(user_agent__isnull=False).exists())
+        rows = original_rows(LoginAudit.objects.order_by("id"), ["user_agent", "ip_address"], 10)
+        self.assertEqual([row["user_agent"] for row in rows], [UA, UA, OTHER_UA])
+        self.assertEqual({row["ip_address"] for row in rows}, {"10.0.0.1"})  # IPs left inline
+
+    def test_migration_interns_and_restores_with_historical_models(self):
+        migration = import_module("django_backend_starter.apps.loan.migrations.0007_backfill_audit_dimensions")
+        pk = self.inline_audit()
+
+        migration.intern_existing(apps, None)
+        audit = LoginAudit.objects.get(pk=pk)
+        self.assertEqual((audit.user_agent, audit.user_agent_ref.value), (None, UA))
+
+        migration.restore_inline(apps, None)
+        audit = LoginAudit.objects.get(pk=pk)
+        self.assertEqual((audit.user_agent, audit.user_agent_ref_id), (UA, None))
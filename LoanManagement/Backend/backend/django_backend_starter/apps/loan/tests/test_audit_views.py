@@ -0,0 +1,36 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from django_backend_starter.apps.loan.models import UserModel
+
+
+class AuditListParameterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserModel.objects.create(email="admin@example.com", role="admin", is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_counts_require_a_window(self):
+        response = self.client.get(reverse("audit-logins"), {"mode": "counts", "group_by": "event_type"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_counts_window_is_capped(self):
+        response = self.client.get(reverse("audit-admin"), {
+            "mode": "counts", "group_by": "action", "since": "2026-01-01T00:00:00Z", "until": "2026-06-01T00:00:00Z",
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_counts_within_window(self):
+        response = self.client.get(reverse("audit-logins"), {
+            "mode": "counts", "group_by": "event_type", "since": "2026-01-01T00:00:00Z", "until": "2026-01-08T00:00:00Z",
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_uuid_filters_are_rejected(self):
+        for name, param in (("audit-logins", "user_id"), ("audit-admin", "admin_id"), ("audit-admin", "target_user_id")):
+            response = self.client.get(reverse(name), {param: "not-a-uuid"})
+            self.assertEqual(response.status_code, 400, param)
@@ -0,0 +1,61 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from django_backend_starter.apps.loan.tests.utils import SharedCacheMixin
+from django_backend_starter.core.repositories.db_routing import PIN_COOKIE, _current_request, pin_to_primary, read_alias
+
+ROUTING = {"REPLICAS": {"replica_1": 1}, "ROUTED_READS": ("agents.list",), "READ_YOUR_WRITES_SECONDS": 5}
+
+
+class FakeUser:
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+@override_settings(DATABASE_ROUTING=ROUTING)
+class ReadYourWritesTests(SimpleTestCase):
+    def read_alias_for(self, user, cookies=None):
+        request = RequestFactory().get("/agents/")
+        request.user = user
+        request.COOKIES.update(cookies or {})
+        token = _current_request.set(request)
+        try:
+            return read_alias("agents.list")
+        finally:
+            _current_request.reset(token)
+
+    def pin(self, user_id):
+        response = HttpResponse()
+        pin_to_primary(user_id, response)
+        return {PIN_COOKIE: response.cookies[PIN_COOKIE].value}
+
+    def test_unpinned_reads_use_a_replica(self):
+        self.assertEqual(self.read_alias_for(FakeUser(1)), "replica_1")
+
+    def test_the_pin_cookie_sends_the_user_to_the_primary(self):
+        cookies = self.pin(1)
+        self.assertEqual(self.read_alias_for(FakeUser(1), cookies), "default")
+        # a pin is only for the user that wrote
+        self.assertEqual(self.read_alias_for(FakeUser(2), cookies), "replica_1")
+
+    def test_a_tampered_pin_cookie_is_ignored(self):
+        self.assertEqual(self.read_alias_for(FakeUser(1), {PIN_COOKIE: "1"}), "replica_1")
+
+    def test_a_process_local_cache_does_not_pin(self):
+        pin_to_primary(1)
+        self.assertEqual(self.read_alias_for(FakeUser(1)), "replica_1")
+
+
+@override_settings(DATABASE_ROUTING=ROUTING)
+class SharedCachePinTests(SharedCacheMixin, SimpleTestCase):
+    def test_a_shared_cache_pins_clients_without_cookies(self):
+        pin_to_primary(1)
+        request = RequestFactory().get("/agents/")
+        request.user = FakeUser(1)
+        token = _current_request.set(request)
+        try:
+            self.assertEqual(read_alias("agents.list"), "default")
+        finally:
+            _current_request.reset(token)
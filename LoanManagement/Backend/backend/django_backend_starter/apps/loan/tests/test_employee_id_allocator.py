@@ -0,0 +1,111 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+
+from django_backend_starter.apps.loan.models import EmployeeIdSequence, UserModel
+from django_backend_starter.core.repositories.employee_id_allocator import EmployeeIdAllocator
+from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl
+from django_backend_starter.core.services.agent_import_service import AgentImportService
+
+
+WORKERS = 8
+
+
+def run_concurrently(work, workers=WORKERS):
+    """Runs work(n) on `workers` threads released together, each on its own DB connection."""
+    barrier = threading.Barrier(workers)
+
+    def worker(n):
+        try:
+            barrier.wait()
+            return work(n)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(worker, range(workers)))
+
+
+class EmployeeIdAllocatorTests(TransactionTestCase):
+    def test_ids_are_unique_across_allocators(self):
+        first, second = EmployeeIdAllocator(block_size=5), EmployeeIdAllocator(block_size=5)
+        ids = first.allocate_many(3) + second.allocate_many(7) + first.allocate_many(4) + second.allocate_many(1)
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_concurrent_allocators_never_share_an_id(self):
+        # One allocator per thread stands in for one per worker process, racing the
+        # bootstrap of the sequence row and then each other's block reservations
+        def allocate(n):
+            allocator = EmployeeIdAllocator(block_size=3)
+            ids = []
+            for i in range(20):
+                if i % 4 == 0:
+                    with transaction.atomic():
+                        ids += allocator.allocate_many(2)
+                else:
+                    ids.append(allocator.allocate())
+            return ids
+
+        ids = [employee_id for batch in run_concurrently(allocate) for employee_id in batch]
+        self.assertEqual(len(ids), WORKERS * 25)
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_concurrent_user_creation_gets_unique_ids(self):
+        def create(n):
+            return [
+                UserModel.objects.create(email=f"agent{n}-{i}@example.com", role="agent").employee_id
+                for i in range(10)
+            ]
+
+        ids = [employee_id for batch in run_concurrently(create) for employee_id in batch]
+        self.assertEqual(len(set(ids)), WORKERS * 10)
+        self.assertEqual(UserModel.objects.count(), WORKERS * 10)
+
+    def test_bootstrap_skips_existing_ids(self):
+        UserModel.objects.create(email="old@example.com", role="agent", employee_id="EMP1200")
+        EmployeeIdSequence.objects.all().delete()
+        self.assertEqual(EmployeeIdAllocator(block_size=5).allocate(), "EMP1201")
+
+    def test_rolled_back_reservation_is_not_reused(self):
+        allocator, other = EmployeeIdAllocator(block_size=50), EmployeeIdAllocator(block_size=50)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                inside = allocator.allocate_many(2)
+                raise RuntimeError
+        # The sequence UPDATE was rolled back with the caller, so those numbers are handed
+        # out again; the first allocator must not still be serving the rest of that block
+        reissued = other.allocate_many(10)
+        self.assertEqual(reissued[:2], inside)
+        self.assertFalse(set(allocator.allocate_many(10)) & set(reissued))
+
+    def test_block_reserved_in_autocommit_is_kept(self):
+        allocator = EmployeeIdAllocator(block_size=20)
+        allocator.allocate()
+        value = EmployeeIdSequence.objects.get().next_value
+        allocator.allocate_many(5)
+        self.assertEqual(EmployeeIdSequence.objects.get().next_value, value)
+
+    def test_import_fallback_after_integrity_error_creates_unique_ids(self):
+        repo = UserRepositoryImpl()
+        bulk_create_agents = repo.bulk_create_agents
+        calls = []
+
+        def racing_bulk_create(rows, password_hashes, admin=None):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                # Another request registers one of the emails between the check and the insert
+                UserModel.objects.create(email="b@example.com", role="agent")
+            return bulk_create_agents(rows, password_hashes, admin=admin)
+
+        repo.bulk_create_agents = racing_bulk_create
+        stream = "email,first_name,last_name,contact_number,branch,region\n" + "".join(
+            f"{name}@example.com,Test,Agent,0700000000,Central,North\n" for name in "abc"
+        )
+        summary = AgentImportService(repo).import_stream(io.StringIO(stream), "csv")
+
+        self.assertEqual((summary["created"], summary["failed"]), (2, 1))
+        ids = list(UserModel.objects.values_list("employee_id", flat=True))
+        self.assertEqual(len(ids), len(set(ids)))
@@ -0,0 +1,31 @@
+import asyncio
+import threading
+
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase
+
+from django_backend_starter.core.services.hashing_service import HashingService
+
+
+class HashingTimeoutTests(SimpleTestCase):
+    def setUp(self):
+        self.service = HashingService(backend="thread", workers=1, timeout=0.05)
+        self.addCleanup(self.service.shutdown)
+        # Occupy the only pool worker so every hash submitted after this times out
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.service._get_executor().submit(release.wait)
+
+    def test_timed_out_hash_is_computed_inline(self):
+        encoded = self.service.make_password("Secret@123")
+        self.assertTrue(check_password("Secret@123", encoded))
+        self.assertEqual(self.service.inline_fallbacks, 1)
+
+    def test_timed_out_async_hash_is_computed_inline(self):
+        encoded = asyncio.run(self.service.amake_password("Secret@123"))
+        self.assertTrue(check_password("Secret@123", encoded))
+        self.assertEqual(self.service.inline_fallbacks, 1)
+
+    def test_timed_out_history_check_finishes_inline(self):
+        old = [self.service.make_password(p) for p in ("Old@1234", "Secret@123")]
+        self.assertTrue(self.service.check_any("Secret@123", old))
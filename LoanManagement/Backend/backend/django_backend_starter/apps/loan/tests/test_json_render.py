@@ -0,0 +1,98 @@
+import json
+from dataclasses import dataclass
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from django_backend_starter.core.entities.user import UserEntity
+from django_backend_starter.core.utils.json_render import (
+    EntityJSONEncoder, FastJSONRenderer, encode_json, iter_json, streaming_json_response,
+)
+
+
+class ReferenceRenderer(JSONRenderer):
+    """DRF's renderer, able to encode entities through the generic encoder path."""
+    encoder_class = EntityJSONEncoder
+
+
+@dataclass(slots=True)
+class Row:
+    n: int
+    ok: bool
+    label: str
+
+
+def entity(n, **overrides):
+    values = {
+        "id": f"00000000-0000-0000-0000-{n:012d}", "email": f"agent{n}@example.com", "employee_id": f"EMP{n:03d}",
+        "first_name": "Tendai", "last_name": "Moyo", "contact_number": "+263771234567", "role": "agent",
+        "branch": f"Branch {n}", "region": "Region 0", "is_active": True,
+    }
+    values.update(overrides)
+    return UserEntity(**values)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertRendersLikeDRF(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), ReferenceRenderer().render(data))
+
+    def test_entities(self):
+        self.assertRendersLikeDRF(entity(1))
+        self.assertRendersLikeDRF([entity(n) for n in range(5)])
+        self.assertRendersLikeDRF([entity(1, first_name=None, is_active=None), entity(2, branch=7, is_active=1)])
+
+    def test_mistyped_field_values(self):
+        self.assertRendersLikeDRF([
+            Row(3, True, "x"), Row(None, None, None), Row(2.5, 0, 4), Row(True, False, "y"), Row(2**70, True, ""),
+        ])
+
+    def test_nested_containers(self):
+        self.assertRendersLikeDRF({
+            "results": [entity(1), {"owner": entity(2), "tags": ("a", "b")}, [[entity(3)], []]],
+            "meta": {"count": 3, "ratio": 0.5, "empty": {}},
+            "rows": [Row(1, True, "a"), entity(4)],
+        })
+
+    def test_unicode_and_line_separators(self):
+        text = "Zoë     \"quoted\" \\ \t\n \x01 \U0001f600 日本"
+        self.assertRendersLikeDRF(entity(1, first_name=text, last_name=" "))
+        self.assertRendersLikeDRF({"results": [entity(1, region=text)], text: text})
+        self.assertNotIn(" ".encode(), FastJSONRenderer().render([entity(1, first_name=" ")]))
+
+    def test_non_str_keys(self):
+        self.assertRendersLikeDRF({
+            True: entity(1), False: [entity(2)], None: {"x": entity(3)}, 1: entity(4), 2.5: entity(5), "s": 1,
+        })
+        self.assertEqual(json.loads(encode_json({None: [entity(1)]})), {"null": [entity(1).as_dict()]})
+
+    def test_unsupported_or_out_of_range_keys_raise_like_json(self):
+        with self.assertRaises(TypeError):
+            encode_json({(1, 2): [entity(1)]})
+        with self.assertRaises(ValueError):
+            encode_json({float("nan"): [entity(1)]})
+
+
+class StreamingJSONTests(SimpleTestCase):
+    def expected(self, items, **extra):
+        return {"count": len(items), "results": [item.as_dict() for item in items], **extra}
+
+    def test_iter_json_output_parses(self):
+        items = [entity(n, first_name="Zoë ") for n in range(7)]
+        for chunk_size in (1, 3, 7, 100):
+            body = b"".join(iter_json({"count": 7}, "results", iter(items), chunk_size=chunk_size))
+            self.assertEqual(json.loads(body), self.expected(items))
+            self.assertNotIn(" ".encode(), body)
+
+    def test_iter_json_with_tail_and_no_items(self):
+        for items in ([], [entity(1), entity(2)]):
+            for tail in (lambda: None, lambda: {"next_cursor": "abc", "more": True}):
+                body = b"".join(iter_json({"count": len(items)}, "results", iter(items), chunk_size=1, tail=tail))
+                self.assertEqual(json.loads(body), self.expected(items, **(tail() or {})))
+
+    def test_streaming_json_response_parses(self):
+        items = [entity(n) for n in range(3)]
+        response = streaming_json_response({"count": 3}, "results", iter(items), chunk_size=2,
+                                           tail=lambda: {"next_cursor": None})
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(b"".join(response.streaming_content)),
+                         self.expected(items, next_cursor=None))
@@ -0,0 +1,80 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.apps.loan.tests.utils import SharedCacheMixin
+from django_backend_starter.core.repositories.audit_dimensions import user_agents
+
+PASSWORD = "Budget@12345"
+USER_AGENT = "login-query-budget"
+
+# Each view writes in an atomic block; inside TestCase's transaction that block and
+# the audit write's own atomic each add a SAVEPOINT and a RELEASE SAVEPOINT.
+SAVEPOINTS = 4
+
+
+@override_settings(AUDIT_BUFFER={"MODE": "sync"})
+class LoginTestCase(TestCase):
+    """Logs in with the audit row written inline and a known user agent."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create_user(email="budget@example.com", password=PASSWORD, role="agent")
+
+    def setUp(self):
+        # A new user agent costs one-off lookup-table queries; intern it as an agent seen before
+        with self.captureOnCommitCallbacks(execute=True):
+            user_agents.ids_for([USER_AGENT])
+        # The row is rolled back with the test, so its id must not outlive it
+        self.addCleanup(user_agents.clear)
+
+    def login(self, name):
+        response = self.client.post(
+            reverse(name), {"email": self.user.email, "password": PASSWORD},
+            content_type="application/json", HTTP_USER_AGENT=USER_AGENT,
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+
+class LoginQueryBudgetTests(LoginTestCase):
+    def test_login(self):
+        # user SELECT + audit INSERT
+        with self.assertNumQueries(2 + SAVEPOINTS):
+            self.login("login")
+
+    def test_jwt_audited_login(self):
+        # user SELECT + audit INSERT + OutstandingToken INSERT
+        with self.assertNumQueries(3 + SAVEPOINTS):
+            self.login("jwt-audited-create")
+
+
+@override_settings(
+    SESSION_ENGINE="django_backend_starter.core.sessions.write_behind",
+    SESSION_WRITE_BEHIND={"FLUSH_INTERVAL": 3600},  # keep the background flush out of the test transaction
+)
+class CachedSessionQueryBudgetTests(SharedCacheMixin, LoginTestCase):
+    """SESSION_STORE "cache" on a shared cache."""
+
+    def test_session_login(self):
+        # user SELECT + audit INSERT + last_login UPDATE (the session itself is cached)
+        with self.assertNumQueries(3 + SAVEPOINTS):
+            self.login("session-login")
+
+    def test_session_me(self):
+        # Session from the cache, user and profile from the session's snapshot
+        self.login("session-login")
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("session-me"))
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+class DbSessionQueryBudgetTests(LoginTestCase):
+    """SESSION_STORE "db", the default."""
+
+    def test_session_login(self):
+        # user SELECT + audit INSERT + last_login UPDATE, plus the session key's exists SELECT,
+        # its INSERT and the UPDATE saving the logged-in data; each session save adds a savepoint pair
+        with self.assertNumQueries(6 + SAVEPOINTS + 4):
+            self.login("session-login")
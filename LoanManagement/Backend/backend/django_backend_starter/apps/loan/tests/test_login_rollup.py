@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from django_backend_starter.apps.loan.models import LoginActivityRollup, LoginAudit, UserModel
+from django_backend_starter.core.repositories.login_rollup import LoginRollupRepository
+
+
+def audit(pk, event_type="SUCCESS"):
+    LoginAudit.objects.create(
+        id=pk, event_type=event_type, ip_address="10.0.0.1", timestamp=timezone.now() - timedelta(minutes=5)
+    )
+
+
+def total(column):
+    return LoginActivityRollup.objects.filter(dimension="all").aggregate(n=Sum(column))["n"] or 0
+
+
+class LoginRollupGapTests(TestCase):
+    def test_row_committed_below_the_watermark_is_folded_in(self):
+        repo = LoginRollupRepository()
+        audit(1)
+        audit(3)  # 2 is still uncommitted
+        self.assertEqual(repo.catch_up(), 2)
+        self.assertEqual((repo.watermark(), list(repo.gaps())), (3, [2]))
+
+        audit(2, "FAILURE")
+        self.assertEqual(repo.catch_up(), 1)
+        self.assertEqual((total("success"), total("failure")), (2, 1))
+        self.assertEqual(repo.gaps(), {})
+
+    def test_gap_is_given_up_after_gap_seconds(self):
+        audit(1)
+        audit(3)
+        LoginRollupRepository().catch_up()
+        LoginRollupRepository(gap_seconds=-1).catch_up()
+        self.assertEqual(LoginRollupRepository().gaps(), {})
+
+    def test_read_does_not_catch_up_by_default(self):
+        admin = UserModel.objects.create(email="admin@example.com", role="admin", is_staff=True)
+        audit(1)
+        client = APIClient()
+        client.force_authenticate(admin)
+        self.assertEqual(client.get(reverse("audit-login-rollup")).status_code, 200)
+        self.assertEqual(LoginRollupRepository().watermark(), 0)
@@ -0,0 +1,74 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_backend_starter.apps.loan.models import LoginAudit, UserModel
+from django_backend_starter.core.services.auth_services import AuthService
+from django_backend_starter.core.services.login_throttle import (
+    LoginThrottle, LoginThrottled, get_throttle_settings,
+)
+
+PASSWORD = "Throttle@12345"
+
+
+@override_settings(AUDIT_BUFFER={"MODE": "sync"})
+class LoginThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create_user(email="agent@example.com", password=PASSWORD, role="agent")
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def post(self, name, password):
+        return self.client.post(
+            reverse(name), {"email": self.user.email, "password": password}, content_type="application/json"
+        )
+
+    def test_throttled_login_returns_429_with_retry_after(self):
+        for _ in range(get_throttle_settings()["LIMITS"]["email"]):
+            self.assertEqual(self.post("login", "wrong").status_code, 401)
+
+        for name in ("login", "session-login", "jwt-audited-create"):
+            response = self.post(name, PASSWORD)
+            self.assertEqual(response.status_code, 429)
+            self.assertGreater(int(response["Retry-After"]), 0)
+
+    def test_throttled_login_is_audited(self):
+        for _ in range(get_throttle_settings()["LIMITS"]["email"]):
+            self.post("login", "wrong")
+        self.post("login", PASSWORD)
+
+        audit = LoginAudit.objects.latest("id")
+        self.assertEqual((audit.event_type, audit.email_attempted), ("THROTTLED", self.user.email))
+
+    def test_throttled_flood_writes_one_audit_row_per_window(self):
+        conf = get_throttle_settings()
+        now = [conf["WINDOW"] * 1111.0]  # the start of a window
+        throttle = LoginThrottle(conf, clock=lambda: now[0])
+        service = AuthService(throttle=throttle)
+        for _ in range(conf["LIMITS"]["email"]):
+            with self.assertRaises(ValueError):
+                service.login(self.user.email, "wrong", ip="203.0.113.9")
+
+        for login in (service.login, async_to_sync(service.alogin)):
+            for _ in range(10):
+                with self.assertRaises(LoginThrottled):
+                    login(self.user.email, PASSWORD, ip="203.0.113.9")
+
+        throttled = LoginAudit.objects.filter(event_type="THROTTLED")
+        self.assertEqual(throttled.count(), 1)
+        self.assertEqual(throttle.rejections(self.user.email, "203.0.113.9"), {"email": 20, "ip": 0, "email_ip": 20})
+
+        # The next window still counts all of the previous one at its start: one more row
+        now[0] += conf["WINDOW"]
+        with self.assertRaises(LoginThrottled):
+            service.login(self.user.email, PASSWORD, ip="203.0.113.9")
+        self.assertEqual(throttled.count(), 2)
+
+    def test_lock_out_stores_a_whole_attempt_count(self):
+        self.user.lock_out(4.6)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.failed_login_attempts, 5)
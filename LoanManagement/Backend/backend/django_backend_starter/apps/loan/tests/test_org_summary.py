@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.apps.loan.tests.utils import SharedCacheMixin
+from django_backend_starter.core.repositories.org_summary import org_summary
+
+
+class OrgSummaryTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = UserModel.objects.create(email="agent@example.com", role="agent", region="North", branch="A")
+
+    def suspended(self):
+        return org_summary.get()["totals"]["suspended"]
+
+
+class ProcessLocalOrgSummaryTests(OrgSummaryTestCase):
+    def test_every_read_recomputes(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.suspended(), 0)
+        # e.g. suspended on another worker, whose invalidation this one never sees
+        UserModel.objects.filter(pk=self.agent.pk).update(is_suspended=True)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.suspended(), 1)
+
+
+class SharedOrgSummaryTests(SharedCacheMixin, OrgSummaryTestCase):
+    def test_reads_are_cached_until_an_agent_changes(self):
+        self.assertEqual(self.suspended(), 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suspended(), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.agent.is_suspended = True
+            self.agent.save(update_fields=["is_suspended"])
+        self.assertEqual(self.suspended(), 1)
@@ -0,0 +1,23 @@
+from django.test import TestCase
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.apps.loan.tests.utils import SharedCacheMixin
+from django_backend_starter.core.repositories.principal_cache import get_principal
+
+
+class LocalPrincipalCacheTests(TestCase):
+    def test_process_local_cache_reads_the_row_every_time(self):
+        user = UserModel.objects.create(email="agent@example.com", role="agent")
+        get_principal(user.pk)
+        # Written behind the cache's back, as another worker would
+        UserModel.objects.filter(pk=user.pk).update(is_suspended=True)
+        with self.assertNumQueries(1):
+            self.assertTrue(get_principal(user.pk).is_suspended)
+
+
+class SharedPrincipalCacheTests(SharedCacheMixin, TestCase):
+    def test_shared_cache_serves_the_principal(self):
+        user = UserModel.objects.create(email="agent@example.com", role="agent")
+        get_principal(user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_principal(user.pk).email, "agent@example.com")
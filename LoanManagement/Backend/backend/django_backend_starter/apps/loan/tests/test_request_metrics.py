@@ -0,0 +1,47 @@
+import os
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.utils.metrics import _COUNT, _QUERIES, render_prometheus, request_metrics
+
+SERIES = ("list-agents", "GET", "2xx")
+
+
+def recorded(slot):
+    return request_metrics.totals().get(SERIES, [0] * 5)[slot]
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserModel.objects.create(email="admin@example.com", role="admin", is_staff=True)
+        for n in range(3):
+            UserModel.objects.create(email=f"agent{n}@example.com", role="agent")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_streaming_response_is_recorded_once_streamed(self):
+        count, queries = recorded(_COUNT), recorded(_QUERIES)
+
+        response = self.client.get(reverse("list-agents"), {"stream": "true"})
+        self.assertEqual(recorded(_COUNT), count)
+        with CaptureQueriesContext(connection) as streamed:
+            b"".join(response.streaming_content)
+
+        self.assertGreater(len(streamed), 0)
+        self.assertEqual(recorded(_COUNT), count + 1)
+        self.assertGreaterEqual(recorded(_QUERIES) - queries, len(streamed))
+
+    def test_series_are_labelled_with_the_worker_pid(self):
+        self.client.get(reverse("list-agents"))
+        pid = f'pid="{os.getpid()}"'
+        samples = [line for line in render_prometheus().splitlines() if not line.startswith("#")]
+        self.assertTrue(samples)
+        self.assertTrue(all(pid in line for line in samples))
@@ -0,0 +1,76 @@
+from importlib import import_module
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.apps.loan.tests.utils import SharedCacheMixin
+from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl
+from django_backend_starter.core.sessions.write_behind import SessionStore, session_writer
+
+PASSWORD = "Session@12345"
+WRITE_BEHIND = "django_backend_starter.core.sessions.write_behind"
+
+
+class WriteBehindConfigTests(TestCase):
+    def test_refuses_a_process_local_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            SessionStore()
+
+
+@override_settings(
+    AUDIT_BUFFER={"MODE": "sync"},
+    SESSION_ENGINE=WRITE_BEHIND,
+    SESSION_WRITE_BEHIND={"FLUSH_INTERVAL": 3600},
+)
+class WriteBehindSessionTests(SharedCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create_user(email="agent@example.com", password=PASSWORD, role="agent")
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(session_writer._pending.clear)
+
+    def login(self):
+        response = self.client.post(
+            reverse("session-login"), {"email": self.user.email, "password": PASSWORD}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return self.client.session.session_key
+
+    def assertLoggedOut(self):
+        self.assertIn(self.client.get(reverse("session-me")).status_code, (401, 403))
+
+    def test_deleted_session_is_not_served_or_saved_again(self):
+        key = self.login()
+        # Another worker's copy of the session, with a save it has not flushed yet
+        stale = import_module(WRITE_BEHIND).SessionStore(key)
+        stale["seen"] = True
+        stale.save()
+
+        SessionStore(key).delete()
+
+        self.assertEqual(SessionStore(key).load(), {})
+        stale.save()
+        self.assertEqual(SessionStore(key).load(), {})
+        self.assertLoggedOut()
+
+    def test_suspension_ends_the_session(self):
+        self.login()
+        self.assertEqual(self.client.get(reverse("session-me")).status_code, 200)
+        UserRepositoryImpl().set_suspension(True, user_ids=[self.user.pk])
+        self.assertLoggedOut()
+
+    def test_lockout_ends_the_session(self):
+        self.login()
+        UserModel.objects.get(pk=self.user.pk).lock_out(5)
+        self.assertLoggedOut()
+
+    def test_password_change_elsewhere_ends_the_session(self):
+        self.login()
+        user = UserModel.objects.get(pk=self.user.pk)
+        user.set_password("Changed@12345")
+        user.save()
+        self.assertLoggedOut()
@@ -0,0 +1,78 @@
+import uuid
+from concurrent.futures import Future
+
+from django.db import IntegrityError, OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from django_backend_starter.apps.loan.models import MAX_FAILED_ATTEMPTS, LoginAudit, UserModel
+from django_backend_starter.core.repositories.sqlite_writer import SQLiteWriteQueue
+
+
+def audit(email, user_id=None):
+    return LoginAudit.objects.create(user_id=user_id, email_attempted=email, event_type="FAILURE").pk
+
+
+class WriteBatchTests(TransactionTestCase):
+    def process(self, *writes):
+        writer = SQLiteWriteQueue()
+        return writer, writer._process([(func, args, {}, Future()) for func, *args in writes])
+
+    def test_a_deferred_foreign_key_failure_only_fails_its_own_write(self):
+        writer, outcomes = self.process(
+            (audit, "first@example.com"),
+            (audit, "dangling@example.com", uuid.uuid4()),
+            (audit, "last@example.com"),
+        )
+
+        self.assertEqual([ok for ok, _ in outcomes], [True, False, True])
+        self.assertIsInstance(outcomes[1][1], IntegrityError)
+        self.assertEqual(
+            set(LoginAudit.objects.values_list("email_attempted", flat=True)),
+            {"first@example.com", "last@example.com"},
+        )
+        self.assertEqual(writer.stats()["split_batches"], 1)
+
+
+@override_settings(SQLITE_WRITER={"BACKOFF": 0.001})
+class DirectWriteTests(TransactionTestCase):
+    def test_direct_write_is_retried_on_lock_errors(self):
+        writer = SQLiteWriteQueue()
+        attempts = []
+
+        def write():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OperationalError("database is locked")
+            return audit("retried@example.com")
+
+        pk = writer.run(write)
+
+        self.assertEqual(len(attempts), 3)
+        self.assertTrue(LoginAudit.objects.filter(pk=pk).exists())
+        self.assertEqual(writer.stats()["inline"], 1)
+        self.assertIsNone(writer._thread)
+
+    def test_other_errors_are_not_retried(self):
+        attempts = []
+
+        def write():
+            attempts.append(1)
+            raise OperationalError("no such table: nope")
+
+        with self.assertRaises(OperationalError):
+            SQLiteWriteQueue().run(write)
+        self.assertEqual(len(attempts), 1)
+
+
+class FailedAttemptTests(TestCase):
+    def test_failures_on_stale_instances_are_all_counted(self):
+        user = UserModel.objects.create_user(email="agent@example.com", password="Agent@12345")
+        copies = [UserModel.objects.get(pk=user.pk) for _ in range(MAX_FAILED_ATTEMPTS)]
+
+        for copy in copies:
+            copy.register_failed_attempt()
+
+        user.refresh_from_db()
+        self.assertEqual(user.failed_login_attempts, MAX_FAILED_ATTEMPTS)
+        self.assertTrue(user.is_locked())
+        self.assertTrue(copies[-1].is_locked())
@@ -0,0 +1,160 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.authentication.tokens import CompactRefreshToken
+from django_backend_starter.core.repositories.token_blacklist_filter import BlacklistFilter, BloomFilter
+
+
+class BlacklistFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create_user(email="agent@example.com", password="Agent@12345", role="agent")
+
+    def use_filter(self, **options):
+        """Swaps in a fresh filter, as a newly started worker process would have."""
+        blacklist_filter = BlacklistFilter(**{"capacity": 1000, "refresh_interval": 3600, **options})
+        patcher = mock.patch("django_backend_starter.core.authentication.tokens.blacklist_filter", blacklist_filter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return blacklist_filter
+
+    def token(self):
+        return CompactRefreshToken.for_user(self.user)
+
+    def blacklist_elsewhere(self, token):
+        """Blacklists `token` the way another process would: in the DB, not in this filter."""
+        return BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token["jti"]))
+
+    def test_negative_lookup_skips_the_db(self):
+        blacklist_filter = self.use_filter()
+        blacklist_filter.rebuild()
+        token = self.token()
+
+        with self.assertNumQueries(0):
+            token.check_blacklist()
+        self.assertEqual(blacklist_filter.stats()["skipped_db"], 1)
+
+    def test_false_positive_is_confirmed_against_the_db(self):
+        blacklist_filter = self.use_filter()
+        blacklist_filter.rebuild()
+        token = self.token()
+        blacklist_filter.add(token["jti"])  # as if another JTI had set the same bits
+
+        with self.assertNumQueries(1):
+            token.check_blacklist()
+        stats = blacklist_filter.stats()
+        self.assertEqual((stats["db_checks"], stats["false_positives"]), (1, 1))
+
+    def test_blacklisted_token_is_rejected(self):
+        self.use_filter()
+        token = self.token()
+        token.blacklist()
+
+        with self.assertRaises(TokenError):
+            token.check_blacklist()
+
+    def test_incremental_sync_reads_only_rows_past_the_high_water_mark(self):
+        blacklist_filter = self.use_filter(refresh_interval=0)
+        self.blacklist_elsewhere(self.token())
+        blacklist_filter.rebuild()
+        high = blacklist_filter.stats()["high_water_mark"]
+
+        token = self.token()
+        entry = self.blacklist_elsewhere(token)
+        with self.assertNumQueries(1):
+            self.assertTrue(blacklist_filter.might_contain(token["jti"]))
+        stats = blacklist_filter.stats()
+        self.assertEqual((stats["entries"], stats["high_water_mark"], stats["rebuilds"]), (2, entry.pk, 1))
+        self.assertGreater(entry.pk, high)
+        with self.assertRaises(TokenError):
+            token.check_blacklist()
+
+    def test_rebuilds_in_a_forked_process(self):
+        blacklist_filter = self.use_filter()
+        blacklist_filter.rebuild()
+        token = self.token()
+        self.blacklist_elsewhere(token)
+
+        blacklist_filter._pid = -1  # the filter was inherited from a parent process
+        self.assertTrue(blacklist_filter.might_contain(token["jti"]))
+        self.assertEqual(blacklist_filter.stats()["rebuilds"], 2)
+
+    def test_rebuilds_larger_once_over_capacity(self):
+        blacklist_filter = self.use_filter(capacity=1, refresh_interval=0)
+        blacklist_filter.rebuild()
+        tokens = [self.token() for _ in range(3)]
+        for token in tokens:
+            self.blacklist_elsewhere(token)
+
+        blacklist_filter.might_contain("unknown")  # syncs all three past capacity 1
+        blacklist_filter.might_contain("unknown")  # ... so this lookup rebuilds
+        stats = blacklist_filter.stats()
+        self.assertEqual((stats["rebuilds"], stats["entries"], stats["capacity"]), (2, 3, 6))
+        self.assertTrue(all(blacklist_filter.might_contain(token["jti"]) for token in tokens))
+
+    def test_blacklisting_twice_raises_even_before_the_filter_syncs(self):
+        self.use_filter()
+        token = self.token()
+        token.blacklist()
+        with self.assertRaises(TokenError):
+            token.blacklist()
+
+        # Another worker whose filter has not seen the first blacklist()
+        self.use_filter()
+        with self.assertRaises(TokenError):
+            CompactRefreshToken(str(token), verify=False).blacklist()
+        self.assertEqual(BlacklistedToken.objects.filter(token__jti=token["jti"]).count(), 1)
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(1000, 0.01)
+        members = [f"jti-{n}" for n in range(1000)]
+        for jti in members:
+            bloom.add(jti)
+
+        self.assertTrue(all(jti in bloom for jti in members))
+        false_positives = sum(f"other-{n}" in bloom for n in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class CompactTokensCommandTests(TestCase):
+    def test_deletes_only_expired_tokens_in_chunks(self):
+        user = UserModel.objects.create(email="agent@example.com", role="agent")
+        now = timezone.now()
+
+        def outstanding(n, expires_in):
+            return OutstandingToken.objects.create(
+                user=user, jti=f"jti-{n}", token=f"token-{n}", created_at=now, expires_at=now + expires_in
+            )
+
+        expired = [outstanding(n, timedelta(days=-1)) for n in range(5)]
+        live = [outstanding(n + 5, timedelta(days=1)) for n in range(2)]
+        BlacklistedToken.objects.create(token=expired[0])
+        BlacklistedToken.objects.create(token=live[0])
+
+        out = io.StringIO()
+        call_command("compact_tokens", chunk_size=2, stdout=out)
+
+        self.assertEqual(out.getvalue().count("deleted "), 3)  # chunks of 2, 2 and 1
+        self.assertEqual(set(OutstandingToken.objects.values_list("jti", flat=True)), {"jti-5", "jti-6"})
+        self.assertEqual(list(BlacklistedToken.objects.values_list("token_id", flat=True)), [live[0].pk])
+
+    def test_max_chunks_stops_early(self):
+        user = UserModel.objects.create(email="agent@example.com", role="agent")
+        past = timezone.now() - timedelta(days=1)
+        OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=user, jti=f"jti-{n}", token=f"token-{n}", created_at=past, expires_at=past)
+            for n in range(5)
+        ])
+
+        call_command("compact_tokens", chunk_size=2, max_chunks=1, stdout=io.StringIO())
+        self.assertEqual(OutstandingToken.objects.count(), 3)
@@ -0,0 +1,153 @@
+import uuid
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from django_backend_starter.apps.loan.models import AdminAudit, UserModel
+from django_backend_starter.core.authentication.tokens import CompactRefreshToken
+from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl
+
+
+def statements(ctx, verb):
+    return sum(q["sql"].startswith(verb) for q in ctx.captured_queries)
+
+
+class SuspensionTestData(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserModel.objects.create(email="admin@example.com", role="admin", is_staff=True)
+        cls.agents = [
+            UserModel.objects.create(email=f"agent{n}@example.com", role="agent", branch=f"Branch {n % 2}")
+            for n in range(4)
+        ]
+        cls.suspended = UserModel.objects.create(
+            email="suspended@example.com", role="agent", branch="Branch 0", is_suspended=True,
+        )
+
+    def tokens_for(self, user, count=2):
+        for _ in range(count):
+            CompactRefreshToken.for_user(user)
+
+    def revoked(self, user):
+        return BlacklistedToken.objects.filter(token__user=user).count()
+
+
+class SetSuspensionTests(SuspensionTestData):
+    def test_statuses_audits_and_token_revocation_in_one_update(self):
+        a, b = self.agents[:2]
+        self.tokens_for(a)
+        self.tokens_for(self.suspended)
+        unknown = uuid.uuid4()
+
+        with CaptureQueriesContext(connection) as ctx:
+            results = UserRepositoryImpl().set_suspension(
+                True, admin=self.admin, user_ids=[a.pk, b.pk, self.suspended.pk, self.admin.pk, unknown],
+                reason="fraud review",
+            )
+
+        self.assertEqual(statements(ctx, "UPDATE"), 1)
+        self.assertEqual(statements(ctx, "INSERT"), 2)  # AdminAudit rows and BlacklistedToken rows
+        statuses = {r["user_id"]: (r["status"], r["tokens_revoked"]) for r in results}
+        self.assertEqual(statuses, {
+            str(a.pk): ("suspended", 2),
+            str(b.pk): ("suspended", 0),
+            str(self.suspended.pk): ("unchanged", 0),
+            str(self.admin.pk): ("skipped", 0),
+            str(unknown): ("not_found", 0),
+        })
+
+        audits = AdminAudit.objects.filter(action="SUSPEND_USER")
+        self.assertEqual(sorted(audits.values_list("target_user_id", flat=True)), sorted([a.pk, b.pk]))
+        self.assertEqual(set(audits.values_list("admin_id", "reason")), {(self.admin.pk, "fraud review")})
+        self.assertEqual((self.revoked(a), self.revoked(self.suspended)), (2, 0))
+        a.refresh_from_db()
+        self.assertEqual((a.is_suspended, a.suspension_reason), (True, "fraud review"))
+        self.assertIsNotNone(a.suspension_time)
+        self.admin.refresh_from_db()
+        self.assertFalse(self.admin.is_suspended)
+
+    def test_branch_selects_its_agents_only(self):
+        results = UserRepositoryImpl().set_suspension(True, admin=self.admin, branch="Branch 0")
+
+        statuses = {r["user_id"]: r["status"] for r in results}
+        self.assertEqual(statuses, {
+            str(self.agents[0].pk): "suspended",
+            str(self.agents[2].pk): "suspended",
+            str(self.suspended.pk): "unchanged",
+        })
+
+    def test_reactivation_clears_the_suspension_and_keeps_tokens(self):
+        self.tokens_for(self.suspended)
+
+        with CaptureQueriesContext(connection) as ctx:
+            results = UserRepositoryImpl().set_suspension(
+                False, admin=self.admin, user_ids=[self.suspended.pk, self.agents[0].pk]
+            )
+
+        self.assertEqual(statements(ctx, "UPDATE"), 1)
+        self.assertEqual(
+            {r["user_id"]: r["status"] for r in results},
+            {str(self.suspended.pk): "reactivated", str(self.agents[0].pk): "unchanged"},
+        )
+        self.suspended.refresh_from_db()
+        self.assertEqual((self.suspended.is_suspended, self.suspended.suspension_time), (False, None))
+        self.assertEqual(AdminAudit.objects.filter(action="REACTIVATE_USER").count(), 1)
+        self.assertEqual(self.revoked(self.suspended), 0)
+
+    def test_requires_a_selector(self):
+        with self.assertRaises(ValueError):
+            UserRepositoryImpl().set_suspension(True, admin=self.admin)
+
+
+class BulkSuspensionViewTests(SuspensionTestData):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def post(self, name, payload):
+        return self.client.post(reverse(name), payload, format="json")
+
+    def test_bulk_suspend_and_reactivate(self):
+        ids = [str(agent.pk) for agent in self.agents[:3]]
+        for agent in self.agents[:3]:
+            self.tokens_for(agent, count=1)
+        unknown = str(uuid.uuid4())
+
+        response = self.post("bulk-suspend-users", {
+            "user_ids": [*ids, str(self.suspended.pk), str(self.admin.pk), unknown], "reason": "audit",
+        })
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["changed"], 3)
+        self.assertEqual(
+            {r["user_id"]: r["status"] for r in body["results"]},
+            {**dict.fromkeys(ids, "suspended"), str(self.suspended.pk): "unchanged",
+             str(self.admin.pk): "skipped", unknown: "not_found"},
+        )
+        self.assertEqual(sum(r["tokens_revoked"] for r in body["results"]), 3)
+        self.assertEqual(
+            BlacklistedToken.objects.count(), OutstandingToken.objects.filter(user__in=self.agents[:3]).count()
+        )
+        self.assertEqual(AdminAudit.objects.filter(action="SUSPEND_USER").count(), 3)
+
+        response = self.post("bulk-reactivate-users", {"user_ids": ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["changed"], 3)
+        self.assertEqual(AdminAudit.objects.filter(action="REACTIVATE_USER").count(), 3)
+        self.assertFalse(UserModel.objects.filter(pk__in=ids, is_suspended=True).exists())
+
+    def test_invalid_requests_are_rejected(self):
+        for payload in ({}, {"user_ids": []}, {"user_ids": "not-a-list"}, {"user_ids": ["not-a-uuid"]}):
+            self.assertEqual(self.post("bulk-suspend-users", payload).status_code, 400, payload)
+        self.assertFalse(AdminAudit.objects.exists())
+
+    def test_agents_are_forbidden(self):
+        self.client.force_authenticate(self.agents[0])
+        response = self.post("bulk-suspend-users", {"user_ids": [str(self.agents[1].pk)]})
+        self.assertEqual(response.status_code, 403)
+        self.agents[1].refresh_from_db()
+        self.assertFalse(self.agents[1].is_suspended)
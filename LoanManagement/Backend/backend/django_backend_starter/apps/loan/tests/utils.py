@@ -0,0 +1,20 @@
+import tempfile
+
+from django.test import override_settings
+
+
+class SharedCacheMixin:
+    """Runs each test against a file-based cache, which every worker would share, instead of LocMemCache."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared = override_settings(CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": directory.name,
+            },
+        })
+        shared.enable()
+        self.addCleanup(shared.disable)
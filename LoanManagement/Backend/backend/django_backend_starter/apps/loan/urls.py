@@ -1,26 +1,47 @@
+from django.conf import settings
 from django.urls import path
 
 from .views.admin_view import *
 
-from .views.audit_view import AuditedJWTLoginView
-from .views.auth_view import LoginView
+from .views.audit_view import AuditedJWTLoginView, LoginAuditListView, AdminAuditListView
+from .views.audit_view import AsyncAuditedJWTLoginView, LoginActivityRollupView
+from .views.auth_view import LoginView, ChangePasswordView, AsyncLoginView
 from .views.auth_view import SessionLoginView, SessionLogoutView, SessionMeView
+from .views.auth_view import AsyncSessionLoginView, AsyncSessionMeView
+from .views.metrics_view import MetricsView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView, TokenRefreshView, TokenBlacklistView
 )
 
+
+def _hot_view(sync_view, async_view):
+    """The async variant of a hot endpoint when ASYNC_VIEWS is on; same URL and name either way."""
+    return (async_view if settings.ASYNC_VIEWS else sync_view).as_view()
+
+
 urlpatterns = [
-    path("auth/login/", LoginView.as_view(), name="login"),
-    path("auth/jwt/audited-create/", AuditedJWTLoginView.as_view(), name="jwt-audited-create"),
+    path("auth/login/", _hot_view(LoginView, AsyncLoginView), name="login"),
+    path("auth/jwt/audited-create/", _hot_view(AuditedJWTLoginView, AsyncAuditedJWTLoginView), name="jwt-audited-create"),
     path('agents/add/', AddAgentView.as_view(), name="add-agent"),
-    path("all/agents/", ListAgentsView.as_view(), name="list-agents"),
+    path('agents/import/', ImportAgentsView.as_view(), name="import-agents"),
+    path('agents/import/<str:job_id>/', ImportAgentsJobView.as_view(), name="import-agents-job"),
+    path("all/agents/", _hot_view(ListAgentsView, AsyncListAgentsView), name="list-agents"),
+    path("agents/search/", AgentSearchView.as_view(), name="agent-search"),
+    path("agents/summary/", AgentSummaryView.as_view(), name="agent-summary"),
+    path("users/suspend/", BulkSuspendUsersView.as_view(), name="bulk-suspend-users"),
+    path("users/reactivate/", BulkReactivateUsersView.as_view(), name="bulk-reactivate-users"),
+    path("audit/logins/", LoginAuditListView.as_view(), name="audit-logins"),
+    path("audit/admin/", AdminAuditListView.as_view(), name="audit-admin"),
+    path("audit/logins/rollup/", LoginActivityRollupView.as_view(), name="audit-login-rollup"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 
 
     
         # Session-based
-    path("auth/session/login/", SessionLoginView.as_view(), name="session-login"),
+    path("auth/session/login/", _hot_view(SessionLoginView, AsyncSessionLoginView), name="session-login"),
     path("auth/session/logout/", SessionLogoutView.as_view(), name="session-logout"),
-    path("auth/session/me/", SessionMeView.as_view(), name="session-me"),
+    path("auth/session/me/", _hot_view(SessionMeView, AsyncSessionMeView), name="session-me"),
+    path("auth/password/change/", ChangePasswordView.as_view(), name="change-password"),
 
     # JWT-based
     path("auth/jwt/create/", TokenObtainPairView.as_view(), name="jwt-create"),
@@ -1,14 +1,36 @@
+import functools
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from django_backend_starter.core.services.user_services import UserService
+from django_backend_starter.core.services.agent_import_jobs import ImportJob
+from django_backend_starter.core.services.agent_import_service import detect_format
 
 from django_backend_starter.apps.loan.models import UserModel
 from django_backend_starter.core.permissions.role_permissions import IsAdmin, IsAgent
-from core.repositories.user_repository_impl import UserRepositoryImpl
+from django_backend_starter.core.utils.json_render import streaming_json_response
+from django_backend_starter.core.utils.pagination import decode_cursor, encode_cursor, parse_bool, parse_limit
+from django_backend_starter.core.repositories.agent_search import agent_search_index
+from django_backend_starter.core.repositories.org_summary import org_summary
+from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl
+from django_backend_starter.core.utils.async_views import AsyncAPIView
+
+
+# Built on first use rather than at import, so importing the URLconf (e.g. in a
+# preloading master) opens nothing and every worker gets its own instances.
+@functools.cache
+def get_user_repo():
+    return UserRepositoryImpl()
+
+
+@functools.cache
+def get_user_service():
+    return UserService(repo=get_user_repo())
 
-user_repo = UserRepositoryImpl()
-user_service = UserService(repo=user_repo)
 
 class AddAgentView(APIView):
     permission_classes = [IsAdmin]
@@ -17,7 +39,7 @@ class AddAgentView(APIView):
         data = request.data
         try:
             # user_service = UserService()
-            agent = user_service.add_agent(
+            agent = get_user_service().add_agent(
                 email=data.get("email"),
                 first_name=data.get("first_name"),
                 last_name=data.get("last_name"),
@@ -27,20 +49,192 @@ class AddAgentView(APIView):
             )
             return Response({
                 "message": "Agent created successfully",
-                "agent": agent.__dict__
+                "agent": agent
             }, status=status.HTTP_201_CREATED)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
 
+class AgentSearchView(APIView):
+    """
+    Ranked agent lookup by partial name, email, employee ID, branch or region.
+    ?q=jo smi&role=agent&is_active=true&is_suspended=false&fuzzy=true&limit=20&cursor=...
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            offset = decode_cursor(params["cursor"])[0] if params.get("cursor") else 0
+            if not isinstance(offset, int) or offset < 0:
+                raise ValueError("Invalid cursor")
+            role = params.get("role") or None
+            if role not in (None, "admin", "agent"):
+                raise ValueError("role must be admin or agent")
+            users, next_offset = agent_search_index.search(
+                params.get("q"),
+                role=role,
+                is_active=parse_bool(params.get("is_active"), "is_active"),
+                is_suspended=parse_bool(params.get("is_suspended"), "is_suspended"),
+                fuzzy=bool(parse_bool(params.get("fuzzy"), "fuzzy")),
+                offset=offset,
+                limit=parse_limit(params.get("limit"), default=20, maximum=100),
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "results": users,
+            "next_cursor": encode_cursor(next_offset) if next_offset is not None else None,
+        }, status=status.HTTP_200_OK)
+
+
+class AgentSummaryView(APIView):
+    """
+    Active, suspended, locked and inactive agents and the last login, per region and branch.
+    Served from the cached summary; `version` (also the ETag) changes whenever it does.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        summary = org_summary.get()
+        etag = '"org-%s"' % summary["version"]
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response({
+            "version": str(summary["version"]),
+            "computed_at": summary["computed_at"],
+            "totals": summary["totals"],
+            "regions": summary["regions"],
+        }, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+
+class ImportAgentsView(APIView):
+    """
+    Stores the upload and imports it in the background (`import_agents --job`);
+    returns 202 with the job, whose status is at ImportAgentsJobView.
+    """
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Upload a CSV or JSONL file as 'file'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = detect_format(upload.name, request.data.get("format"))
+        if fmt not in ("csv", "jsonl"):
+            return Response({"error": "Format must be 'csv' or 'jsonl'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = ImportJob.create(upload, fmt, admin=request.user)
+        job.start()
+        url = reverse("import-agents-job", args=[job.id])
+        return Response(
+            {**job.status(), "status_url": request.build_absolute_uri(url)},
+            status=status.HTTP_202_ACCEPTED, headers={"Location": url},
+        )
+
+
+class ImportAgentsJobView(APIView):
+    """Status of an agent import: queued, running or done (with the row summary), or failed."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request, job_id):
+        try:
+            job_status = ImportJob(job_id).status()
+        except ValueError:
+            job_status = None
+        if job_status is None:
+            return Response({"error": "Unknown import job"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job_status, status=status.HTTP_200_OK)
+
+
 class ListAgentsView(APIView):
+    """Keyset-paginated agents. ?stream=true allows pages of up to MAX_STREAM_LIMIT, streamed as they are read."""
     permission_classes = [IsAdmin]
+    MAX_STREAM_LIMIT = 10000
 
     def get(self, request):
-        repo = UserRepositoryImpl()
-        users = repo.get_all_agents()  # we’ll implement this
-        return Response([u.__dict__ for u in users], status=status.HTTP_200_OK)
+        params = request.query_params
+        try:
+            filters = self._filters(params)
+            if parse_bool(params.get("stream"), "stream"):
+                limit = parse_limit(params.get("limit"), default=1000, maximum=self.MAX_STREAM_LIMIT)
+                return self._stream(filters, limit)
+            users, last_key = get_user_repo().list_agents(
+                limit=parse_limit(params.get("limit"), default=100, maximum=500), **filters
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._page(users, last_key, filters["order_by"])
+
+    @staticmethod
+    def _filters(params):
+        order_by = params.get("order_by", "employee_id")
+        return {
+            "after": ListAgentsView._after(params.get("cursor"), order_by),
+            "order_by": order_by,
+            "branch": params.get("branch"),
+            "region": params.get("region"),
+            "is_active": parse_bool(params.get("is_active"), "is_active"),
+            "is_suspended": parse_bool(params.get("is_suspended"), "is_suspended"),
+        }
+
+    @staticmethod
+    def _after(cursor, order_by):
+        # A cursor carries the ordering it was issued for; its key means nothing under another one
+        if not cursor:
+            return None
+        cursor_order, after = decode_cursor(cursor, size=2)
+        if cursor_order != order_by:
+            raise ValueError("cursor was issued for a different order_by")
+        if order_by == "id":
+            try:
+                uuid.UUID(str(after))
+            except ValueError:
+                raise ValueError("Invalid cursor")
+        return after
+
+    @staticmethod
+    def _page(users, last_key, order_by):
+        return Response({
+            "results": users,
+            "next_cursor": encode_cursor(order_by, last_key) if last_key is not None else None,
+        }, status=status.HTTP_200_OK)
+
+    def _stream(self, filters, limit):
+        rows = get_user_repo().iter_agents(limit=limit + 1, **filters)
+        page = {"last_key": None, "has_more": False}
+
+        def results():
+            for n, user in enumerate(rows):
+                if n == limit:
+                    page["has_more"] = True
+                    return
+                page["last_key"] = getattr(user, filters["order_by"])
+                yield user
+
+        def tail():
+            return {"next_cursor": encode_cursor(filters["order_by"], page["last_key"]) if page["has_more"] else None}
+
+        return streaming_json_response({}, "results", results(), tail=tail)
+
+
+class AsyncListAgentsView(AsyncAPIView, ListAgentsView):
+    async def get(self, request):
+        params = request.query_params
+        try:
+            filters = self._filters(params)
+            if parse_bool(params.get("stream"), "stream"):
+                # picking the replica may resolve the user; the rows are read by Django in the sync thread
+                limit = parse_limit(params.get("limit"), default=1000, maximum=self.MAX_STREAM_LIMIT)
+                return await sync_to_async(self._stream)(filters, limit)
+            users, last_key = await get_user_repo().alist_agents(
+                limit=parse_limit(params.get("limit"), default=100, maximum=500), **filters
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._page(users, last_key, filters["order_by"])
 
 
 
@@ -53,7 +247,7 @@ class SuspendUserView(APIView):
 
         # user_service = UserService()
         user = UserModel.objects.get(id=user_id)
-        user_service.suspend_user(admin, user, reason)
+        get_user_service().suspend_user(admin, user, reason)
 
         return Response({"message": "User suspended"}, status=status.HTTP_200_OK)
 
@@ -64,6 +258,39 @@ class ReactivateUserView(APIView):
         admin = request.user
         # user_service = UserService()
         user = UserModel.objects.get(id=user_id)
-        user_service.reactivate_user(admin, user)
+        get_user_service().reactivate_user(admin, user)
 
         return Response({"message": "User reactivated"}, status=status.HTTP_200_OK)
+
+
+
+class _BulkSuspensionView(APIView):
+    """POST {"user_ids": [...]} or {"branch": ..., "region": ...}; returns one result per user."""
+    permission_classes = [IsAdmin]
+    suspend = True
+
+    def post(self, request):
+        data = request.data
+        selector = {
+            "user_ids": data.get("user_ids"),
+            "branch": data.get("branch"),
+            "region": data.get("region"),
+        }
+        try:
+            if self.suspend:
+                results = get_user_service().bulk_suspend(request.user, reason=data.get("reason", ""), **selector)
+            else:
+                results = get_user_service().bulk_reactivate(request.user, **selector)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        changed = sum(r["status"] in ("suspended", "reactivated") for r in results)
+        return Response({"changed": changed, "results": results}, status=status.HTTP_200_OK)
+
+
+class BulkSuspendUsersView(_BulkSuspensionView):
+    suspend = True
+
+
+class BulkReactivateUsersView(_BulkSuspensionView):
+    suspend = False
@@ -1,29 +1,143 @@
-from httpcore import Response
+from datetime import timedelta
+
+from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework import status, permissions
+from rest_framework import status
 from rest_framework.views import APIView
+from django_backend_starter.core.permissions.role_permissions import IsAdmin
 from django_backend_starter.core.repositories.audit_repository import AuditRepository
-from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl as UserRepository
+from django_backend_starter.core.repositories.login_rollup import LoginRollupRepository, get_rollup_settings
+from django_backend_starter.apps.loan.views.auth_view import AsyncLoginMixin, LoginView
+from django_backend_starter.core.utils.pagination import (
+    decode_cursor, encode_cursor, parse_datetime_param, parse_limit, parse_uuid_param,
+)
 
-class AuditedJWTLoginView(APIView):
-    permission_classes = [permissions.AllowAny]
+class AuditedJWTLoginView(LoginView):
+    missing_credentials_error = None  # AuthService answers missing credentials with 401
 
-    def post(self, request):
-        email = request.data.get("email")
-        password = request.data.get("password")
-        ip = request.META.get("REMOTE_ADDR")
-        ua = request.META.get("HTTP_USER_AGENT")
+    def issue(self, request):
+        # audit row and OutstandingToken INSERT share one transaction
+        return RefreshToken.for_user
 
-        user, error = UserRepository().authenticate_user(email, password)
-        audit = AuditRepository()
+    def logged_in(self, request, user):
+        refresh = user.issued
+        return Response({"access": str(refresh.access_token), "refresh": str(refresh)}, status=200)
 
-        if error:
-            if user and error.startswith("Account locked"):
-                audit.log_event(user=user, email=email, event_type="LOCKOUT", ip=ip, ua=ua)
-            else:
-                audit.log_event(email=email, event_type="FAILURE", ip=ip, ua=ua)
-            return Response({"error": error}, status=status.HTTP_401_UNAUTHORIZED)
 
-        audit.log_event(user=user, email=email, event_type="SUCCESS", ip=ip, ua=ua)
-        refresh = RefreshToken.for_user(user)
-        return Response({"access": str(refresh.access_token), "refresh": str(refresh)}, status=200)
+class AsyncAuditedJWTLoginView(AsyncLoginMixin, AuditedJWTLoginView):
+    pass
+
+
+# Widest since..until window a ?mode=counts request may aggregate over
+MAX_COUNT_SPAN = timedelta(days=31)
+
+
+def _audit_window(params):
+    return {
+        "since": parse_datetime_param(params.get("since"), "since"),
+        "until": parse_datetime_param(params.get("until"), "until"),
+    }
+
+
+def _decode_timestamp_cursor(raw):
+    if not raw:
+        return None
+    ts, pk = decode_cursor(raw, size=2)
+    return parse_datetime_param(ts, "cursor"), pk
+
+
+def _audit_response(repo_list, repo_count, params, filters):
+    if params.get("mode") == "counts":
+        since, until = filters["since"], filters["until"]
+        if since is None or until is None:
+            raise ValueError("mode=counts requires since and until")
+        if until - since > MAX_COUNT_SPAN:
+            raise ValueError(f"mode=counts covers at most {MAX_COUNT_SPAN.days} days")
+        return Response({
+            "group_by": params.get("group_by"),
+            "counts": repo_count(params.get("group_by"), **filters),
+        }, status=status.HTTP_200_OK)
+
+    rows, last_key = repo_list(
+        after=_decode_timestamp_cursor(params.get("cursor")),
+        limit=parse_limit(params.get("limit"), default=100, maximum=500),
+        **filters,
+    )
+    return Response({
+        "results": rows,
+        "next_cursor": encode_cursor(last_key[0].isoformat(), last_key[1]) if last_key else None,
+    }, status=status.HTTP_200_OK)
+
+
+class LoginAuditListView(APIView):
+    """
+    Login attempts, newest first. ?mode=counts&group_by=event_type|ip|hour&since=...&until=...
+    returns aggregates over at most MAX_COUNT_SPAN.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            filters = {
+                **_audit_window(params),
+                "event_type": params.get("event_type"),
+                "email": params.get("email"),
+                "ip": params.get("ip"),
+                "user_id": parse_uuid_param(params.get("user_id"), "user_id"),
+            }
+            repo = AuditRepository()
+            return _audit_response(repo.list_login_events, repo.count_login_events, params, filters)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AdminAuditListView(APIView):
+    """
+    Admin actions, newest first. ?mode=counts&group_by=action|admin|hour&since=...&until=...
+    returns aggregates over at most MAX_COUNT_SPAN.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            filters = {
+                **_audit_window(params),
+                "action": params.get("action"),
+                "admin_id": parse_uuid_param(params.get("admin_id"), "admin_id"),
+                "target_user_id": parse_uuid_param(params.get("target_user_id"), "target_user_id"),
+            }
+            repo = AuditRepository()
+            return _audit_response(repo.list_admin_events, repo.count_admin_events, params, filters)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LoginActivityRollupView(APIView):
+    """
+    Hourly success/failure/lockout series from the login rollups.
+    ?dimension=all|branch|region|ip&key=...&since=...&until=...
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            repo = LoginRollupRepository()
+            if get_rollup_settings()["REFRESH_ON_READ"]:
+                repo.catch_up(max_batches=1)
+            dimension = params.get("dimension", "all")
+            series = repo.series(
+                dimension,
+                key=params.get("key"),
+                limit=parse_limit(params.get("limit"), default=1000, maximum=5000),
+                **_audit_window(params),
+            )
+            return Response({
+                "dimension": dimension,
+                "series": series,
+                "watermark": repo.watermark(),
+            }, status=status.HTTP_200_OK)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
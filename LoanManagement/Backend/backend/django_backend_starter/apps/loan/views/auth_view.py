@@ -1,34 +1,99 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from rest_framework.authentication import SessionAuthentication
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.contrib.auth import login, logout, get_user_model
-from django_backend_starter.core.services.auth_services import AuthService
-
+from django.contrib.auth import login, logout, get_user_model, update_session_auth_hash
 from django_backend_starter.core.services.user_services import UserService
 
+from django_backend_starter.core.repositories.session_profile import get_profile_snapshot, store_profile_snapshot
 from django_backend_starter.core.repositories.user_repository_impl import UserRepositoryImpl
 from django_backend_starter.core.services.auth_services import AuthService
+from django_backend_starter.core.services.login_throttle import LoginThrottled
+from django_backend_starter.core.utils.async_views import AsyncAPIView
+
+
+def user_profile(user):
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "employee_id": user.employee_id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "role": user.role,
+    }
+
+
+def login_failed(error):
+    """401 for bad credentials or a locked account; 429 with Retry-After once the throttle trips."""
+    if isinstance(error, LoginThrottled):
+        return Response(
+            {"error": str(error)},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(error.retry_after)},
+        )
+    return Response({"error": str(error)}, status=status.HTTP_401_UNAUTHORIZED)
 
 
 class LoginView(APIView):
+    """
+    Base of the login endpoints: subclasses set how a successful login is issued
+    (`issue`) and answered (`logged_in`); the async variants reuse both through
+    AsyncLoginMixin.
+    """
+    permission_classes = [permissions.AllowAny]
+    missing_credentials_error = "Email and password required"
+
+    def credentials(self, request):
+        return {
+            "email": request.data.get("email"),
+            "password": request.data.get("password"),
+            "ip": request.META.get("REMOTE_ADDR"),
+            "ua": request.META.get("HTTP_USER_AGENT"),
+        }
+
+    def missing_credentials(self, credentials):
+        if self.missing_credentials_error and not (credentials["email"] and credentials["password"]):
+            return Response({"error": self.missing_credentials_error}, status=status.HTTP_400_BAD_REQUEST)
+        return None
+
+    def issue(self, request):
+        return None
+
+    def logged_in(self, request, user):
+        return Response({"message": "Login successful", "user": user_profile(user)}, status=status.HTTP_200_OK)
+
     def post(self, request):
-        email = request.data.get("email")
-        password = request.data.get("password")
+        credentials = self.credentials(request)
+        error = self.missing_credentials(credentials)
+        if error is not None:
+            return error
+        try:
+            user = AuthService(UserRepositoryImpl()).login(**credentials, issue=self.issue(request))
+        except ValueError as e:
+            return login_failed(e)
+        return self.logged_in(request, user)
+
 
-        if not email or not password:
-            return Response(
-                {"error": "Email and password required"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+class AsyncLoginMixin(AsyncAPIView):
+    """The post() of a LoginView subclass, awaiting AuthService.alogin() instead."""
 
-        service = AuthService(UserRepositoryImpl())
+    async def post(self, request):
+        credentials = self.credentials(request)
+        error = self.missing_credentials(credentials)
+        if error is not None:
+            return error
         try:
-            data = service.login(email, password)
-            return Response(data, status=status.HTTP_200_OK)
+            user = await AuthService(UserRepositoryImpl()).alogin(**credentials, issue=self.issue(request))
         except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+            return login_failed(e)
+        # issue() has already loaded anything logged_in() reads (e.g. the session)
+        return self.logged_in(request, user)
+
+
+class AsyncLoginView(AsyncLoginMixin, LoginView):
+    pass
 
 
 # apps/loan/api/views/auth_views.py
@@ -37,10 +102,12 @@ class ChangePasswordView(APIView):
     def post(self, request):
         user = request.user
         new_password = request.data.get("new_password")
-        user_service = UserService()
+        user_service = UserService(UserRepositoryImpl())
 
         try:
             user_service.reset_password_admin(user, new_password)
+            if isinstance(request.successful_authenticator, SessionAuthentication):
+                update_session_auth_hash(request, user)  # keep the current session valid after the change
             return Response({"message": "Password changed successfully"}, status=status.HTTP_200_OK)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -50,39 +117,26 @@ class ChangePasswordView(APIView):
 User = get_user_model()
 
 @method_decorator(csrf_exempt, name="dispatch")  # for API clients without CSRF; remove in prod if using browser
-class SessionLoginView(APIView):
-    permission_classes = [permissions.AllowAny]
-
-    def post(self, request):
-        email = request.data.get("email")
-        password = request.data.get("password")
-        ip = request.META.get("REMOTE_ADDR")
-        ua = request.META.get("HTTP_USER_AGENT")
+class SessionLoginView(LoginView):
+    missing_credentials_error = "Email and password are required."
 
-        if not email or not password:
-            return Response({"error": "Email and password are required."},
-                            status=status.HTTP_400_BAD_REQUEST)
+    def issue(self, request):
+        # logs SUCCESS/FAIL/LOCKOUT and establishes the Django session in the same transaction
+        return lambda user: login(request, user)
 
-        try:
-            user = AuthService().login(email, password, ip=ip, ua=ua)  # logs SUCCESS/FAIL/LOCKOUT
-        except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
-
-        # establish Django session
-        login(request, user)
+    def logged_in(self, request, user):
+        store_profile_snapshot(request.session, user)
         data = {
             "message": "Session login successful",
-            "user": {
-                "id": str(user.id),
-                "email": user.email,
-                "employee_id": user.employee_id,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "role": user.role,
-            }
+            "user": user_profile(user),
         }
         return Response(data, status=status.HTTP_200_OK)
 
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncSessionLoginView(AsyncLoginMixin, SessionLoginView):
+    pass
+
 class SessionLogoutView(APIView):
     def post(self, request):
         logout(request)
@@ -90,13 +144,14 @@ class SessionLogoutView(APIView):
 
 class SessionMeView(APIView):
     def get(self, request):
-        u = request.user
-        return Response({
-            "id": str(u.id),
-            "email": u.email,
-            "employee_id": u.employee_id,
-            "first_name": u.first_name,
-            "last_name": u.last_name,
-            "role": u.role,
-        })
+        # Session requests are answered from the profile snapshot taken at login
+        profile = None
+        if isinstance(request.successful_authenticator, SessionAuthentication):
+            profile = get_profile_snapshot(request.session)
+        return Response(profile or user_profile(request.user))
+
 
+class AsyncSessionMeView(AsyncAPIView, SessionMeView):
+    async def get(self, request):
+        # Authentication (run before the handler) has loaded the session and the user
+        return super().get(request)
@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from django_backend_starter.core.permissions.role_permissions import IsAdmin
+from django_backend_starter.core.utils.metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsView(APIView):
+    """Per-process request and component metrics in the Prometheus text format."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
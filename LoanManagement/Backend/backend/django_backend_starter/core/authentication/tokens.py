@@ -0,0 +1,106 @@
+# core/authentication/tokens.py
+from django.db import IntegrityError
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import TokenBlacklistSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.repositories.principal_cache import get_principal
+from django_backend_starter.core.repositories.sqlite_writer import sqlite_writer
+from django_backend_starter.core.repositories.token_blacklist_filter import blacklist_filter
+
+
+class CompactRefreshToken(RefreshToken):
+    """
+    RefreshToken whose blacklist lookup goes through the in-process JTI filter,
+    and whose blacklist/outstand calls write by user id instead of SELECTing the user.
+    """
+
+    def check_blacklist(self):
+        if not blacklist_filter.enabled:
+            return super().check_blacklist()
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if not blacklist_filter.might_contain(jti):
+            return
+        if BlacklistedToken.objects.filter(token__jti=jti).exists():
+            raise TokenError(_("Token is blacklisted"))
+        blacklist_filter.record_false_positive()
+
+    def _outstanding_defaults(self):
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        return {
+            # only evaluated when the row is missing (tokens minted before the blacklist app)
+            "user_id": lambda: user_id if UserModel.objects.filter(pk=user_id).exists() else None,
+            "created_at": self.current_time,
+            "token": str(self),
+            "expires_at": datetime_from_epoch(self.payload["exp"]),
+        }
+
+    def blacklist(self):
+        """
+        Blacklists this token; raises TokenError if it already was.
+
+        The INSERT into the unique BlacklistedToken.token column is what decides,
+        so two concurrent rotations of the same refresh token cannot both succeed
+        even when the filter has not synced yet.
+        """
+        jti = self.payload[api_settings.JTI_CLAIM]
+
+        def write():
+            token, _created = OutstandingToken.objects.get_or_create(jti=jti, defaults=self._outstanding_defaults())
+            return BlacklistedToken.objects.create(token=token)
+
+        try:
+            entry = sqlite_writer.run(write)
+        except IntegrityError:
+            raise TokenError(_("Token is blacklisted"))
+        blacklist_filter.add(jti)
+        return entry
+
+    def outstand(self):
+        # Rotation gives the token a fresh JTI, so there is nothing to look up first
+        return sqlite_writer.run(
+            OutstandingToken.objects.create,
+            jti=self.payload[api_settings.JTI_CLAIM],
+            user_id=self.payload.get(api_settings.USER_ID_CLAIM),
+            created_at=self.current_time,
+            token=str(self),
+            expires_at=datetime_from_epoch(self.payload["exp"]),
+        )
+
+
+class CompactTokenRefreshSerializer(TokenRefreshSerializer):
+    """TokenRefreshSerializer on CompactRefreshToken, with the user read from the principal cache."""
+    token_class = CompactRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            user = get_principal(user_id)
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user) or user.is_suspended:
+                raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class CompactTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = CompactRefreshToken
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
-@dataclass
+@dataclass(slots=True)
 class UserEntity:
     id: str
     email: str
@@ -12,3 +12,14 @@ class UserEntity:
     branch: str
     region: str
     is_active: bool
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds an entity from a values_list() row in field order (id may be a UUID)."""
+        return cls(str(row[0]), *row[1:])
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in USER_ENTITY_FIELDS}
+
+
+USER_ENTITY_FIELDS = tuple(f.name for f in fields(UserEntity))
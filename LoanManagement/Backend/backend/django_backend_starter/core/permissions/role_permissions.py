@@ -1,6 +1,9 @@
 # core/permissions/role_permissions.py
 from rest_framework.permissions import BasePermission
 
+# request.user is the cached principal (JWT) or the session's profile snapshot
+# (ProfileSnapshotAuthenticationMiddleware), so these role checks never query the DB.
+
 class IsAdmin(BasePermission):
     """
     Allows access only to admin users.
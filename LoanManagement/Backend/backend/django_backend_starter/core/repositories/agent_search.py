@@ -0,0 +1,331 @@
+# core/repositories/agent_search.py
+import json
+import re
+import time
+from bisect import bisect_left, bisect_right
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.entities.user import UserEntity
+from django_backend_starter.core.repositories.db_routing import read_alias
+from django_backend_starter.core.repositories.user_repository_impl import AGENT_LIST_FIELDS
+
+DEFAULTS = {
+    "TABLE": "loan_agent_search",
+    # bm25 weight per indexed column: an employee ID or email hit outranks a branch hit
+    "WEIGHTS": {"name": 3.0, "email": 5.0, "employee_id": 10.0, "branch": 1.0, "region": 1.0},
+    "MIN_PREFIX": 2,         # shorter terms only match whole tokens (a 1-letter prefix matches half the table)
+    "FUZZY_MIN_LENGTH": 4,   # terms shorter than this are never expanded
+    "MAX_EXPANSIONS": 5,     # closest vocabulary terms OR'ed in per fuzzy term
+    "VOCABULARY_TTL": 300,   # seconds before the in-process fuzzy vocabulary is reloaded
+    "MAX_OFFSET": 1000,      # deepest page a cursor may reach; refine the query instead
+    "MAX_CANDIDATES": 20000, # ranked matches scanned for one filtered page before giving up on filling it
+}
+
+# Columns in index order (built from UserModel's SEARCH_SOURCE_FIELDS); `user_id`
+# only ties a hit back to its user row
+INDEXED_COLUMNS = ("name", "email", "employee_id", "branch", "region")
+# Fuzzy matching corrects typos in names and places; emails and IDs are matched by prefix only
+FUZZY_COLUMNS = ("name", "branch", "region")
+
+# Users per statement when bulk_create() or a bulk delete syncs the index
+SYNC_BATCH = 5000
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def get_agent_search_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "AGENT_SEARCH", {}))
+    conf["WEIGHTS"] = {**DEFAULTS["WEIGHTS"], **conf.get("WEIGHTS", {})}
+    return conf
+
+
+def _rowid(pk):
+    """Stable signed 64-bit FTS rowid for a user UUID, so index updates are rowid lookups."""
+    value = pk.int >> 64
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _edit_distance(a, b, limit):
+    """
+    Edit distance between a and b counting an adjacent transposition as one edit
+    (optimal string alignment), or limit + 1 as soon as it exceeds limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class AgentSearchIndex:
+    """
+    Inverted index over agent names, emails, employee IDs, branches and regions.
+
+    On SQLite it is an FTS5 table, created and filled by migration 0011 (or
+    rebuild_agent_search) and kept in sync by UserModel.save()/delete() and
+    UserManager.bulk_create(); requests never build it. Until a database has the
+    table, its saves skip the sync and searches use the fallback below, which the
+    next rebuild makes up for. Role and status filters are read from the user row,
+    so suspensions and other bulk UPDATEs never leave it stale. Every query term
+    matches as a whole token and as a prefix (whole-token hits rank higher), and
+    fuzzy queries also OR in the closest known name, branch and region tokens.
+    Results are ranked by bm25. Other databases get a prefix search on the user
+    table (no ranking or fuzzy matching).
+    """
+
+    def __init__(self):
+        self._ready = set()      # aliases known to have the table
+        self._vocabulary = None  # (loaded_at, {first letter: sorted [(length, term)]})
+
+    @property
+    def conf(self):
+        return get_agent_search_settings()
+
+    def _table(self):
+        return self.conf["TABLE"]
+
+    @staticmethod
+    def supported(using=DEFAULT_DB_ALIAS):
+        return connections[using].vendor == "sqlite"
+
+    # ----------------------
+    # SCHEMA
+    # ----------------------
+    def _create(self, cursor):
+        table = self._table()
+        weights = self.conf["WEIGHTS"]
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {table} USING fts5("
+            f"user_id UNINDEXED, {', '.join(INDEXED_COLUMNS)}, "
+            f"tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+        cursor.execute(f"CREATE VIRTUAL TABLE {table}_vocab USING fts5vocab({table}, 'col')")
+        # `rank` then means bm25 with these column weights (user_id, being unindexed, weighs 0)
+        rank = ", ".join(["0"] + [str(weights[column]) for column in INDEXED_COLUMNS])
+        cursor.execute(f"INSERT INTO {table}({table}, rank) VALUES ('rank', 'bm25({rank})')")
+
+    def _exists(self, using):
+        if using in self._ready:
+            return True
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [self._table()])
+            exists = cursor.fetchone() is not None
+        if exists:
+            # Only remembered once committed: a rolled-back transaction may have created it
+            transaction.on_commit(lambda: self._ready.add(using), using=using)
+        return exists
+
+    def rebuild(self, using=DEFAULT_DB_ALIAS, batch_size=5000, model=UserModel):
+        """
+        Drops and refills the index from the user table in one transaction; returns
+        rows indexed. Migrations pass their historical user model.
+        """
+        table = self._table()
+        conn = connections[using]
+        indexed = 0
+        with transaction.atomic(using=using), conn.cursor() as cursor:
+            self._drop(cursor)
+            self._create(cursor)
+            # Keyset over the primary key, so memory stays flat however many users there are
+            after = None
+            while True:
+                qs = model.objects.using(using).order_by("pk")
+                if after is not None:
+                    qs = qs.filter(pk__gt=after)
+                pks = list(qs.values_list("pk", flat=True)[:batch_size])
+                if not pks:
+                    break
+                self._copy_rows(cursor, conn, "INSERT", pks, model)
+                indexed += len(pks)
+                after = pks[-1]
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+        transaction.on_commit(lambda: self._ready.add(using), using=using)
+        self._vocabulary = None
+        return indexed
+
+    def drop(self, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            self._drop(cursor)
+        self._ready.discard(using)
+        self._vocabulary = None
+
+    def _drop(self, cursor):
+        table = self._table()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}_vocab")
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def _copy_rows(self, cursor, conn, verb, pks, model=UserModel):
+        """Copies the indexed columns of these users from the user table into the index, in one statement."""
+        pk_field = model._meta.pk
+        # {stored user id: rowid}; the text is read from the rows as they are in this transaction
+        rowid_map = json.dumps({pk_field.get_db_prep_value(pk, conn): _rowid(pk) for pk in pks})
+        cursor.execute(
+            f"{verb} INTO {self._table()}(rowid, user_id, {', '.join(INDEXED_COLUMNS)}) "
+            f"SELECT m.value, u.id, trim(u.first_name || ' ' || u.last_name), u.email, u.employee_id, "
+            # CROSS JOIN keeps json_each as the outer loop: one primary key lookup per user
+            f"u.branch, u.region FROM json_each(%s) m CROSS JOIN {model._meta.db_table} u ON u.id = m.key",
+            [rowid_map],
+        )
+
+    # ----------------------
+    # SYNC (called by UserModel / UserManager)
+    # ----------------------
+    def index_users(self, pks, using=DEFAULT_DB_ALIAS):
+        """(Re)indexes these users from their committed-or-pending rows, in the caller's transaction."""
+        if not pks or not self.supported(using) or not self._exists(using):
+            return
+        conn = connections[using]
+        with conn.cursor() as cursor:
+            for start in range(0, len(pks), SYNC_BATCH):
+                self._copy_rows(cursor, conn, "INSERT OR REPLACE", pks[start:start + SYNC_BATCH])
+
+    def remove_users(self, pks, using=DEFAULT_DB_ALIAS):
+        if not pks or not self.supported(using) or not self._exists(using):
+            return
+        with connections[using].cursor() as cursor:
+            for start in range(0, len(pks), SYNC_BATCH):
+                rowids = json.dumps([_rowid(pk) for pk in pks[start:start + SYNC_BATCH]])
+                cursor.execute(
+                    f"DELETE FROM {self._table()} WHERE rowid IN (SELECT value FROM json_each(%s))", [rowids]
+                )
+
+    # ----------------------
+    # QUERIES
+    # ----------------------
+    def _terms(self, query):
+        return [token.lower() for token in _TOKEN.findall(query or "")][:8]
+
+    def _vocabulary_terms(self, using):
+        loaded = self._vocabulary
+        if loaded is None or time.monotonic() - loaded[0] > self.conf["VOCABULARY_TTL"]:
+            buckets = {}
+            columns = ", ".join(["%s"] * len(FUZZY_COLUMNS))
+            with connections[using].cursor() as cursor:
+                cursor.execute(
+                    f"SELECT DISTINCT term FROM {self._table()}_vocab WHERE col IN ({columns})", FUZZY_COLUMNS
+                )
+                for (term,) in cursor.fetchall():
+                    buckets.setdefault(term[0], []).append((len(term), term))
+            for terms in buckets.values():
+                terms.sort()
+            loaded = self._vocabulary = (time.monotonic(), buckets)
+        return loaded[1]
+
+    def _expansions(self, term, using):
+        """Closest vocabulary tokens to `term` (same first letter, 1 edit, 2 for terms of 8+ characters)."""
+        conf = self.conf
+        if len(term) < conf["FUZZY_MIN_LENGTH"]:
+            return []
+        limit = 1 if len(term) < 8 else 2
+        bucket = self._vocabulary_terms(using).get(term[0], [])
+        lo = bisect_left(bucket, (len(term) - limit, ""))
+        hi = bisect_right(bucket, (len(term) + limit, "￿"))
+        scored = []
+        for _, candidate in bucket[lo:hi]:
+            if candidate != term:
+                distance = _edit_distance(term, candidate, limit)
+                if distance <= limit:
+                    scored.append((distance, candidate))
+        scored.sort()
+        return [candidate for _, candidate in scored[:conf["MAX_EXPANSIONS"]]]
+
+    def _match_expression(self, terms, fuzzy, using):
+        groups = []
+        for term in terms:
+            options = [f'"{term}"']
+            if len(term) >= self.conf["MIN_PREFIX"]:
+                options.append(f'"{term}"*')
+            if fuzzy:
+                options += [f'"{candidate}"' for candidate in self._expansions(term, using)]
+            groups.append(f"({' OR '.join(options)})")
+        return " AND ".join(groups)
+
+    def search(self, query, role=None, is_active=None, is_suspended=None, fuzzy=False, offset=0, limit=20):
+        """
+        Returns (entities, next_offset) for the best-ranked users matching every
+        term of `query`; next_offset is None on the last page.
+        """
+        terms = self._terms(query)
+        if not terms:
+            raise ValueError("q must contain at least one letter or digit")
+        if offset > self.conf["MAX_OFFSET"]:
+            raise ValueError(f"Results beyond the first {self.conf['MAX_OFFSET']} are not paged; refine the query")
+
+        using = read_alias("agents.search")
+        if self.supported(using) and using != DEFAULT_DB_ALIAS and not self._exists(using):
+            using = DEFAULT_DB_ALIAS  # replica not synced since the index was created
+        if not self.supported(using) or not self._exists(using):
+            return self._fallback_search(terms, role, is_active, is_suspended, offset, limit, using)
+
+        match = self._match_expression(terms, fuzzy, using)
+        filters = [(column, value) for column, value in
+                   (("role", role), ("is_active", is_active), ("is_suspended", is_suspended)) if value is not None]
+        wanted = offset + limit + 1
+        # Rank inside FTS5 first (rowids only), then read just those users. Filters may
+        # drop candidates, so the window grows until the page fills or the matches run out.
+        window = wanted if not filters else max(wanted * 4, 200)
+        with connections[using].cursor() as cursor:
+            while True:
+                rowids = self._ranked_rowids(cursor, match, window)
+                rows = self._users_for(cursor, rowids, filters)
+                if len(rows) >= wanted or len(rowids) < window or window >= self.conf["MAX_CANDIDATES"]:
+                    break
+                window = min(window * 4, self.conf["MAX_CANDIDATES"])
+
+        # raw rows: the id as stored and is_active as 0/1
+        to_uuid = UserModel._meta.pk.to_python
+        page = rows[offset:offset + limit]
+        entities = [UserEntity.from_row((to_uuid(row[0]), *row[1:-1], bool(row[-1]))) for row in page]
+        return entities, offset + limit if len(rows) > offset + limit else None
+
+    def _ranked_rowids(self, cursor, match, window):
+        table = self._table()
+        cursor.execute(
+            f"SELECT rowid FROM {table} WHERE {table} MATCH %s ORDER BY rank, rowid LIMIT %s", [match, window]
+        )
+        return [rowid for (rowid,) in cursor.fetchall()]
+
+    def _users_for(self, cursor, rowids, filters):
+        """User rows for these index rowids, in the same order, that pass the role/status filters."""
+        if not rowids:
+            return []
+        columns = ", ".join(f"u.{field}" for field in AGENT_LIST_FIELDS)
+        where = "".join(f" AND u.{column} = %s" for column, _ in filters)
+        cursor.execute(
+            f"SELECT {columns} FROM json_each(%s) m CROSS JOIN {self._table()} s ON s.rowid = m.value "
+            f"CROSS JOIN {UserModel._meta.db_table} u ON u.id = s.user_id WHERE 1{where} ORDER BY m.key",
+            [json.dumps(rowids)] + [value for _, value in filters],
+        )
+        return cursor.fetchall()
+
+    @staticmethod
+    def _fallback_search(terms, role, is_active, is_suspended, offset, limit, using):
+        qs = UserModel.objects.using(using)
+        for value, field in ((role, "role"), (is_active, "is_active"), (is_suspended, "is_suspended")):
+            if value is not None:
+                qs = qs.filter(**{field: value})
+        columns = ("first_name", "last_name", "email", "employee_id", "branch", "region")
+        qs = qs.filter(reduce(and_, (
+            reduce(or_, (Q(**{f"{column}__istartswith": term}) for column in columns)) for term in terms
+        )))
+        rows = list(qs.order_by("employee_id").values_list(*AGENT_LIST_FIELDS)[offset:offset + limit + 1])
+        return [UserEntity.from_row(row) for row in rows[:limit]], offset + limit if len(rows) > limit else None
+
+
+agent_search_index = AgentSearchIndex()
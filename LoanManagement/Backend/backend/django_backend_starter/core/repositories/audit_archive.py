@@ -0,0 +1,190 @@
+# core/repositories/audit_archive.py
+import gzip
+import hashlib
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from django_backend_starter.apps.loan.models import AdminAudit, LoginAudit
+from django_backend_starter.core.repositories.audit_dimensions import original_rows
+
+DEFAULTS = {
+    "DIR": "audit_archive",   # relative paths are resolved against BASE_DIR
+    "RETENTION_DAYS": 180,    # rows older than this are moved out of the live tables
+    "BATCH_SIZE": 2000,
+}
+
+# table name in the archive -> (model, archived columns)
+ARCHIVED_TABLES = {
+    "login": (LoginAudit, ("id", "timestamp", "event_type", "email_attempted", "ip_address", "user_agent", "user_id")),
+    "admin": (AdminAudit, ("id", "timestamp", "action", "reason", "admin_id", "target_user_id")),
+}
+
+CHECKPOINT_FILE = "_checkpoint.json"
+INDEX_FILE = "index.json"
+
+
+def get_archive_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "AUDIT_ARCHIVE", {}))
+    directory = Path(conf["DIR"])
+    conf["DIR"] = directory if directory.is_absolute() else Path(settings.BASE_DIR) / directory
+    return conf
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Writes to a temp file, fsyncs and renames, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return default
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class AuditArchive:
+    """
+    Moves old audit rows into gzip-compressed JSONL segments partitioned by day:
+
+        <DIR>/<table>/<YYYY>/<MM>/<DD>/segment-<first_id>-<last_id>.jsonl.gz
+        <DIR>/<table>/<YYYY>/<MM>/<DD>/index.json   (segments with id/time ranges)
+
+    Each batch is recorded in a checkpoint file before its segments are written,
+    and only deleted from the database once its segments and indexes are on disk.
+    A run that crashes anywhere in between archives exactly that batch again on
+    restart before taking a new one: segment names are deterministic, so the same
+    rows overwrite the same files instead of landing in overlapping segments.
+    """
+
+    def __init__(self, directory=None):
+        conf = get_archive_settings()
+        self.root = Path(directory) if directory else conf["DIR"]
+        self.batch_size = conf["BATCH_SIZE"]
+        self.retention_days = conf["RETENTION_DAYS"]
+
+    def _table_dir(self, table):
+        if table not in ARCHIVED_TABLES:
+            raise ValueError(f"table must be one of {tuple(ARCHIVED_TABLES)}")
+        return self.root / table
+
+    def _day_dir(self, table, day):
+        return self._table_dir(table) / f"{day.year:04d}" / f"{day.month:02d}" / f"{day.day:02d}"
+
+    # ----------------------
+    # WRITING
+    # ----------------------
+    def archive(self, table, older_than_days=None, batch_size=None, max_batches=None, on_batch=None):
+        """Archives and deletes rows older than the cutoff; returns the number of rows moved."""
+        table_dir = self._table_dir(table)
+        model, fields = ARCHIVED_TABLES[table]
+        days = self.retention_days if older_than_days is None else older_than_days
+        cutoff = timezone.now() - timedelta(days=days)
+        batch_size = batch_size or self.batch_size
+
+        moved = self._finish_pending(table, model, fields)
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            # Interned user agents/IPs are archived as their values; segments don't depend on lookup tables
+            rows = original_rows(model.objects.filter(timestamp__lt=cutoff).order_by("id"), fields, batch_size)
+            if not rows:
+                break
+            ids = [row["id"] for row in rows]
+            _write_atomic(table_dir / CHECKPOINT_FILE, json.dumps({"ids": ids}).encode())
+            moved += self._move(table, model, fields, rows)
+            batches += 1
+            if on_batch:
+                on_batch(len(ids), ids[-1])
+        return moved
+
+    def _finish_pending(self, table, model, fields):
+        checkpoint = _read_json(self._table_dir(table) / CHECKPOINT_FILE, None)
+        if not checkpoint:
+            return 0
+        # Rows still in the database were not deleted yet; none of them if the delete committed
+        ids = checkpoint["ids"]
+        rows = original_rows(model.objects.filter(id__in=ids).order_by("id"), fields, len(ids))
+        return self._move(table, model, fields, rows)
+
+    def _move(self, table, model, fields, rows):
+        """Writes the checkpointed rows' segments, then deletes them; returns the number deleted."""
+        if rows:
+            self._write_segments(table, rows)
+        return self._delete(table, model, [row["id"] for row in rows])
+
+    def _delete(self, table, model, ids):
+        with transaction.atomic():
+            deleted, _ = model.objects.filter(id__in=ids).delete()
+        (self._table_dir(table) / CHECKPOINT_FILE).unlink(missing_ok=True)
+        return deleted
+
+    def _write_segments(self, table, rows):
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(timezone.localdate(row["timestamp"]), []).append(row)
+
+        for day, day_rows in by_day.items():
+            day_dir = self._day_dir(table, day)
+            name = f"segment-{day_rows[0]['id']:012d}-{day_rows[-1]['id']:012d}.jsonl.gz"
+            payload = "".join(json.dumps(r, default=_json_default, separators=(",", ":")) + "\n" for r in day_rows)
+            data = gzip.compress(payload.encode(), mtime=0)
+            _write_atomic(day_dir / name, data)
+
+            index_path = day_dir / INDEX_FILE
+            index = [s for s in _read_json(index_path, []) if s["file"] != name]
+            index.append({
+                "file": name,
+                "count": len(day_rows),
+                "first_id": day_rows[0]["id"],
+                "last_id": day_rows[-1]["id"],
+                "min_ts": min(r["timestamp"] for r in day_rows).isoformat(),
+                "max_ts": max(r["timestamp"] for r in day_rows).isoformat(),
+                "sha256": hashlib.sha256(data).hexdigest(),
+            })
+            index.sort(key=lambda s: s["first_id"])
+            _write_atomic(index_path, json.dumps(index, indent=1).encode())
+
+    # ----------------------
+    # READING
+    # ----------------------
+    def iter_rows(self, table, since=None, until=None, **filters):
+        """
+        Yields archived rows for [since, until) in day order without touching the DB.
+        Only day directories and segments whose index time range overlaps are opened.
+        `filters` are exact matches on archived columns, e.g. ip_address="10.0.0.1".
+        """
+        table_dir = self._table_dir(table)
+        for index_path in sorted(table_dir.glob(f"*/*/*/{INDEX_FILE}")):
+            for segment in _read_json(index_path, []):
+                if since and parse_datetime(segment["max_ts"]) < since:
+                    continue
+                if until and parse_datetime(segment["min_ts"]) >= until:
+                    continue
+                with gzip.open(index_path.parent / segment["file"], "rt") as f:
+                    for line in f:
+                        row = json.loads(line)
+                        ts = parse_datetime(row["timestamp"])
+                        if since and ts < since or until and ts >= until:
+                            continue
+                        if any(str(row.get(k)) != str(v) for k, v in filters.items() if v is not None):
+                            continue
+                        yield row
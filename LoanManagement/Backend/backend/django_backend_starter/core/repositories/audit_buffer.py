@@ -0,0 +1,318 @@
+# core/repositories/audit_buffer.py
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, DataError, IntegrityError, close_old_connections, connection
+
+from django_backend_starter.core.repositories.sqlite_writer import sqlite_writer
+
+DEFAULTS = {
+    "MODE": "sync",          # "sync" = one INSERT per event (compliance), "buffered" = bulk_create
+    "MAX_QUEUE": 10000,      # hard bound on events waiting to be flushed
+    "BATCH_SIZE": 500,       # flush as soon as this many events are queued
+    "FLUSH_INTERVAL": 1.0,   # ... or after this many seconds, whichever comes first
+    "OVERFLOW": "sync",      # "sync" | "block" | "drop_oldest" | "drop_newest"
+    "BLOCK_TIMEOUT": 0.5,    # seconds to wait for space when OVERFLOW == "block"
+}
+
+OVERFLOW_POLICIES = ("sync", "block", "drop_oldest", "drop_newest")
+
+logger = logging.getLogger(__name__)
+
+
+def get_audit_buffer_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "AUDIT_BUFFER", {}))
+    if conf["OVERFLOW"] not in OVERFLOW_POLICIES:
+        raise ValueError(f"AUDIT_BUFFER['OVERFLOW'] must be one of {OVERFLOW_POLICIES}")
+    return conf
+
+
+class BufferedAuditWriter:
+    """
+    Buffers unsaved audit model instances in-process and writes them with bulk_create.
+
+    Flushes happen when BATCH_SIZE events are queued, every FLUSH_INTERVAL seconds,
+    and at interpreter shutdown. In "sync" mode every event is saved inline instead,
+    and so is an event written inside a transaction, which must commit or roll back
+    with it (its user may only exist in that transaction).
+
+    A batch that fails is written again one event at a time: events the database
+    rejects (integrity or data errors) are logged and counted as failed, and when
+    the database itself is unavailable the rest go back to the front of the queue.
+
+    Request threads, the flush thread and overflow flushes all update the counters,
+    so every update goes through _count() under its own lock.
+    """
+
+    def __init__(self, model, mode="sync", max_queue=10000, batch_size=500,
+                 flush_interval=1.0, overflow="sync", block_timeout=0.5):
+        self.model = model
+        self.mode = mode
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.overflow_sync_writes = 0
+        self.failed = 0
+        self.requeued = 0
+        self.flush_count = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    # ----------------------
+    # WRITE PATH
+    # ----------------------
+    def write(self, obj):
+        if self.mode != "buffered" or self._stopped or connection.in_atomic_block:
+            sqlite_writer.run(obj.save)
+            self._count("written")
+            return obj
+
+        with self._cond:
+            if len(self._queue) >= self.max_queue and not self._make_room():
+                return obj
+            self._enqueue(obj)
+        self._ensure_thread()
+        return obj
+
+    async def awrite(self, obj):
+        """write() for async callers. Queuing happens on the event loop; anything that may block does not."""
+        if self.mode != "buffered" or self._stopped:
+            # arun() saves inside the caller's transaction, if there is one
+            await sqlite_writer.arun(obj.save)
+            self._count("written")
+            return obj
+
+        with self._cond:
+            queued = len(self._queue) < self.max_queue
+            if queued:
+                self._enqueue(obj)
+        if not queued:
+            # the overflow policy may wait for space or flush inline
+            return await sync_to_async(self.write)(obj)
+        self._ensure_thread()
+        return obj
+
+    def _enqueue(self, obj):
+        """Caller holds self._cond."""
+        self._queue.append(obj)
+        self._count("enqueued")
+        if len(self._queue) >= self.batch_size:
+            self._cond.notify()
+
+    def _make_room(self):
+        """Applies the overflow policy. Caller holds self._cond; returns True if obj may be queued."""
+        if self.overflow == "drop_oldest":
+            self._queue.popleft()
+            self._count("dropped")
+            return True
+        if self.overflow == "block":
+            self._cond.notify()
+            deadline = time.monotonic() + self.block_timeout
+            while len(self._queue) >= self.max_queue:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._count("dropped")
+                    return False
+                self._cond.wait(remaining)
+            return True
+        if self.overflow == "drop_newest":
+            self._count("dropped")
+            return False
+        return self._write_sync_unlocked()
+
+    def _write_sync_unlocked(self):
+        # "sync" overflow: the caller pays for one flush instead of losing the event.
+        batch = self._drain()
+        self._cond.release()
+        try:
+            self._bulk_write(batch)
+            self._count("overflow_sync_writes")
+        finally:
+            self._cond.acquire()
+        return True
+
+    # ----------------------
+    # FLUSHING
+    # ----------------------
+    def _drain(self):
+        batch = list(self._queue)
+        self._queue.clear()
+        self._cond.notify_all()
+        return batch
+
+    def flush(self):
+        with self._cond:
+            batch = self._drain()
+        self._bulk_write(batch)
+        return len(batch)
+
+    def _bulk_write(self, batch):
+        if not batch:
+            return
+        with self._flush_lock:
+            started = time.perf_counter()
+            try:
+                sqlite_writer.run(self.model.objects.bulk_create, batch, batch_size=self.batch_size)
+                self._count("written", len(batch))
+            except DatabaseError:
+                self._count("flush_errors")
+                logger.exception("%s audit batch of %d failed; writing it one event at a time",
+                                 self.model.__name__, len(batch))
+                self._write_each(batch)
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                with self._stats_lock:
+                    self.flush_count += 1
+                    self.last_flush_ms = elapsed
+                    self.total_flush_ms += elapsed
+                    self.max_flush_ms = max(self.max_flush_ms, elapsed)
+
+    def _write_each(self, batch):
+        for n, obj in enumerate(batch):
+            try:
+                sqlite_writer.run(obj.save)
+                self._count("written")
+            except (IntegrityError, DataError):
+                self._count("failed")
+                logger.exception("Dropped %s audit event that the database rejected: %s",
+                                 self.model.__name__, obj)
+            except DatabaseError:
+                self._requeue(batch[n:])
+                logger.exception("Database unavailable; %d %s audit events requeued",
+                                 len(batch) - n, self.model.__name__)
+                return
+
+    def _requeue(self, events):
+        with self._cond:
+            self._queue.extendleft(reversed(events))
+            self._count("requeued", len(events))
+            while len(self._queue) > self.max_queue:
+                self._queue.pop()
+                self._count("dropped")
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.model.__name__}-audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._queue) < self.batch_size and not self._stopped:
+                    self._cond.wait(self.flush_interval)
+                batch = self._drain()
+                stopped = self._stopped
+            if batch:
+                try:
+                    close_old_connections()
+                    self._bulk_write(batch)
+                except Exception:
+                    # keep the writer alive; failed events were logged and counted by _bulk_write
+                    logger.exception("%s audit writer flush failed", self.model.__name__)
+            if stopped:
+                connection.close()
+                return
+
+    def shutdown(self, timeout=5.0):
+        """Stops the background writer and flushes whatever is still queued."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    # ----------------------
+    # COUNTERS
+    # ----------------------
+    def _count(self, name, n=1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def stats(self):
+        with self._stats_lock:
+            return self._stats_unlocked()
+
+    def _stats_unlocked(self):
+        return {
+            "mode": self.mode,
+            "queue_depth": len(self._queue),
+            "max_queue": self.max_queue,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "overflow_sync_writes": self.overflow_sync_writes,
+            "failed": self.failed,
+            "requeued": self.requeued,
+            "flush_count": self.flush_count,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self.total_flush_ms / self.flush_count, 3) if self.flush_count else 0.0,
+        }
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_audit_writer(model):
+    """Returns the per-process writer for `model`, configured from settings.AUDIT_BUFFER."""
+    writer = _writers.get(model)
+    if writer is not None:
+        return writer
+    with _writers_lock:
+        writer = _writers.get(model)
+        if writer is None:
+            conf = get_audit_buffer_settings()
+            writer = BufferedAuditWriter(
+                model,
+                mode=conf["MODE"],
+                max_queue=conf["MAX_QUEUE"],
+                batch_size=conf["BATCH_SIZE"],
+                flush_interval=conf["FLUSH_INTERVAL"],
+                overflow=conf["OVERFLOW"],
+                block_timeout=conf["BLOCK_TIMEOUT"],
+            )
+            _writers[model] = writer
+    return writer
+
+
+def all_writer_stats():
+    return {model.__name__: writer.stats() for model, writer in list(_writers.items())}
+
+
+@atexit.register
+def shutdown_audit_writers():
+    for writer in list(_writers.values()):
+        try:
+            writer.shutdown()
+        except Exception:
+            pass
@@ -0,0 +1,228 @@
+# core/repositories/audit_dimensions.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+
+from django_backend_starter.apps.loan.models import AuditIPAddress, AuditUserAgent, LoginAudit
+
+DEFAULTS = {
+    "USER_AGENTS": True,    # store each distinct User-Agent once, in AuditUserAgent
+    "IP_ADDRESSES": False,  # same for client IPs (AuditIPAddress)
+    "CACHE_SIZE": 4096,     # value -> id entries kept per table and process (LRU)
+    "BACKFILL_BATCH": 5000,
+}
+
+# LoginAudit column -> FK holding its interned value
+INTERNED_COLUMNS = {"user_agent": "user_agent_ref", "ip_address": "ip_ref"}
+
+
+def get_audit_dimension_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "AUDIT_DIMENSIONS", {}))
+    return conf
+
+
+class DimensionTable:
+    """
+    Interns the distinct values of a LoginAudit column into a lookup table.
+
+    A bounded LRU of value -> id per process means a known value costs no query.
+    Misses in a batch are resolved together: one SELECT and, for new values, one
+    INSERT ... ON CONFLICT DO NOTHING and a second SELECT. Ids only enter the LRU
+    once their transaction commits, so a rollback can't leave a dangling id behind.
+    """
+
+    def __init__(self, model, hashed=False):
+        self.model = model
+        self.hashed = hashed  # look values up by sha256 digest rather than by the value itself
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, value):
+        return hashlib.sha256(value.encode()).hexdigest() if self.hashed else value
+
+    def _key_field(self):
+        return "digest" if self.hashed else "value"
+
+    def _cached(self, values):
+        found = {}
+        with self._lock:
+            for value in values:
+                pk = self._ids.get(value)
+                if pk is not None:
+                    self._ids.move_to_end(value)
+                    found[value] = pk
+        self.hits += len(found)
+        self.misses += len(values) - len(found)
+        return found
+
+    def _remember(self, found):
+        size = get_audit_dimension_settings()["CACHE_SIZE"]
+        with self._lock:
+            for value, pk in found.items():
+                self._ids[value] = pk
+                self._ids.move_to_end(value)
+            while len(self._ids) > size:
+                self._ids.popitem(last=False)
+
+    def _select(self, keys):
+        field = self._key_field()
+        return dict(self.model.objects.filter(**{f"{field}__in": list(keys)}).values_list(field, "id"))
+
+    def ids_for(self, values):
+        """{value: id} for these values, adding the ones not seen before."""
+        values = set(values)
+        found = self._cached(values)
+        missing = {self._key(value): value for value in values if value not in found}
+        if not missing:
+            return found
+
+        resolved = self._select(missing)
+        new = [key for key in missing if key not in resolved]
+        if new:
+            rows = [self.model(value=missing[key]) for key in new]
+            if self.hashed:
+                for row, key in zip(rows, new):
+                    row.digest = key
+            self.model.objects.bulk_create(rows, ignore_conflicts=True)
+            resolved.update(self._select(new))
+
+        loaded = {missing[key]: pk for key, pk in resolved.items()}
+        transaction.on_commit(lambda: self._remember(loaded))
+        found.update(loaded)
+        return found
+
+    def existing_id(self, value):
+        """Id of `value` if it has been interned, without adding it; None otherwise."""
+        found = self._cached([value])
+        if value in found:
+            return found[value]
+        pk = self._select([self._key(value)]).get(self._key(value))
+        if pk is not None:
+            self._remember({value: pk})
+        return pk
+
+    def clear(self):
+        """Forgets every cached id, e.g. after the lookup table was restored or rolled back."""
+        with self._lock:
+            self._ids.clear()
+
+    def stats(self):
+        return {"cached": len(self._ids), "hits": self.hits, "misses": self.misses}
+
+
+user_agents = DimensionTable(AuditUserAgent, hashed=True)
+ip_addresses = DimensionTable(AuditIPAddress)
+
+
+def _enabled_tables():
+    conf = get_audit_dimension_settings()
+    tables = {}
+    if conf["USER_AGENTS"]:
+        tables["user_agent"] = user_agents
+    if conf["IP_ADDRESSES"]:
+        tables["ip_address"] = ip_addresses
+    return tables
+
+
+def intern_login_audits(objs):
+    """Moves the user agent (and IP) of unsaved LoginAudit instances into the lookup tables."""
+    for column, table in _enabled_tables().items():
+        ref = f"{INTERNED_COLUMNS[column]}_id"
+        pending = [obj for obj in objs if getattr(obj, column) and getattr(obj, ref) is None]
+        if not pending:
+            continue
+        ids = table.ids_for(getattr(obj, column) for obj in pending)
+        for obj in pending:
+            setattr(obj, ref, ids[getattr(obj, column)])
+            setattr(obj, column, None)
+
+
+# ----------------------
+# READS
+# ----------------------
+def original_column(column):
+    """Expression for the value of a LoginAudit column as written, interned or not."""
+    return Coalesce(f"{INTERNED_COLUMNS[column]}__value", column)
+
+
+def with_original(qs, *columns):
+    """Annotates original_<column> for each interned column, e.g. original_ip_address."""
+    return qs.annotate(**{f"original_{column}": original_column(column) for column in columns})
+
+
+def original_rows(qs, fields, limit):
+    """
+    list(qs.values(*fields)[:limit]), with interned LoginAudit columns read back
+    from their lookup tables (one LEFT JOIN each) under their own names.
+    """
+    interned = [f for f in fields if f in INTERNED_COLUMNS] if qs.model is LoginAudit else []
+    if not interned:
+        return list(qs.values(*fields)[:limit])
+    names = {f"original_{f}": f for f in interned}
+    qs = with_original(qs, *interned)
+    rows = qs.values(*[f"original_{f}" if f in INTERNED_COLUMNS else f for f in fields])[:limit]
+    return [{names.get(key, key): value for key, value in row.items()} for row in rows]
+
+
+def ip_filter(ip):
+    """Matches rows for `ip` whether the address was stored inline or interned."""
+    pk = ip_addresses.existing_id(ip)
+    return Q(ip_address=ip) if pk is None else Q(ip_address=ip) | Q(ip_ref_id=pk)
+
+
+# ----------------------
+# BACKFILL
+# ----------------------
+def backfill(batch_size=None, include_ips=None, on_batch=None, audit_model=LoginAudit, tables=None):
+    """
+    Interns the user agents (and IPs) of rows written before interning was on, in
+    keyset batches of one transaction each; returns the number of rows moved.
+    Migration 0007 runs it over historical models by passing `audit_model` and
+    DimensionTables of its own.
+    """
+    conf = get_audit_dimension_settings()
+    batch_size = batch_size or conf["BACKFILL_BATCH"]
+    columns = ["user_agent"] if conf["USER_AGENTS"] else []
+    if conf["IP_ADDRESSES"] if include_ips is None else include_ips:
+        columns.append("ip_address")
+    if not columns:
+        return 0
+    tables = tables or {"user_agent": user_agents, "ip_address": ip_addresses}
+
+    pending = Q()
+    if "user_agent" in columns:
+        pending |= Q(user_agent__isnull=False) & ~Q(user_agent="")
+    if "ip_address" in columns:
+        pending |= Q(ip_address__isnull=False)
+
+    moved, after = 0, 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                audit_model.objects.filter(pending, id__gt=after).order_by("id").values_list("id", *columns)[:batch_size]
+            )
+            if not rows:
+                break
+            for n, column in enumerate(columns, 1):
+                by_value = {}
+                for row in rows:
+                    if row[n]:
+                        by_value.setdefault(row[n], []).append(row[0])
+                ids = tables[column].ids_for(by_value)
+                for value, pks in by_value.items():
+                    audit_model.objects.filter(id__in=pks).update(
+                        **{f"{INTERNED_COLUMNS[column]}_id": ids[value], column: None}
+                    )
+        moved += len(rows)
+        after = rows[-1][0]
+        if on_batch:
+            on_batch(len(rows), after)
+    return moved
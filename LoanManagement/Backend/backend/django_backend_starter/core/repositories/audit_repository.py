@@ -1,11 +1,118 @@
-from django_backend_starter.apps.loan.models import LoginAudit
+from django.db.models import Count, Q
+from django.db.models.functions import TruncHour
+
+from django_backend_starter.apps.loan.models import AdminAudit, LoginAudit
+from django_backend_starter.core.repositories.audit_buffer import get_audit_writer
+from django_backend_starter.core.repositories.audit_dimensions import (
+    INTERNED_COLUMNS, ip_filter, original_rows, with_original,
+)
+from django_backend_starter.core.repositories.db_routing import replica_read
+
+LOGIN_AUDIT_FIELDS = (
+    "id", "timestamp", "event_type", "email_attempted", "ip_address", "user_agent",
+    "user_id", "user__email", "user__employee_id",
+)
+ADMIN_AUDIT_FIELDS = (
+    "id", "timestamp", "action", "reason",
+    "admin_id", "admin__email", "target_user_id", "target_user__email", "target_user__employee_id",
+)
+LOGIN_COUNT_DIMENSIONS = {"event_type": "event_type", "ip": "ip_address", "hour": "hour"}
+ADMIN_COUNT_DIMENSIONS = {"action": "action", "admin": "admin_id", "hour": "hour"}
+
+
+def _keyset_page(qs, fields, after, limit):
+    """Newest-first page on (timestamp, id); returns (rows, last_key)."""
+    if after is not None:
+        ts, pk = after
+        qs = qs.filter(Q(timestamp__lt=ts) | Q(timestamp=ts, id__lt=pk))
+    # values() joins the user FKs (and interned user agents/IPs) in the same query, without building models
+    rows = original_rows(qs.order_by("-timestamp", "-id"), fields, limit + 1)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1]["timestamp"], rows[-1]["id"])
+
+
+def _counts(qs, dimensions, group_by):
+    if group_by not in dimensions:
+        raise ValueError(f"group_by must be one of {tuple(dimensions)}")
+    column = dimensions[group_by]
+    ordering = "-count"
+    if column == "hour":
+        qs = qs.annotate(hour=TruncHour("timestamp"))
+        ordering = "hour"
+    elif column in INTERNED_COLUMNS and qs.model is LoginAudit:
+        rows = with_original(qs, column).values(f"original_{column}").annotate(count=Count("id"))
+        return [{column: r[f"original_{column}"], "count": r["count"]} for r in rows.order_by(ordering)[:1000]]
+    return list(qs.values(column).annotate(count=Count("id")).order_by(ordering)[:1000])
+
 
 class AuditRepository:
     def log_event(self, user=None, email=None, event_type="FAILURE", ip=None, ua=None):
-        return LoginAudit.objects.create(
+        # Saved inline in "sync" mode, queued for bulk_create in "buffered" mode (see AUDIT_BUFFER)
+        return get_audit_writer(LoginAudit).write(self._login_event(user, email, event_type, ip, ua))
+
+    async def alog_event(self, user=None, email=None, event_type="FAILURE", ip=None, ua=None):
+        return await get_audit_writer(LoginAudit).awrite(self._login_event(user, email, event_type, ip, ua))
+
+    @staticmethod
+    def _login_event(user, email, event_type, ip, ua):
+        return LoginAudit(
             user=user,
             email_attempted=email,
             event_type=event_type,
             ip_address=ip,
             user_agent=ua,
         )
+
+    def flush(self):
+        return get_audit_writer(LoginAudit).flush()
+
+    # ----------------------
+    # READS
+    # ----------------------
+    def _login_queryset(self, since=None, until=None, event_type=None, email=None, ip=None, user_id=None):
+        qs = LoginAudit.objects.all()
+        if since:
+            qs = qs.filter(timestamp__gte=since)
+        if until:
+            qs = qs.filter(timestamp__lt=until)
+        if event_type:
+            qs = qs.filter(event_type=event_type)
+        if email:
+            qs = qs.filter(email_attempted=email)
+        if ip:
+            qs = qs.filter(ip_filter(ip))
+        if user_id:
+            qs = qs.filter(user_id=user_id)
+        return qs
+
+    def _admin_queryset(self, since=None, until=None, action=None, admin_id=None, target_user_id=None):
+        qs = AdminAudit.objects.all()
+        if since:
+            qs = qs.filter(timestamp__gte=since)
+        if until:
+            qs = qs.filter(timestamp__lt=until)
+        if action:
+            qs = qs.filter(action=action)
+        if admin_id:
+            qs = qs.filter(admin_id=admin_id)
+        if target_user_id:
+            qs = qs.filter(target_user_id=target_user_id)
+        return qs
+
+    @replica_read("audit.logins")
+    def list_login_events(self, after=None, limit=100, **filters):
+        return _keyset_page(self._login_queryset(**filters), LOGIN_AUDIT_FIELDS, after, limit)
+
+    @replica_read("audit.counts")
+    def count_login_events(self, group_by, **filters):
+        return _counts(self._login_queryset(**filters), LOGIN_COUNT_DIMENSIONS, group_by)
+
+    @replica_read("audit.admin")
+    def list_admin_events(self, after=None, limit=100, **filters):
+        return _keyset_page(self._admin_queryset(**filters), ADMIN_AUDIT_FIELDS, after, limit)
+
+    @replica_read("audit.counts")
+    def count_admin_events(self, group_by, **filters):
+        return _counts(self._admin_queryset(**filters), ADMIN_COUNT_DIMENSIONS, group_by)
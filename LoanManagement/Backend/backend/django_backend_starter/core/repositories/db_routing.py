@@ -0,0 +1,154 @@
+# core/repositories/db_routing.py
+import contextvars
+import functools
+import inspect
+import random
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_backend_starter.core.utils.shared_cache import is_shared_cache
+
+DEFAULTS = {
+    "REPLICAS": {},                  # alias -> weight
+    "ROUTED_READS": (),              # replica_read() names allowed to use a replica
+    "READ_YOUR_WRITES_SECONDS": 5,   # a user stays on the primary this long after a write request
+    "CACHE_ALIAS": "default",         # also pins clients without cookies, when it is a shared cache
+}
+
+PIN_COOKIE = "db_pin"
+
+_read_scope = contextvars.ContextVar("replica_read_scope", default=None)
+_current_request = contextvars.ContextVar("db_routing_request", default=None)
+
+reads_by_alias = Counter()
+
+
+def get_routing_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "DATABASE_ROUTING", {}))
+    return conf
+
+
+def _pin_key(user_id):
+    return f"db_pin:{user_id}"
+
+
+def pin_to_primary(user_id, response=None):
+    """
+    Sends the user's reads to the primary for READ_YOUR_WRITES_SECONDS: through a
+    signed cookie on `response`, which whichever worker serves the next request
+    can check, and through CACHE_ALIAS when every worker shares it.
+    """
+    conf = get_routing_settings()
+    seconds = conf["READ_YOUR_WRITES_SECONDS"]
+    if not conf["REPLICAS"] or not seconds:
+        return
+    if response is not None:
+        response.set_signed_cookie(
+            PIN_COOKIE, str(user_id), salt=PIN_COOKIE, max_age=seconds,
+            secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite="Lax",
+        )
+    if is_shared_cache(conf["CACHE_ALIAS"]):
+        caches[conf["CACHE_ALIAS"]].set(_pin_key(user_id), 1, seconds)
+
+
+def _is_pinned(request, user_id, conf):
+    pinned = request.get_signed_cookie(
+        PIN_COOKIE, default=None, salt=PIN_COOKIE, max_age=conf["READ_YOUR_WRITES_SECONDS"]
+    )
+    if pinned == str(user_id):
+        return True
+    # a process-local cache would only pin the user on the worker that served the write
+    return is_shared_cache(conf["CACHE_ALIAS"]) and caches[conf["CACHE_ALIAS"]].get(_pin_key(user_id)) is not None
+
+
+def _request_needs_primary(request, conf):
+    if request is None:
+        return False
+    cached = getattr(request, "_db_needs_primary", None)
+    if cached is not None:
+        return cached
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        # the request itself may write: keep all of its reads consistent with those writes
+        needs = True
+    else:
+        # DRF copies the authenticated user onto the Django request. Resolving a lazy
+        # session user may itself query, which must not come back through the replica scope.
+        token = _read_scope.set(None)
+        try:
+            user = getattr(request, "user", None)
+            user_id = user.pk if user is not None and user.is_authenticated else None
+        finally:
+            _read_scope.reset(token)
+        if user_id is None:
+            return False  # not authenticated yet; decide again on the next read
+        needs = _is_pinned(request, user_id, conf)
+    request._db_needs_primary = needs
+    return needs
+
+
+def read_alias(name):
+    """
+    Database alias for the read `name`: a weighted-random replica when `name` is in
+    ROUTED_READS and nothing requires the primary, otherwise the primary. The primary
+    is required inside a transaction, during unsafe requests and while the user is
+    pinned after a write.
+    """
+    conf = get_routing_settings()
+    replicas = conf["REPLICAS"]
+    if not replicas or name not in conf["ROUTED_READS"]:
+        return DEFAULT_DB_ALIAS
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block or _request_needs_primary(_current_request.get(), conf):
+        return DEFAULT_DB_ALIAS
+    alias = random.choices(list(replicas), weights=list(replicas.values()))[0]
+    reads_by_alias[alias] += 1
+    return alias
+
+
+def replica_read(name):
+    """Marks a repository method whose queries may be served by a replica (see ROUTED_READS)."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                # the async ORM runs queries in sync_to_async threads, which copy this context
+                token = _read_scope.set(name)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _read_scope.reset(token)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _read_scope.set(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _read_scope.reset(token)
+        return wrapper
+    return decorator
+
+
+class ReplicaRouter:
+    """
+    Routes reads made inside a @replica_read method to a replica and everything
+    else to the primary. Replicas are copies of the primary, so relations are
+    allowed across all aliases and migrations only run on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        name = _read_scope.get()
+        return read_alias(name) if name else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_routing_settings()["REPLICAS"]
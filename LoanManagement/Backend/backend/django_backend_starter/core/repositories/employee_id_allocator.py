@@ -0,0 +1,103 @@
+# core/repositories/employee_id_allocator.py
+import os
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from django_backend_starter.apps.loan.models import EmployeeIdSequence, UserModel
+
+SEQUENCE_NAME = "employee_id"
+EMPLOYEE_ID_PREFIX = "EMP"
+
+
+def format_employee_id(num: int) -> str:
+    return f"{EMPLOYEE_ID_PREFIX}{num:03d}"
+
+
+class EmployeeIdAllocator:
+    """
+    Hands out EMP### IDs from blocks reserved in the EmployeeIdSequence table.
+
+    Each process reserves `block_size` numbers with a single UPDATE and then serves
+    them from memory, so creating a user never scans UserModel. Numbers left in a
+    block when a worker exits are skipped, so IDs are unique and increasing per
+    worker but not gap-free.
+
+    Blocks are only kept when reserved outside a transaction. Inside one, the
+    UPDATE is undone if the caller rolls back, so exactly the IDs needed are
+    reserved there and nothing is cached that another request could reissue.
+    """
+
+    def __init__(self, block_size=None):
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+        self._pid = None
+
+    @property
+    def block_size(self):
+        if self._block_size is None:
+            return getattr(settings, "EMPLOYEE_ID_BLOCK_SIZE", 50)
+        return self._block_size
+
+    def allocate(self) -> str:
+        return self.allocate_many(1)[0]
+
+    def allocate_many(self, count: int) -> list[str]:
+        ids = []
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked worker must not reuse the block inherited from its parent
+                self._next = self._end = 0
+                self._pid = os.getpid()
+            while len(ids) < count:
+                if self._next >= self._end:
+                    if connection.in_atomic_block:
+                        start, end = self._reserve(count - len(ids))
+                        ids.extend(format_employee_id(n) for n in range(start, end))
+                        break
+                    self._next, self._end = self._reserve(max(self.block_size, count - len(ids)))
+                take = min(self._end - self._next, count - len(ids))
+                ids.extend(format_employee_id(n) for n in range(self._next, self._next + take))
+                self._next += take
+        return ids
+
+    def _reserve(self, size):
+        """Reserves [start, start + size) from the sequence row and returns the range."""
+        with transaction.atomic():
+            # UPDATE first so the row lock is taken before we read the new value
+            updated = EmployeeIdSequence.objects.filter(name=SEQUENCE_NAME).update(
+                next_value=F("next_value") + size
+            )
+            if not updated:
+                self._bootstrap(size)
+            end = EmployeeIdSequence.objects.get(name=SEQUENCE_NAME).next_value
+        return end - size, end
+
+    def _bootstrap(self, size):
+        # One-off scan so existing EMP### rows (including ones past EMP999) are never reissued
+        highest = 0
+        for employee_id in UserModel.objects.filter(
+            employee_id__startswith=EMPLOYEE_ID_PREFIX
+        ).values_list("employee_id", flat=True).iterator():
+            suffix = employee_id[len(EMPLOYEE_ID_PREFIX):]
+            if suffix.isdigit():
+                highest = max(highest, int(suffix))
+        _, created = EmployeeIdSequence.objects.get_or_create(
+            name=SEQUENCE_NAME, defaults={"next_value": highest + 1 + size}
+        )
+        if not created:
+            # Another worker bootstrapped first; reserve from its row instead
+            EmployeeIdSequence.objects.filter(name=SEQUENCE_NAME).update(
+                next_value=F("next_value") + size
+            )
+
+    def reset(self):
+        with self._lock:
+            self._next = self._end = 0
+
+
+employee_id_allocator = EmployeeIdAllocator()
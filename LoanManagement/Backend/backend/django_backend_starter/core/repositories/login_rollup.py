@@ -0,0 +1,244 @@
+# core/repositories/login_rollup.py
+import logging
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from django_backend_starter.apps.loan.models import LoginActivityRollup, LoginAudit, RollupWatermark
+from django_backend_starter.core.repositories.audit_dimensions import with_original
+from django_backend_starter.core.repositories.db_routing import replica_read
+
+DEFAULTS = {
+    "BATCH_SIZE": 5000,        # audit rows folded in per catch-up transaction
+    "SETTLE_SECONDS": 10,      # rows younger than this wait for the next run
+    "GAP_SECONDS": 600,        # how long a skipped id below the watermark is awaited (late commit)
+    "MAX_GAPS": 10000,         # skipped ids tracked at once; beyond that the oldest are given up
+    "REFRESH_ON_READ": False,  # the read endpoint runs one catch-up batch first (a write on GET)
+}
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "login_activity"
+
+# dimension -> LoginAudit column providing the key (None: one "all" series)
+ROLLUP_DIMENSIONS = {
+    "all": None,
+    "branch": "user__branch",
+    "region": "user__region",
+    "ip": "original_ip_address",  # ip_address, interned or not (see with_original)
+}
+EVENT_COLUMNS = {"SUCCESS": "success", "FAILURE": "failure", "LOCKOUT": "lockout"}
+COUNT_COLUMNS = tuple(EVENT_COLUMNS.values())
+
+
+def get_rollup_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "LOGIN_ROLLUP", {}))
+    return conf
+
+
+def hour_bucket(ts):
+    return ts.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+class _WatermarkMoved(Exception):
+    """Another worker advanced the watermark while this batch was being folded in."""
+
+
+class LoginRollupRepository:
+    """
+    Keeps LoginActivityRollup in step with LoginAudit using a high-water mark.
+
+    catch_up() folds audit rows with id above the watermark into the hourly buckets
+    and advances the watermark in the same transaction; the watermark UPDATE is
+    conditional on its old state, so concurrent runs never count a row twice.
+    Branch and region are taken from the user at fold time. rebuild() recomputes
+    everything from raw rows.
+
+    Ids are assigned at INSERT but rows become visible at COMMIT, so a row can show
+    up below the watermark after it moved past. Ids skipped on the way are kept in
+    the watermark as gaps, re-checked on every run and folded in when their row
+    appears; a gap still empty after GAP_SECONDS is taken as a rolled-back insert.
+    """
+
+    def __init__(self, batch_size=None, settle_seconds=None, gap_seconds=None):
+        conf = get_rollup_settings()
+        self.batch_size = batch_size or conf["BATCH_SIZE"]
+        self.settle_seconds = conf["SETTLE_SECONDS"] if settle_seconds is None else settle_seconds
+        self.gap_seconds = conf["GAP_SECONDS"] if gap_seconds is None else gap_seconds
+        self.max_gaps = conf["MAX_GAPS"]
+
+    # ----------------------
+    # WATERMARK
+    # ----------------------
+    def watermark(self):
+        return RollupWatermark.objects.filter(name=WATERMARK_NAME).values_list("last_id", flat=True).first() or 0
+
+    def _state(self):
+        return RollupWatermark.objects.filter(name=WATERMARK_NAME).values("last_id", "gaps", "updated_at").get()
+
+    def _advance(self, old, new, gaps):
+        moved = RollupWatermark.objects.filter(
+            name=WATERMARK_NAME, last_id=old["last_id"], updated_at=old["updated_at"]
+        ).update(last_id=new, gaps=gaps, updated_at=timezone.now())
+        if not moved:
+            raise _WatermarkMoved()
+
+    def gaps(self):
+        """Skipped audit ids still awaited, as {id: first seen (epoch seconds)}."""
+        return {int(pk): seen for pk, seen in self._state()["gaps"].items()}
+
+    # ----------------------
+    # INCREMENTAL
+    # ----------------------
+    def catch_up(self, max_batches=None):
+        """Folds new audit rows into the rollups; returns the number of rows processed."""
+        RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+        processed = batches = 0
+        while max_batches is None or batches < max_batches:
+            try:
+                count = self._fold_batch()
+            except _WatermarkMoved:
+                break  # another worker is catching up
+            if not count:
+                break
+            processed += count
+            batches += 1
+        return processed
+
+    def _rows(self, qs):
+        return with_original(qs, "ip_address").order_by("id").values_list(
+            "id", "timestamp", "event_type", *filter(None, ROLLUP_DIMENSIONS.values())
+        )
+
+    def _fold_batch(self):
+        now = timezone.now()
+        horizon = now - timedelta(seconds=self.settle_seconds)
+        with transaction.atomic():
+            state = self._state()
+            start = state["last_id"]
+            gaps = {int(pk): seen for pk, seen in state["gaps"].items()}
+            deltas = {}
+
+            # Rows that committed after the watermark passed their id
+            late = list(self._rows(LoginAudit.objects.filter(id__in=list(gaps)))) if gaps else []
+            for row in late:
+                del gaps[row[0]]
+                self._fold(deltas, row)
+
+            last_id, folded = start, 0
+            for row in self._rows(LoginAudit.objects.filter(id__gt=start))[:self.batch_size]:
+                if row[1] > horizon:
+                    break
+                # Only the nearest MAX_GAPS ids of a long run (e.g. a purge) are worth waiting for
+                gaps.update(dict.fromkeys(range(max(last_id + 1, row[0] - self.max_gaps), row[0]), now.timestamp()))
+                last_id, folded = row[0], folded + 1
+                self._fold(deltas, row)
+
+            expired = {pk for pk, seen in gaps.items() if now.timestamp() - seen > self.gap_seconds}
+            overflow = len(gaps) - len(expired) - self.max_gaps
+            if overflow > 0:
+                expired.update(sorted(set(gaps) - expired)[:overflow])
+            if expired:
+                logger.info("Login rollup gave up on %d skipped audit ids", len(expired))
+                for pk in expired:
+                    del gaps[pk]
+
+            if not folded and not late and not expired:
+                return 0
+            self._advance(state, last_id, {str(pk): seen for pk, seen in gaps.items()})
+            self._apply(deltas)
+        return folded + len(late)
+
+    @staticmethod
+    def _fold(deltas, row):
+        column = EVENT_COLUMNS.get(row[2])
+        if column is None:
+            return
+        bucket = hour_bucket(row[1])
+        values = dict(zip(filter(None, ROLLUP_DIMENSIONS.values()), row[3:]))
+        for dimension, source in ROLLUP_DIMENSIONS.items():
+            key = (values[source] or "") if source else ""
+            counts = deltas.setdefault((dimension, key, bucket), dict.fromkeys(COUNT_COLUMNS, 0))
+            counts[column] += 1
+
+    def _apply(self, deltas):
+        if not deltas:
+            return
+        buckets = {bucket for _, _, bucket in deltas}
+        existing = {
+            (r.dimension, r.key, r.bucket): r
+            for r in LoginActivityRollup.objects.filter(
+                bucket__in=buckets, dimension__in={d for d, _, _ in deltas}, key__in={k for _, k, _ in deltas}
+            )
+        }
+        updates, creates = [], []
+        for ident, counts in deltas.items():
+            row = existing.get(ident)
+            if row is None:
+                dimension, key, bucket = ident
+                creates.append(LoginActivityRollup(dimension=dimension, key=key, bucket=bucket, **counts))
+                continue
+            for column, value in counts.items():
+                setattr(row, column, getattr(row, column) + value)
+            updates.append(row)
+        LoginActivityRollup.objects.bulk_update(updates, COUNT_COLUMNS, batch_size=500)
+        LoginActivityRollup.objects.bulk_create(creates, batch_size=500)
+
+    # ----------------------
+    # REBUILD
+    # ----------------------
+    def rebuild(self):
+        """Recomputes every bucket with one GROUP BY per dimension; returns the rollup row count."""
+        with transaction.atomic():
+            high = LoginAudit.objects.aggregate(m=Max("id"))["m"] or 0
+            LoginActivityRollup.objects.all().delete()
+            source = with_original(LoginAudit.objects.filter(id__lte=high), "ip_address").annotate(
+                bucket=TruncHour("timestamp", tzinfo=dt_timezone.utc)
+            )
+            aggregates = {
+                column: Count("id", filter=Q(event_type=event)) for event, column in EVENT_COLUMNS.items()
+            }
+            created = 0
+            for dimension, column in ROLLUP_DIMENSIONS.items():
+                group = ("bucket", column) if column else ("bucket",)
+                merged = {}
+                for r in source.values(*group).annotate(**aggregates).order_by():
+                    # NULL and "" (no user / blank branch) share the empty key
+                    counts = merged.setdefault(
+                        ((r[column] or "") if column else "", r["bucket"]), dict.fromkeys(COUNT_COLUMNS, 0)
+                    )
+                    for c in COUNT_COLUMNS:
+                        counts[c] += r[c]
+                rows = [
+                    LoginActivityRollup(dimension=dimension, key=key, bucket=bucket, **counts)
+                    for (key, bucket), counts in merged.items()
+                    if any(counts.values())
+                ]
+                LoginActivityRollup.objects.bulk_create(rows, batch_size=500)
+                created += len(rows)
+            RollupWatermark.objects.update_or_create(
+                name=WATERMARK_NAME, defaults={"last_id": high, "gaps": {}, "updated_at": timezone.now()}
+            )
+        return created
+
+    # ----------------------
+    # READS
+    # ----------------------
+    @replica_read("rollup.series")
+    def series(self, dimension, key=None, since=None, until=None, limit=1000):
+        """Buckets for [since, until) oldest first, one row per (bucket, key)."""
+        if dimension not in ROLLUP_DIMENSIONS:
+            raise ValueError(f"dimension must be one of {tuple(ROLLUP_DIMENSIONS)}")
+        qs = LoginActivityRollup.objects.filter(dimension=dimension)
+        if key is not None:
+            qs = qs.filter(key=key)
+        if since:
+            qs = qs.filter(bucket__gte=hour_bucket(since))
+        if until:
+            qs = qs.filter(bucket__lt=until)
+        return list(qs.order_by("bucket", "key").values("bucket", "key", *COUNT_COLUMNS)[:limit])
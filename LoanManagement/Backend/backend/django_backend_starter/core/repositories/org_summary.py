@@ -0,0 +1,228 @@
+# core/repositories/org_summary.py
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.utils.shared_cache import is_shared_cache
+
+DEFAULTS = {
+    "ALIAS": "default",  # a shared cache (Redis, Memcached); on a process-local one nothing is cached
+    "TTL": 3600,         # seconds; writes invalidate it, the TTL only bounds a lost last-login update
+    "KEY_PREFIX": "org_summary",
+}
+
+# Saving any of these changes which region/branch an agent counts in, or under which status
+COUNTED_FIELDS = frozenset({"role", "branch", "region", "is_active", "is_suspended"})
+
+STATUSES = ("active", "suspended", "locked", "inactive")
+
+
+def get_org_summary_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "ORG_SUMMARY", {}))
+    return conf
+
+
+def _status_counts(now):
+    # Each agent has exactly one status: suspended, else locked, else inactive, else active
+    locked = Q(lockout_until__gt=now)
+    return {
+        "agents": Count("id"),
+        "active": Count("id", filter=Q(is_active=True, is_suspended=False) & ~locked),
+        "suspended": Count("id", filter=Q(is_suspended=True)),
+        "locked": Count("id", filter=Q(is_suspended=False) & locked),
+        "inactive": Count("id", filter=Q(is_active=False, is_suspended=False) & ~locked),
+    }
+
+
+def _rollup(rows):
+    totals = dict.fromkeys(("agents",) + STATUSES, 0)
+    totals["last_login"] = None
+    for row in rows:
+        for key in ("agents",) + STATUSES:
+            totals[key] += row[key]
+        if row["last_login"] and (totals["last_login"] is None or row["last_login"] > totals["last_login"]):
+            totals["last_login"] = row["last_login"]
+    return totals
+
+
+class OrgSummaryCache:
+    """
+    Agent counts (active, suspended, locked, inactive) and last login per region
+    and branch, computed with one grouped query and kept in the cache under a
+    version number.
+
+    Creating, deleting, suspending, reactivating, moving or locking agents bumps
+    the version (see UserModel.save() and UserRepositoryImpl.set_suspension()), so
+    the next read recomputes. Logins only move a branch's last_login forward and
+    are applied to the cached entry in place. Lockouts end without a write, so an
+    entry also goes stale at the earliest unlock time it counted.
+
+    Each process keeps the last entry it read: a steady-state read is one cache
+    get of the version and no DB work.
+
+    Invalidation has to reach every worker, so on a process-local ALIAS (LocMem,
+    dummy) nothing is cached: every read runs the grouped query.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = None  # last entry read by this process
+
+    @property
+    def conf(self):
+        return get_org_summary_settings()
+
+    def _cache(self):
+        return caches[self.conf["ALIAS"]]
+
+    def enabled(self):
+        # A bump on a local cache only reaches the worker that made it; the others would keep old counts
+        return is_shared_cache(self.conf["ALIAS"])
+
+    def _version_key(self):
+        return f"{self.conf['KEY_PREFIX']}:version"
+
+    def _entry_key(self, version):
+        return f"{self.conf['KEY_PREFIX']}:{version}"
+
+    # ----------------------
+    # VERSION
+    # ----------------------
+    def version(self):
+        cache = self._cache()
+        key = self._version_key()
+        version = cache.get(key)
+        if version is None:
+            # Start from the clock so a flushed cache never hands out a stamp already seen
+            cache.add(key, time.time_ns() // 1000, None)
+            version = cache.get(key)
+        return version
+
+    def _bump(self):
+        try:
+            return self._cache().incr(self._version_key())
+        except ValueError:
+            return None  # no version yet: the next read mints one
+
+    def invalidate(self):
+        if not self.enabled():
+            return
+        self._bump()
+        # Bump again once the write is visible, so a read racing the commit can't keep the old counts
+        transaction.on_commit(self._bump)
+
+    # ----------------------
+    # READS
+    # ----------------------
+    def get(self):
+        """The current summary entry: {"version", "computed_at", "totals", "regions"} (plus internals)."""
+        if not self.enabled():
+            return self._compute(time.time_ns() // 1000)  # a version (ETag) no other read hands out
+        version = self.version()
+        entry = self._local
+        if entry is None or entry["version"] != version:
+            entry = self._cache().get(self._entry_key(version))
+        if entry is not None and entry["stale_at"] is not None and time.time() >= entry["stale_at"]:
+            self._bump()  # a counted lockout has ended
+            version, entry = self.version(), None
+        if entry is None:
+            entry = self._compute(version)
+            self._cache().set(self._entry_key(version), entry, self.conf["TTL"])
+        self._local = entry
+        return entry
+
+    def _compute(self, version):
+        now = timezone.now()
+        # Always the primary: a lagging replica would cache old counts under the new version
+        rows = list(
+            UserModel.objects.using(DEFAULT_DB_ALIAS)
+            .filter(role="agent")
+            .values("region", "branch")
+            .annotate(
+                **_status_counts(now),
+                last_login=Max("last_login"),
+                next_unlock=Min("lockout_until", filter=Q(is_suspended=False, lockout_until__gt=now)),
+            )
+            .order_by("region", "branch")
+        )
+
+        regions, stale_at = {}, None
+        for row in rows:
+            next_unlock = row.pop("next_unlock")
+            if next_unlock is not None:
+                stale_at = min(stale_at or next_unlock.timestamp(), next_unlock.timestamp())
+            branch = {"branch": row.pop("branch")}
+            branch.update((key, value) for key, value in row.items() if key != "region")
+            regions.setdefault(row["region"], []).append(branch)
+
+        summary = []
+        for region, branches in regions.items():
+            summary.append({"region": region, **_rollup(branches), "branches": branches})
+        return {
+            "version": version,
+            "computed_at": now,
+            "stale_at": stale_at,
+            "totals": _rollup(summary),
+            "regions": summary,
+        }
+
+    # ----------------------
+    # WRITES
+    # ----------------------
+    def user_saved(self, user, update_fields=None):
+        """Called from UserModel.save(): invalidates, applies a login, or does nothing."""
+        if not self.enabled():
+            return
+        if update_fields is None:
+            return self.invalidate()
+        fields = set(update_fields)
+        if fields & COUNTED_FIELDS:
+            return self.invalidate()
+        if "lockout_until" in fields and user.lockout_until and user.lockout_until > timezone.now():
+            return self.invalidate()  # newly locked; clearing a lockout only happens once it has ended
+        if "last_login" in fields and user.last_login:
+            deferred = user.get_deferred_fields()
+            if deferred & {"role", "region", "branch"}:
+                return self.invalidate()
+            if user.role == "agent":
+                region, branch, last_login = user.region, user.branch, user.last_login
+                transaction.on_commit(lambda: self._record_login(region, branch, last_login))
+
+    def _record_login(self, region, branch, last_login):
+        """Moves the cached last_login of the branch, its region and the totals forward."""
+        with self._lock:
+            cache = self._cache()
+            version = cache.get(self._version_key())
+            if version is None:
+                return
+            entry = cache.get(self._entry_key(version))
+            if entry is None:
+                return  # the next read computes it, this login included
+            entry = copy.deepcopy(entry)
+            target = next((r for r in entry["regions"] if r["region"] == region), None)
+            row = target and next((b for b in target["branches"] if b["branch"] == branch), None)
+            if row is None:
+                return self._bump()  # the agent's branch is not in the entry yet
+            moved = False
+            for node in (row, target, entry["totals"]):
+                if node["last_login"] is None or node["last_login"] < last_login:
+                    node["last_login"] = last_login
+                    moved = True
+            if not moved:
+                return
+            # Publish under the next version unless another write got in first (that one recomputes)
+            if self._bump() != version + 1:
+                return
+            entry["version"] = version + 1
+            cache.set(self._entry_key(version + 1), entry, self.conf["TTL"])
+
+
+org_summary = OrgSummaryCache()
@@ -0,0 +1,118 @@
+# core/repositories/principal_cache.py
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.utils.shared_cache import is_shared_cache
+
+# Everything authentication, role checks, password expiry and SessionMeView read.
+# Any other field is left deferred and loaded from the DB only if something touches it.
+PRINCIPAL_FIELDS = (
+    "id", "email", "employee_id", "first_name", "last_name", "role",
+    "is_active", "is_staff", "is_superuser", "is_suspended",
+    "password_last_changed", "lockout_until",
+)
+
+# from_db() expects values in concrete field order
+_FIELD_ORDER = tuple(f.attname for f in UserModel._meta.concrete_fields if f.attname in PRINCIPAL_FIELDS)
+
+DEFAULTS = {
+    "ALIAS": "default",  # a shared Django cache alias (Redis, Memcached); off on a process-local one
+    "TTL": 300,          # seconds; explicit invalidation keeps it correct, the TTL only bounds staleness
+    "KEY_PREFIX": "principal",
+}
+
+
+def _conf():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "PRINCIPAL_CACHE", {}))
+    return conf
+
+
+def enabled():
+    # Invalidation only reaches the worker that ran it on a local cache, so another worker would keep
+    # authenticating a suspended or demoted user for up to TTL seconds: read the DB instead
+    return is_shared_cache(_conf()["ALIAS"])
+
+
+def _key(user_id):
+    return f"{_conf()['KEY_PREFIX']}:{user_id}"
+
+
+def _to_user(entry):
+    user = UserModel.from_db(DEFAULT_DB_ALIAS, _FIELD_ORDER, entry["values"])
+    user._cached_session_auth_hash = entry["session_auth_hash"]
+    return user
+
+
+def cache_principal(user):
+    entry = {
+        "values": tuple(getattr(user, field) for field in _FIELD_ORDER),
+        "session_auth_hash": user.get_session_auth_hash(),
+    }
+    conf = _conf()
+    if enabled():
+        caches[conf["ALIAS"]].set(_key(user.pk), entry, conf["TTL"])
+    return entry
+
+
+def get_principal(user_id):
+    """
+    Returns a UserModel instance for `user_id` built from the principal cache, or None.
+
+    Only PRINCIPAL_FIELDS are populated; the rest are deferred, so the instance can
+    still be saved or used as a ForeignKey value. Misses load the row once and cache it.
+    With a process-local cache alias every call loads the row.
+    """
+    if not enabled():
+        return UserModel.objects.filter(pk=user_id).first()
+    entry = caches[_conf()["ALIAS"]].get(_key(user_id))
+    if entry is None:
+        user = UserModel.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        entry = cache_principal(user)
+    return _to_user(entry)
+
+
+def _version_key(user_id):
+    return f"{_conf()['KEY_PREFIX']}:version:{user_id}"
+
+
+def profile_version(user_id):
+    """
+    Version token of the user's profile; changes whenever the principal is invalidated.
+    Session profile snapshots (core/repositories/session_profile.py) are tagged with it.
+    """
+    if not enabled():
+        return uuid.uuid4().hex  # matches no cached_profile_version(): snapshots are never trusted
+    cache = caches[_conf()["ALIAS"]]
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Outlives any session tagged with it; a lost version only makes snapshots stale
+        cache.add(key, uuid.uuid4().hex, settings.SESSION_COOKIE_AGE)
+        version = cache.get(key)
+    return version
+
+
+def cached_profile_version(user_id):
+    """Like profile_version() but never mints one: None means every snapshot is stale."""
+    if not enabled():
+        return None
+    return caches[_conf()["ALIAS"]].get(_version_key(user_id))
+
+
+def invalidate_principal(user_id):
+    invalidate_principals([user_id])
+
+
+def invalidate_principals(user_ids):
+    cache = caches[_conf()["ALIAS"]]
+    keys = [key for user_id in user_ids for key in (_key(user_id), _version_key(user_id))]
+    cache.delete_many(keys)
+    # Drop them again once the write is visible, so a concurrent miss can't re-cache the old row
+    transaction.on_commit(lambda: cache.delete_many(keys))
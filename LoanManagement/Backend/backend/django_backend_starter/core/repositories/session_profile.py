@@ -0,0 +1,70 @@
+# core/repositories/session_profile.py
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.utils.crypto import constant_time_compare
+
+from django_backend_starter.apps.loan.models import UserModel
+from django_backend_starter.core.repositories.principal_cache import (
+    cache_principal, cached_profile_version, get_principal, profile_version,
+)
+
+PROFILE_SESSION_KEY = "_profile"
+
+# What SessionMeView returns
+PROFILE_FIELDS = ("id", "email", "employee_id", "first_name", "last_name", "role")
+# ... plus what authentication, role checks and the password-expiry middleware read
+SNAPSHOT_FIELDS = PROFILE_FIELDS + ("is_active", "is_staff", "is_superuser", "password_last_changed")
+
+# from_db() expects values in concrete field order
+_FIELD_ORDER = tuple(f.attname for f in UserModel._meta.concrete_fields if f.attname in SNAPSHOT_FIELDS)
+_DATETIME_FIELDS = {"password_last_changed"}
+
+
+def store_profile_snapshot(session, user):
+    values = []
+    for field in _FIELD_ORDER:
+        value = getattr(user, field)
+        values.append(value.isoformat() if field in _DATETIME_FIELDS else str(value) if field == "id" else value)
+    session[PROFILE_SESSION_KEY] = {"v": profile_version(user.pk), "f": values}
+    if "password" in user.__dict__:
+        cache_principal(user)  # the next request checks the session against it
+
+
+def _valid_snapshot(session):
+    snapshot = session.get(PROFILE_SESSION_KEY)
+    if not snapshot:
+        return None
+    values = dict(zip(_FIELD_ORDER, snapshot["f"]))
+    if values.get("id") != session.get(SESSION_KEY) or snapshot["v"] != cached_profile_version(values["id"]):
+        del session[PROFILE_SESSION_KEY]
+        return None
+    return values
+
+
+def snapshot_user(session):
+    """
+    The logged-in user for a session with a current profile snapshot, from the
+    principal cache (no query on a hit); None when there is no valid snapshot.
+
+    The session's auth hash is checked against the user's actual one, and
+    suspended, locked or deactivated users are refused, as on every request.
+    """
+    values = _valid_snapshot(session)
+    if values is None:
+        return None
+    user = get_principal(values["id"])
+    if (
+        user is None
+        or not constant_time_compare(session.get(HASH_SESSION_KEY, ""), user.get_session_auth_hash())
+        or not user.is_active
+        or not user.can_login()
+    ):
+        del session[PROFILE_SESSION_KEY]
+        return None
+    return user
+
+
+def get_profile_snapshot(session):
+    values = _valid_snapshot(session)
+    if values is None:
+        return None
+    return {field: values[field] for field in PROFILE_FIELDS}
@@ -0,0 +1,218 @@
+# core/repositories/sqlite_writer.py
+import asyncio
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, OperationalError, close_old_connections, connections, transaction
+
+DEFAULTS = {
+    "ENABLED": False,     # queue writes on one thread; only takes effect when the default database is SQLite
+    "MAX_BATCH": 64,      # queued writes committed together in one transaction
+    "TIMEOUT": 30.0,      # seconds a caller waits for its write to commit
+    "RETRIES": 5,         # attempts after a "database is locked" error
+    "BACKOFF": 0.01,      # first retry delay in seconds, doubled per attempt (with jitter)
+    "MAX_BACKOFF": 0.5,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def get_sqlite_writer_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "SQLITE_WRITER", {}))
+    return conf
+
+
+def is_lock_error(exc):
+    message = str(exc).lower()
+    return isinstance(exc, OperationalError) and ("locked" in message or "busy" in message)
+
+
+def retry_on_lock(func, retries=None, backoff=None, max_backoff=None):
+    """
+    Calls func() and retries it with exponential backoff and jitter while SQLite
+    reports the database as locked or busy. func must be safe to run again, i.e.
+    one whole transaction rather than part of one.
+    """
+    conf = get_sqlite_writer_settings()
+    retries = conf["RETRIES"] if retries is None else retries
+    delay = conf["BACKOFF"] if backoff is None else backoff
+    max_backoff = conf["MAX_BACKOFF"] if max_backoff is None else max_backoff
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except OperationalError as exc:
+            if attempt == retries or not is_lock_error(exc):
+                raise
+            sqlite_writer.lock_retries += 1
+            time.sleep(min(delay, max_backoff) * random.uniform(0.5, 1.5))
+            delay *= 2
+
+
+class SQLiteWriteQueue:
+    """
+    Serializes this process's writes on a single writer thread when the default
+    database is SQLite. Callers block until their write commits; queued writes
+    are committed together (one savepoint each, so one failing write does not
+    undo the others) and the whole group is retried on lock errors. Reads keep
+    running concurrently on the callers' own connections (WAL).
+
+    SQLite checks foreign keys at COMMIT rather than per savepoint, so when the
+    group's COMMIT fails on one, each write runs again in its own transaction and
+    only the offending ones fail.
+
+    On other databases, inside an open transaction and on the writer thread itself
+    the write runs inline, in its own transaction (or savepoint) all the same.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.submitted = 0
+        self.inline = 0
+        self.committed = 0
+        self.failed = 0
+        self.batches = 0
+        self.split_batches = 0
+        self.max_batch = 0
+        self.lock_retries = 0
+        self.total_wait_ms = 0.0
+
+    def _queued(self):
+        conf = get_sqlite_writer_settings()
+        conn = connections[DEFAULT_DB_ALIAS]
+        return (
+            conf["ENABLED"]
+            and conn.vendor == "sqlite"
+            and not conn.in_atomic_block
+            and threading.current_thread() is not self._thread
+        )
+
+    def run(self, func, *args, **kwargs):
+        """Runs func(*args, **kwargs) as a write and returns its result (or raises its exception)."""
+        if not self._queued():
+            self.inline += 1
+            if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+                return self._atomic_call(func, args, kwargs)  # savepoint; can't retry part of a transaction
+            return retry_on_lock(lambda: self._atomic_call(func, args, kwargs))
+
+        started = time.perf_counter()
+        try:
+            return self._submit(func, args, kwargs).result(get_sqlite_writer_settings()["TIMEOUT"])
+        finally:
+            self.total_wait_ms += (time.perf_counter() - started) * 1000
+
+    async def arun(self, func, *args, **kwargs):
+        """run() for async callers: awaits the queued write instead of blocking the event loop."""
+        started = time.perf_counter()
+        # Whether a transaction is open is only known on the thread the ORM runs on
+        future, queued = await sync_to_async(self._submit_or_run)(func, args, kwargs)
+        if not queued:
+            return future.result()
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), get_sqlite_writer_settings()["TIMEOUT"])
+        finally:
+            self.total_wait_ms += (time.perf_counter() - started) * 1000
+
+    def _submit_or_run(self, func, args, kwargs):
+        if self._queued():
+            return self._submit(func, args, kwargs), True
+        future = Future()
+        try:
+            future.set_result(self.run(func, *args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future, False
+
+    def _submit(self, func, args, kwargs):
+        future = Future()
+        self._queue.put((func, args, kwargs, future))
+        self.submitted += 1
+        self._ensure_thread()
+        return future
+
+    @staticmethod
+    def _atomic_call(func, args, kwargs):
+        with transaction.atomic():
+            return func(*args, **kwargs)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            max_batch = get_sqlite_writer_settings()["MAX_BATCH"]
+            while len(batch) < max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            outcomes = self._process(batch)
+            self.batches += 1
+            self.max_batch = max(self.max_batch, len(batch))
+            for (_, _, _, future), (ok, value) in zip(batch, outcomes):
+                if ok:
+                    self.committed += 1
+                    future.set_result(value)
+                else:
+                    self.failed += 1
+                    future.set_exception(value)
+
+    def _process(self, batch):
+        try:
+            close_old_connections()
+            try:
+                return retry_on_lock(lambda: self._commit(batch))
+            except IntegrityError as exc:
+                if len(batch) == 1:
+                    return [(False, exc)]
+                self.split_batches += 1
+                return [self._process([item])[0] for item in batch]
+        except Exception as exc:
+            logger.exception("SQLite write batch failed")
+            return [(False, exc)] * len(batch)
+
+    @staticmethod
+    def _commit(batch):
+        outcomes = []
+        with transaction.atomic():
+            for func, args, kwargs, _ in batch:
+                try:
+                    with transaction.atomic():
+                        outcomes.append((True, func(*args, **kwargs)))
+                except Exception as exc:
+                    if is_lock_error(exc):
+                        raise  # retry the whole group
+                    outcomes.append((False, exc))
+        return outcomes
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "submitted": self.submitted,
+            "inline": self.inline,
+            "committed": self.committed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "split_batches": self.split_batches,
+            "max_batch": self.max_batch,
+            "lock_retries": self.lock_retries,
+            "avg_wait_ms": round(self.total_wait_ms / self.submitted, 3) if self.submitted else 0.0,
+        }
+
+
+sqlite_writer = SQLiteWriteQueue()
@@ -0,0 +1,168 @@
+# core/repositories/token_blacklist_filter.py
+import hashlib
+import math
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+DEFAULTS = {
+    "ENABLED": True,
+    "CAPACITY": 1_000_000,     # unexpired blacklisted JTIs the filter is sized for (grows on rebuild)
+    "ERROR_RATE": 0.001,       # false-positive rate at capacity; a positive is confirmed in the DB
+    "REFRESH_INTERVAL": 1.0,   # seconds between incremental syncs from the BlacklistedToken high-water mark
+    "CHUNK_SIZE": 10000,
+}
+
+
+def get_filter_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "JTI_BLACKLIST_FILTER", {}))
+    return conf
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing of one blake2b digest."""
+
+    __slots__ = ("size", "hashes", "bits", "count", "capacity")
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        bits = self.bits
+        for p in self._positions(item):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class BlacklistFilter:
+    """
+    Per-process membership filter for blacklisted refresh-token JTIs.
+
+    A negative answer means the JTI was not blacklisted as of the last sync, so the
+    blacklist SELECT is skipped; a positive answer is confirmed against the DB.
+    The filter is built once from unexpired BlacklistedToken rows and then follows
+    new rows past a high-water mark (their id) every REFRESH_INTERVAL seconds.
+    Tokens blacklisted in this process are added immediately. Rotation stays
+    race-free regardless of sync lag: CompactRefreshToken.blacklist() INSERTs
+    into the unique BlacklistedToken.token column and rejects a token that is
+    already there.
+    """
+
+    def __init__(self, capacity=None, error_rate=None, refresh_interval=None):
+        self._overrides = {"CAPACITY": capacity, "ERROR_RATE": error_rate, "REFRESH_INTERVAL": refresh_interval}
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._high = 0
+        self._synced_at = 0.0
+        self._pid = None
+
+        self.lookups = 0
+        self.skipped_db = 0
+        self.db_checks = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+
+    def _setting(self, name):
+        value = self._overrides.get(name)
+        return value if value is not None else get_filter_settings()[name]
+
+    @property
+    def enabled(self):
+        return get_filter_settings()["ENABLED"]
+
+    # ----------------------
+    # LOOKUPS
+    # ----------------------
+    def might_contain(self, jti) -> bool:
+        self.lookups += 1
+        self._sync_if_due()
+        if jti in self._bloom:
+            self.db_checks += 1
+            return True
+        self.skipped_db += 1
+        return False
+
+    def record_false_positive(self):
+        self.false_positives += 1
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None and self._pid == os.getpid():
+                self._bloom.add(jti)
+
+    # ----------------------
+    # SYNC
+    # ----------------------
+    def _sync_if_due(self):
+        if self._bloom is not None and self._pid == os.getpid() and \
+                time.monotonic() - self._synced_at < self._setting("REFRESH_INTERVAL"):
+            return
+        with self._lock:
+            if self._bloom is None or self._pid != os.getpid() or self._bloom.count > self._bloom.capacity:
+                self._rebuild()
+            elif time.monotonic() - self._synced_at >= self._setting("REFRESH_INTERVAL"):
+                self._sync()
+
+    def _sync(self):
+        for pk, jti in self._rows(BlacklistedToken.objects.filter(id__gt=self._high)):
+            self._bloom.add(jti)
+            self._high = max(self._high, pk)
+        self._synced_at = time.monotonic()
+
+    def _rebuild(self):
+        high = BlacklistedToken.objects.aggregate(m=Max("id"))["m"] or 0
+        live = BlacklistedToken.objects.filter(id__lte=high, token__expires_at__gt=timezone.now())
+        bloom = BloomFilter(max(self._setting("CAPACITY"), live.count() * 2), self._setting("ERROR_RATE"))
+        for _, jti in self._rows(live):
+            bloom.add(jti)
+        self._bloom, self._high, self._pid = bloom, high, os.getpid()
+        self._synced_at = time.monotonic()
+        self.rebuilds += 1
+
+    def _rows(self, qs):
+        return qs.order_by().values_list("id", "token__jti").iterator(chunk_size=self._setting("CHUNK_SIZE"))
+
+    def rebuild(self):
+        with self._lock:
+            self._rebuild()
+
+    # ----------------------
+    # COUNTERS
+    # ----------------------
+    def stats(self):
+        bloom = self._bloom
+        return {
+            "entries": bloom.count if bloom else 0,
+            "capacity": bloom.capacity if bloom else 0,
+            "bytes": len(bloom.bits) if bloom else 0,
+            "high_water_mark": self._high,
+            "lookups": self.lookups,
+            "skipped_db": self.skipped_db,
+            "db_checks": self.db_checks,
+            "false_positives": self.false_positives,
+            "rebuilds": self.rebuilds,
+        }
+
+
+blacklist_filter = BlacklistFilter()
@@ -0,0 +1,58 @@
+# core/repositories/token_repository.py
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from django_backend_starter.core.repositories.token_blacklist_filter import blacklist_filter
+
+
+class TokenRepository:
+    def revoke_for_users(self, user_ids) -> dict:
+        """
+        Blacklists every unexpired, not yet blacklisted refresh token of `user_ids`
+        with one SELECT and one bulk INSERT; returns {user_id: tokens revoked}.
+        """
+        if not user_ids:
+            return {}
+        tokens = list(
+            OutstandingToken.objects.filter(
+                user_id__in=user_ids,
+                expires_at__gt=timezone.now(),
+                blacklistedtoken__isnull=True,
+            ).values_list("id", "user_id", "jti")
+        )
+        # ignore_conflicts: a token blacklisted concurrently (logout, rotation) is already revoked
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id, _, _ in tokens],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        for _, _, jti in tokens:
+            blacklist_filter.add(jti)
+        return dict(Counter(user_id for _, user_id, _ in tokens))
+
+    def delete_expired(self, chunk_size=5000, max_chunks=None, on_chunk=None) -> int:
+        """
+        Deletes expired OutstandingToken rows and their BlacklistedToken rows in
+        chunks of `chunk_size`, one short transaction per chunk, so the tables
+        are never locked for long. Returns the number of outstanding rows deleted.
+        """
+        now = timezone.now()
+        deleted = chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by("id").values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                count, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += count
+            chunks += 1
+            if on_chunk:
+                on_chunk(count, ids[-1])
+        return deleted
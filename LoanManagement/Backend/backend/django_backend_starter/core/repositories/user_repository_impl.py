@@ -1,11 +1,28 @@
+from asgiref.sync import sync_to_async
 from django_backend_starter.core.entities.user import UserEntity
 from django_backend_starter.core.interfaces.user_repository import IUserRepository
-from django_backend_starter.apps.loan.models import UserModel
-from django.contrib.auth import authenticate
+from django_backend_starter.apps.loan.models import UserModel, AdminAudit, MAX_FAILED_ATTEMPTS
+from django_backend_starter.core.repositories.db_routing import read_alias, replica_read
+from django_backend_starter.core.repositories.org_summary import org_summary
+from django_backend_starter.core.repositories.principal_cache import invalidate_principals
+from django_backend_starter.core.repositories.sqlite_writer import sqlite_writer
+from django_backend_starter.core.repositories.token_repository import TokenRepository
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 User = get_user_model()
 
+DEFAULT_AGENT_PASSWORD = "Agent@123"
+
+# Column order matches UserEntity, so projected rows map straight onto it
+AGENT_LIST_FIELDS = (
+    "id", "email", "employee_id", "first_name", "last_name",
+    "contact_number", "role", "branch", "region", "is_active",
+)
+AGENT_LIST_ORDERINGS = ("employee_id", "id")
+
 class UserRepositoryImpl(IUserRepository):
     def get_by_email(self, email: str):
         try:
@@ -22,26 +39,73 @@ class UserRepositoryImpl(IUserRepository):
         except UserModel.DoesNotExist:
             return None
 
-    def authenticate_user(self, email, password):
+    def authenticate_user(self, email, password, count_failure=None):
+        """
+        Returns (user, None) on success, (user, error) for a locked account and
+        (None, error) otherwise. Loads the user once and verifies the hash once
+        (the same checks ModelBackend.authenticate makes, without its second SELECT).
+
+        `count_failure()` records a failed attempt outside the DB and returns the
+        recent failure count for this email; the user row is then only written
+        when that count reaches MAX_FAILED_ATTEMPTS. Without it every failure
+        is counted on the row as before.
+        """
         user = User.objects.filter(email=email).first()
         if not user:
+            if count_failure:
+                count_failure()
             return None, "Invalid credentials"
 
         if user.is_locked():
-            return None, f"Account locked until {user.lockout_until}"
+            return user, f"Account locked until {user.lockout_until}"
 
-        authenticated_user = authenticate(username=email, password=password)
-        if authenticated_user:
-            user.reset_failed_attempts()
+        if user.check_password(password) and user.is_active:
+            if user.failed_login_attempts or user.lockout_until:
+                sqlite_writer.run(user.reset_failed_attempts)  # only write when there is lockout state to clear
             return user, None  # <-- return model instance, not UserEntity
+        elif count_failure:
+            failures = count_failure()
+            if failures >= MAX_FAILED_ATTEMPTS:
+                sqlite_writer.run(user.lock_out, failures)
+                return user, f"Account locked until {user.lockout_until}"
+            return None, "Invalid credentials"
+        else:
+            sqlite_writer.run(user.register_failed_attempt)
+            return None, "Invalid credentials"
+
+    async def aauthenticate_user(self, email, password, count_failure=None):
+        """
+        authenticate_user() for async callers: the SELECT and the writes are awaited
+        and the hash check runs on the hashing executor, never on the event loop.
+        `count_failure()` runs in a thread as well, since the cache may be remote.
+        """
+        user = await User.objects.filter(email=email).afirst()
+        if not user:
+            if count_failure:
+                await sync_to_async(count_failure)()
+            return None, "Invalid credentials"
+
+        if user.is_locked():
+            return user, f"Account locked until {user.lockout_until}"
+
+        if await user.acheck_password(password) and user.is_active:
+            if user.failed_login_attempts or user.lockout_until:
+                await sqlite_writer.arun(user.reset_failed_attempts)
+            return user, None
+        elif count_failure:
+            failures = await sync_to_async(count_failure)()
+            if failures >= MAX_FAILED_ATTEMPTS:
+                await sqlite_writer.arun(user.lock_out, failures)
+                return user, f"Account locked until {user.lockout_until}"
+            return None, "Invalid credentials"
         else:
-            user.register_failed_attempt()
+            await sqlite_writer.arun(user.register_failed_attempt)
             return None, "Invalid credentials"
 
     def create_agent(self, email, first_name, last_name, contact_number=None, branch=None, region=None) -> UserEntity:
         user = User.objects.create_user(
             email=email,
-            password="Agent@123",   # default password
+            password=DEFAULT_AGENT_PASSWORD,
             first_name=first_name,
             last_name=last_name,
             contact_number=contact_number,
@@ -66,22 +130,148 @@ class UserRepositoryImpl(IUserRepository):
     
     
     
-    def get_all_agents(self):
-        qs = UserModel.objects.filter(role="agent")
-        return [
-        UserEntity(
-            id=str(u.id),
-            email=u.email,
-            employee_id=u.employee_id,  # <-- add this
-            first_name=u.first_name,
-            last_name=u.last_name,
-            contact_number=u.contact_number,
-            role=u.role,
-            branch=u.branch,
-            region=getattr(u, "region", ""),
-            is_active=u.is_active
+    def existing_emails(self, emails) -> set:
+        if not emails:
+            return set()
+        # Matched case-insensitively, like the unique constraint; returned lowercased
+        return set(
+            UserModel.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in={email.lower() for email in emails})
+            .values_list("email_lower", flat=True)
         )
-        for u in qs
-    ]
+
+    def bulk_create_agents(self, rows, password_hashes, admin=None) -> int:
+        """Inserts pre-validated agent rows with pre-hashed passwords plus one CREATE_AGENT audit row each."""
+        users = [
+            UserModel(
+                email=row["email"],
+                password=password_hash,
+                first_name=row["first_name"],
+                last_name=row["last_name"],
+                contact_number=row["contact_number"],
+                role="agent",
+                branch=row["branch"],
+                region=row["region"],
+                is_active=True,
+            )
+            for row, password_hash in zip(rows, password_hashes)
+        ]
+        with transaction.atomic():
+            UserModel.objects.bulk_create(users)
+            AdminAudit.objects.bulk_create(
+                [AdminAudit(admin=admin, target_user=user, action="CREATE_AGENT") for user in users]
+            )
+        return len(users)
+
+    def set_suspension(self, suspend, admin=None, user_ids=None, branch=None, region=None, reason=None) -> list:
+        """
+        Suspends or reactivates the users in `user_ids`, or every agent in `branch`/`region`.
+
+        Runs in one transaction: one SELECT of the targets, one UPDATE, one bulk INSERT
+        of AdminAudit rows and, when suspending, one bulk blacklist of the users'
+        refresh tokens. Returns one {"user_id", "status", "tokens_revoked"} per target;
+        status is "suspended"/"reactivated", "unchanged" (already in that state),
+        "not_found" or "skipped" (an admin's own account).
+        """
+        if user_ids is not None:
+            qs = UserModel.objects.filter(pk__in=user_ids)
+        elif branch or region:
+            qs = UserModel.objects.filter(role="agent")
+            if branch:
+                qs = qs.filter(branch=branch)
+            if region:
+                qs = qs.filter(region=region)
+        else:
+            raise ValueError("Provide user_ids, branch or region")
+
+        action, done = ("SUSPEND_USER", "suspended") if suspend else ("REACTIVATE_USER", "reactivated")
+        with transaction.atomic():
+            current = dict(qs.select_for_update().values_list("id", "is_suspended"))
+            skipped = {admin.pk} & current.keys() if admin is not None else set()
+            changed = [pk for pk, is_suspended in current.items() if is_suspended != suspend and pk not in skipped]
+
+            if changed:
+                UserModel.objects.filter(pk__in=changed).update(
+                    is_suspended=suspend,
+                    suspension_reason=reason if suspend else None,
+                    suspension_time=timezone.now() if suspend else None,
+                )
+                AdminAudit.objects.bulk_create(
+                    [AdminAudit(admin=admin, target_user_id=pk, action=action, reason=reason) for pk in changed],
+                    batch_size=500,
+                )
+                invalidate_principals(changed)
+                org_summary.invalidate()
+            revoked = TokenRepository().revoke_for_users(changed) if suspend else {}
+
+        changed = set(changed)
+        results = []
+        for pk in current:
+            status = done if pk in changed else "skipped" if pk in skipped else "unchanged"
+            results.append({"user_id": str(pk), "status": status, "tokens_revoked": revoked.get(pk, 0)})
+        if user_ids is not None:
+            found = {str(pk) for pk in current}
+            results += [
+                {"user_id": str(pk), "status": "not_found", "tokens_revoked": 0}
+                for pk in dict.fromkeys(map(str, user_ids)) if pk not in found
+            ]
+        return results
+
+    @replica_read("agents.list")
+    def list_agents(self, after=None, limit=50, order_by="employee_id", branch=None, region=None,
+                    is_active=None, is_suspended=None):
+        """
+        Returns one keyset page of agents as (entities, last_key).
+
+        Rows are fetched as value tuples (no model instances) and the page starts
+        strictly after `after`, so the cost of a page does not grow with the table.
+        `last_key` is None when there are no more rows.
+        """
+        qs = self._agent_queryset(after, order_by, branch, region, is_active, is_suspended)
+        rows = list(qs.values_list(*AGENT_LIST_FIELDS)[:limit + 1])
+        return self._agent_page(rows, limit, order_by)
+
+    @replica_read("agents.list")
+    async def alist_agents(self, after=None, limit=50, order_by="employee_id", branch=None, region=None,
+                           is_active=None, is_suspended=None):
+        """list_agents() for async callers."""
+        qs = self._agent_queryset(after, order_by, branch, region, is_active, is_suspended)
+        rows = [row async for row in qs.values_list(*AGENT_LIST_FIELDS)[:limit + 1]]
+        return self._agent_page(rows, limit, order_by)
+
+    @staticmethod
+    def _agent_page(rows, limit, order_by):
+        has_more = len(rows) > limit
+        entities = [UserEntity.from_row(row) for row in rows[:limit]]
+        if not has_more:
+            return entities, None
+        last = entities[-1]
+        return entities, getattr(last, order_by)
+
+    def iter_agents(self, after=None, limit=1000, order_by="employee_id", branch=None, region=None,
+                    is_active=None, is_suspended=None):
+        """Same rows as list_agents() but yielded from a server-side cursor, for streamed responses."""
+        qs = self._agent_queryset(after, order_by, branch, region, is_active, is_suspended)
+        # The rows are read after this returns, outside any replica_read scope: pick the alias now
+        qs = qs.using(read_alias("agents.stream"))
+        rows = qs.values_list(*AGENT_LIST_FIELDS)[:limit].iterator(chunk_size=2000)
+        return (UserEntity.from_row(row) for row in rows)
+
+    def _agent_queryset(self, after, order_by, branch, region, is_active, is_suspended):
+        if order_by not in AGENT_LIST_ORDERINGS:
+            raise ValueError(f"order_by must be one of {AGENT_LIST_ORDERINGS}")
+
+        qs = UserModel.objects.filter(role="agent")
+        if branch:
+            qs = qs.filter(branch=branch)
+        if region:
+            qs = qs.filter(region=region)
+        if is_active is not None:
+            qs = qs.filter(is_active=is_active)
+        if is_suspended is not None:
+            qs = qs.filter(is_suspended=is_suspended)
+        if after is not None:
+            qs = qs.filter(**{f"{order_by}__gt": after})
+        return qs.order_by(order_by)
 
 
@@ -0,0 +1,101 @@
+# core/services/agent_import_jobs.py
+import json
+import os
+import re
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+DEFAULTS = {
+    "DIR": "agent_imports",   # relative paths are resolved against BASE_DIR
+}
+
+JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def get_import_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "AGENT_IMPORT", {}))
+    directory = Path(conf["DIR"])
+    conf["DIR"] = directory if directory.is_absolute() else Path(settings.BASE_DIR) / directory
+    return conf
+
+
+class ImportJob:
+    """
+    An uploaded agent file imported in the background by `manage.py import_agents --job`.
+
+        <DIR>/<id>.<csv|jsonl>   the upload, removed once the import has finished
+        <DIR>/<id>.json          status: queued, running, done or failed, plus the summary so far
+        <DIR>/<id>.log           the import process's stderr
+
+    Hashing a password per row takes far longer than a request may, so the upload
+    view only stores the file and starts the job; admins poll the status instead.
+    """
+
+    def __init__(self, job_id, directory=None):
+        if not JOB_ID.fullmatch(job_id or ""):
+            raise ValueError("Unknown import job")
+        self.id = job_id
+        self.root = Path(directory) if directory else get_import_settings()["DIR"]
+
+    @property
+    def status_path(self):
+        return self.root / f"{self.id}.json"
+
+    @classmethod
+    def create(cls, upload, fmt, admin=None, directory=None):
+        """Stores `upload` (a Django UploadedFile) for a new queued job."""
+        job = cls(uuid.uuid4().hex, directory)
+        job.root.mkdir(parents=True, exist_ok=True)
+        with open(job.root / f"{job.id}.{fmt}", "wb") as f:
+            for chunk in upload.chunks():
+                f.write(chunk)
+        job.update(
+            id=job.id, status="queued", format=fmt, file_name=upload.name,
+            admin_email=admin.email if admin is not None else None, created_at=timezone.now().isoformat(),
+        )
+        return job
+
+    def command(self):
+        status = self.status()
+        argv = [
+            "import_agents", str(self.root / f"{self.id}.{status['format']}"),
+            "--format", status["format"], "--job", self.id,
+        ]
+        if status["admin_email"]:
+            argv += ["--admin-email", status["admin_email"]]
+        return argv
+
+    def start(self):
+        """Runs the import in its own process, so it outlives the request (and the worker's timeout)."""
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, sys.path)),  # same settings module as this process
+        }
+        with open(self.root / f"{self.id}.log", "ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "django", *self.command()], cwd=settings.BASE_DIR, env=env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log, start_new_session=True,
+            )
+
+    def status(self):
+        try:
+            return json.loads(self.status_path.read_text())
+        except FileNotFoundError:
+            return None
+
+    def update(self, **fields):
+        """Merges `fields` into the status file; readers never see a partial file."""
+        status = {**(self.status() or {}), **fields}
+        tmp = self.status_path.with_name(self.status_path.name + ".tmp")
+        tmp.write_text(json.dumps(status, default=str))
+        os.replace(tmp, self.status_path)
+
+    def finish(self, **fields):
+        self.update(finished_at=timezone.now().isoformat(), **fields)
+        (self.root / f"{self.id}.{self.status()['format']}").unlink(missing_ok=True)
@@ -0,0 +1,142 @@
+# core/services/agent_import_service.py
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError
+
+from django_backend_starter.core.repositories.user_repository_impl import DEFAULT_AGENT_PASSWORD
+from django_backend_starter.core.services.hashing_service import password_hashing
+
+IMPORT_FIELDS = ("email", "first_name", "last_name", "contact_number", "branch", "region")
+FIELD_MAX_LENGTHS = {"first_name": 30, "last_name": 30, "contact_number": 15, "branch": 100, "region": 100}
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_rows(stream, fmt):
+    """Yields (row_number, dict) pairs from a text stream without reading it all into memory."""
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(stream), start=2):  # row 1 is the header
+            yield number, row
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, ValueError(f"Invalid JSON: {e.msg}")
+                continue
+            yield number, row if isinstance(row, dict) else ValueError("Each line must be a JSON object")
+    else:
+        raise ValueError("Format must be 'csv' or 'jsonl'")
+
+
+def detect_format(filename, fmt=None):
+    if fmt:
+        return fmt.lower()
+    if filename and filename.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+class AgentImportService:
+    """
+    Streams agents from a CSV/JSONL file into the database in chunks.
+
+    Rows are validated as they are read, passwords for each chunk are hashed in
+    parallel on the hashing executor, and every chunk is written with bulk_create (agents plus their
+    CREATE_AGENT audit rows) in one transaction. Only one chunk is held in memory.
+    """
+
+    def __init__(self, repo, chunk_size=1000, hashing=None):
+        self.repo = repo
+        self.chunk_size = chunk_size
+        self.hashing = hashing or password_hashing
+
+    def validate_row(self, row):
+        if isinstance(row, Exception):
+            raise ValueError(str(row))
+        data = {field: (str(row.get(field) or "")).strip() for field in IMPORT_FIELDS}
+        if not data["contact_number"]:
+            data["contact_number"] = str(row.get("phone_number") or "").strip()
+        data["email"] = data["email"].lower()
+        try:
+            validate_email(data["email"])
+        except ValidationError:
+            raise ValueError("Invalid email address")
+        for field, max_length in FIELD_MAX_LENGTHS.items():
+            if len(data[field]) > max_length:
+                raise ValueError(f"{field} is longer than {max_length} characters")
+        data["password"] = str(row.get("password") or DEFAULT_AGENT_PASSWORD)
+        return data
+
+    def import_stream(self, stream, fmt, admin=None, on_error=None, on_chunk=None):
+        """
+        Imports every valid row and returns a summary dict.
+
+        `on_error(row_number, email, message)` is called for each rejected row; the
+        summary keeps at most MAX_REPORTED_ERRORS of them so memory stays bounded.
+        `on_chunk(summary)` is called with the summary so far after each chunk.
+        """
+        summary = {"rows": 0, "created": 0, "failed": 0, "errors": []}
+
+        def reject(number, email, message):
+            summary["failed"] += 1
+            if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+                summary["errors"].append({"row": number, "email": email, "error": message})
+            if on_error:
+                on_error(number, email, message)
+
+        rows = iter_rows(stream, fmt)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            summary["rows"] += len(chunk)
+            self._import_chunk(chunk, summary, reject, admin)
+            if on_chunk:
+                on_chunk(summary)
+        return summary
+
+    def _import_chunk(self, chunk, summary, reject, admin):
+        valid, seen = [], set()
+        for number, row in chunk:
+            try:
+                data = self.validate_row(row)
+            except ValueError as e:
+                email = row.get("email") if isinstance(row, dict) else None
+                reject(number, email, str(e))
+                continue
+            if data["email"] in seen:
+                reject(number, data["email"], "Duplicate email in file")
+                continue
+            seen.add(data["email"])
+            valid.append((number, data))
+
+        # Earlier chunks are already committed, so this also catches cross-chunk duplicates
+        existing = self.repo.existing_emails([data["email"] for _, data in valid])
+        pending = []
+        for number, data in valid:
+            if data["email"] in existing:
+                reject(number, data["email"], "Email already registered")
+            else:
+                pending.append((number, data))
+        if not pending:
+            return
+
+        hashes = self.hashing.make_passwords([data["password"] for _, data in pending])
+        try:
+            summary["created"] += self.repo.bulk_create_agents(
+                [data for _, data in pending], hashes, admin=admin
+            )
+        except IntegrityError:
+            # Someone else inserted one of these emails meanwhile; fall back to row-by-row
+            for (number, data), password_hash in zip(pending, hashes):
+                try:
+                    summary["created"] += self.repo.bulk_create_agents([data], [password_hash], admin=admin)
+                except IntegrityError as e:
+                    reject(number, data["email"], f"Could not create agent: {e}")
@@ -1,33 +1,89 @@
+from asgiref.sync import sync_to_async
+
 from django_backend_starter.apps.loan.models import UserModel
 from ..repositories.user_repository_impl import UserRepositoryImpl
 from ..repositories.audit_repository import AuditRepository
+from ..repositories.sqlite_writer import sqlite_writer
+from .login_throttle import LoginThrottle, LoginThrottled
 
 class AuthService:
-    def __init__(self):
-        self.user_repo = UserRepositoryImpl()  # ✅ concrete
-        self.audit_repo = AuditRepository()
+    def __init__(self, user_repo=None, audit_repo=None, throttle=None):
+        self.user_repo = user_repo or UserRepositoryImpl()  # ✅ concrete
+        self.audit_repo = audit_repo or AuditRepository()
+        self.throttle = throttle or LoginThrottle()
+
+    def login(self, email, password, ip=None, ua=None, issue=None):
+        """
+        Authenticates with one user SELECT and one hash check, then writes the audit row.
+
+        The SELECT and the hash check run outside any transaction, so on SQLite they
+        never hold the write lock. Failed-attempt and lockout writes are committed by
+        authenticate_user() (through sqlite_writer) before ValueError is
+        raised. On success `issue(user)` (e.g. a session login or JWT mint) runs in
+        the same write as the audit INSERT; its result is available as `user.issued`.
+
+        Requests over the failed-login throttle are rejected with LoginThrottled
+        before any user query or hash check; failures are counted in the cache
+        instead of on the user row. Only the first rejection per tripped key and
+        window writes a THROTTLED audit row, so a flood of throttled attempts costs
+        cache increments rather than one INSERT each.
+        """
+        allowed, retry_after, tripped = self.throttle.check(email, ip)
+        if not allowed:
+            if self.throttle.register_rejection(email, ip, tripped):
+                self.audit_repo.log_event(email=email, event_type="THROTTLED", ip=ip, ua=ua)
+            raise LoginThrottled(retry_after)
 
-    def login(self, email, password, ip=None, ua=None):
-        user, error = self.user_repo.authenticate_user(email, password)
+        count_failure = None
+        if self.throttle.enabled:
+            count_failure = lambda: self.throttle.register_failure(email, ip).get("email", 0)
+
+        user, error = self.user_repo.authenticate_user(email, password, count_failure=count_failure)
 
         if error:
-            # If user exists but is locked
-            if user is None:
-                self.audit_repo.log_event(
-                    email=email, event_type="FAILURE", ip=ip, ua=ua
-                )
-                raise ValueError(error)
-
-            if error.startswith("Account locked"):
-                self.audit_repo.log_event(
-                    user=user, email=email, event_type="LOCKOUT", ip=ip, ua=ua
-                )
-                raise ValueError(error)
-
-        # Success
-        self.audit_repo.log_event(user=user, email=email, event_type="SUCCESS", ip=ip, ua=ua)
+            # user is only returned for a locked account
+            event_type = "LOCKOUT" if user is not None else "FAILURE"
+            self.audit_repo.log_event(
+                user=user, email=email, event_type=event_type, ip=ip, ua=ua
+            )
+        else:
+            # Success
+            sqlite_writer.run(self._complete_login, user, email, ip, ua, issue)
+            self.throttle.reset(email, ip)
+
+        if error:
+            raise ValueError(error)
         return user
 
+    async def alogin(self, email, password, ip=None, ua=None, issue=None):
+        """
+        login() for async views. The SELECT, the hash check (on the hashing executor)
+        and the writes are awaited, so the event loop keeps serving other requests
+        meanwhile. `issue(user)` runs with the audit INSERT on the writer, as in login().
+        The throttle's cache calls (a network round trip on Redis or Memcached) run
+        in a thread too.
+        """
+        allowed, retry_after, tripped = await sync_to_async(self.throttle.check)(email, ip)
+        if not allowed:
+            if await sync_to_async(self.throttle.register_rejection)(email, ip, tripped):
+                await self.audit_repo.alog_event(email=email, event_type="THROTTLED", ip=ip, ua=ua)
+            raise LoginThrottled(retry_after)
+
+        count_failure = None
+        if self.throttle.enabled:
+            count_failure = lambda: self.throttle.register_failure(email, ip).get("email", 0)
 
+        user, error = await self.user_repo.aauthenticate_user(email, password, count_failure=count_failure)
+
+        if error:
+            event_type = "LOCKOUT" if user is not None else "FAILURE"
+            await self.audit_repo.alog_event(user=user, email=email, event_type=event_type, ip=ip, ua=ua)
+            raise ValueError(error)
 
-        
+        await sqlite_writer.arun(self._complete_login, user, email, ip, ua, issue)
+        await sync_to_async(self.throttle.reset)(email, ip)
+        return user
+
+    def _complete_login(self, user, email, ip, ua, issue):
+        self.audit_repo.log_event(user=user, email=email, event_type="SUCCESS", ip=ip, ua=ua)
+        user.issued = issue(user) if issue else None
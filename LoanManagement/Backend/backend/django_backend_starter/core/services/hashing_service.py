@@ -0,0 +1,234 @@
+# core/services/hashing_service.py
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+DEFAULTS = {
+    "BACKEND": "process",  # "process" | "thread" | "inline"
+    "WORKERS": 2,          # pool size per web worker process
+    "TIMEOUT": 30,         # seconds a caller waits on the pool before hashing inline instead
+}
+
+
+def get_hashing_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "PASSWORD_HASHING", {}))
+    return conf
+
+
+def _init_worker():
+    # Spawned (non-forked) workers start without a configured Django
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def _run(op, args, submitted_at):
+    """Executes one hashing op in a worker and reports when it started and how long it took."""
+    started_at = time.time()
+    t = time.perf_counter()
+    if op == "make":
+        result = hashers.make_password(*args)
+    else:
+        result = hashers.check_password(*args)
+    return result, started_at - submitted_at, time.perf_counter() - t
+
+
+class _OpStats:
+    __slots__ = ("count", "wait_ms", "compute_ms", "max_wait_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.wait_ms = 0.0
+        self.compute_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_wait_ms": round(self.wait_ms, 3),
+            "total_compute_ms": round(self.compute_ms, 3),
+            "avg_wait_ms": round(self.wait_ms / self.count, 3) if self.count else 0.0,
+            "avg_compute_ms": round(self.compute_ms / self.count, 3) if self.count else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 3),
+        }
+
+
+class HashingService:
+    """
+    Runs password hashing and verification off the request thread.
+
+    With BACKEND "process" the work goes to a dedicated process pool, so PBKDF2 does
+    not hold the worker's GIL; "thread" uses a thread pool and "inline" runs in the
+    caller. Sync callers block on the result, async callers await it. Queue wait and
+    compute time are tracked separately per operation.
+    """
+
+    def __init__(self, backend=None, workers=None, timeout=None):
+        self._overrides = {"BACKEND": backend, "WORKERS": workers, "TIMEOUT": timeout}
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stats = {"make": _OpStats(), "check": _OpStats()}
+        # per thread under WSGI, per request task under ASGI (so concurrent requests don't mix)
+        self._context_ms = contextvars.ContextVar(f"hashing_ms_{id(self)}", default=0.0)
+        self.inline_fallbacks = 0
+
+    def _setting(self, name):
+        # Read lazily so the module-level instance follows settings (and override_settings)
+        value = self._overrides[name]
+        return value if value is not None else get_hashing_settings()[name]
+
+    @property
+    def backend(self):
+        return self._setting("BACKEND")
+
+    @property
+    def workers(self):
+        return self._setting("WORKERS")
+
+    @property
+    def timeout(self):
+        return self._setting("TIMEOUT")
+
+    # ----------------------
+    # EXECUTOR
+    # ----------------------
+    def _get_executor(self):
+        if self.backend == "inline":
+            return None
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Pools do not survive fork; every worker process builds its own
+                if self.backend == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hashing")
+                self._pid = os.getpid()
+            return self._executor
+
+    def _submit(self, op, *args):
+        executor = self._get_executor()
+        if executor is None:
+            return None
+        try:
+            return executor.submit(_run, op, args, time.time())
+        except (BrokenProcessPool, RuntimeError):
+            self.shutdown()
+            return None
+
+    def _record(self, op, queue_wait, compute):
+        stats = self._stats[op]
+        stats.count += 1
+        stats.wait_ms += queue_wait * 1000
+        stats.compute_ms += compute * 1000
+        stats.max_wait_ms = max(stats.max_wait_ms, queue_wait * 1000)
+        self._context_ms.set(self._context_ms.get() + (queue_wait + compute) * 1000)
+
+    def context_time_ms(self):
+        """Hashing time (queue wait + compute) spent so far by the current thread or async task."""
+        return self._context_ms.get()
+
+    def _result(self, op, future, args):
+        if future is not None:
+            try:
+                result, queue_wait, compute = future.result(self.timeout)
+                self._record(op, queue_wait, compute)
+                return result
+            except BrokenProcessPool:
+                self.shutdown()
+            except TimeoutError:
+                future.cancel()  # the pool is backed up; drop the job if it has not started
+        # inline backend, the pool died or it timed out: do the work here rather than fail the request
+        if self.backend != "inline":
+            self.inline_fallbacks += 1
+        result, queue_wait, compute = _run(op, args, time.time())
+        self._record(op, queue_wait, compute)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ----------------------
+    # SYNC API
+    # ----------------------
+    def make_password(self, password):
+        return self._result("make", self._submit("make", password), (password,))
+
+    def check_password(self, password, encoded):
+        return self._result("check", self._submit("check", password, encoded), (password, encoded))
+
+    def make_passwords(self, passwords):
+        futures = [self._submit("make", password) for password in passwords]
+        return [self._result("make", f, (p,)) for f, p in zip(futures, passwords)]
+
+    def check_any(self, password, hashes):
+        """True if `password` matches any of `hashes`; returns on the first match."""
+        futures = {self._submit("check", password, h): h for h in hashes}
+        if None in futures:
+            return any(self._result("check", None, (password, h)) for h in hashes)
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=self.timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # Timed out on the pool: check what is left here, like _result()
+                    return any(self._result("check", None, (password, futures[f])) for f in pending)
+                for future in done:
+                    if self._result("check", future, (password, futures[future])):
+                        return True
+            return False
+        finally:
+            for future in pending:
+                future.cancel()  # drop checks that have not started yet
+
+    # ----------------------
+    # ASYNC API
+    # ----------------------
+    async def _aresult(self, op, args):
+        future = self._submit(op, *args)
+        if future is None:
+            # inline backend (or a dead pool): still keep the hash off the event loop
+            if self.backend != "inline":
+                self.inline_fallbacks += 1
+            result, queue_wait, compute = await asyncio.to_thread(_run, op, args, time.time())
+        else:
+            try:
+                result, queue_wait, compute = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except TimeoutError:
+                future.cancel()
+                self.inline_fallbacks += 1
+                result, queue_wait, compute = await asyncio.to_thread(_run, op, args, time.time())
+        self._record(op, queue_wait, compute)  # here, so the time lands in the caller's context
+        return result
+
+    async def amake_password(self, password):
+        return await self._aresult("make", (password,))
+
+    async def acheck_password(self, password, encoded):
+        return await self._aresult("check", (password, encoded))
+
+    # ----------------------
+    # METRICS
+    # ----------------------
+    def stats(self):
+        return {
+            "backend": self.backend,
+            "workers": self.workers,
+            "inline_fallbacks": self.inline_fallbacks,
+            **{op: s.as_dict() for op, s in self._stats.items()},
+        }
+
+
+password_hashing = HashingService()
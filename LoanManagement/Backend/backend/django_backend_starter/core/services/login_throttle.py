@@ -0,0 +1,157 @@
+# core/services/login_throttle.py
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULTS = {
+    "ENABLED": True,
+    "ALIAS": "default",   # locmem in dev/tests, a shared cache (Redis, Memcached) in production
+    "WINDOW": 900,        # seconds the sliding window covers
+    "LIMITS": {           # failures allowed per window before requests are rejected
+        "email": 5,
+        "ip": 50,
+        "email_ip": 5,
+    },
+    "KEY_PREFIX": "login-throttle",
+}
+
+
+class LoginThrottled(ValueError):
+    """A login attempt rejected by the throttle; `retry_after` is in seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many failed login attempts. Try again in {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+def get_throttle_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "LOGIN_THROTTLE", {}))
+    conf["LIMITS"] = {**DEFAULTS["LIMITS"], **conf.get("LIMITS", {})}
+    return conf
+
+
+class LoginThrottle:
+    """
+    Sliding-window counter of failed logins keyed by email, IP and (email, IP).
+
+    Each key keeps two fixed buckets (current and previous window) in the cache; the
+    sliding count weights the previous bucket by how much of it still overlaps the
+    window. Counting and checking never touch the database or a password hash.
+    """
+
+    def __init__(self, conf=None, clock=time.time):
+        self.conf = conf or get_throttle_settings()
+        self.cache = caches[self.conf["ALIAS"]]
+        self.clock = clock
+
+    @property
+    def enabled(self):
+        return self.conf["ENABLED"]
+
+    def _identities(self, email, ip):
+        email = (email or "").strip().lower()
+        idents = {}
+        if email:
+            idents["email"] = email
+        if ip:
+            idents["ip"] = ip
+        if email and ip:
+            idents["email_ip"] = f"{email}|{ip}"
+        return idents
+
+    def _key(self, kind, ident, bucket):
+        digest = hashlib.sha1(ident.encode()).hexdigest()  # keeps keys short and cache-safe
+        return f"{self.conf['KEY_PREFIX']}:{kind}:{digest}:{bucket}"
+
+    def _window_state(self):
+        window = self.conf["WINDOW"]
+        now = self.clock()
+        bucket = int(now // window)
+        overlap = 1 - (now % window) / window  # share of the previous bucket still inside the window
+        return window, now, bucket, overlap
+
+    def _counts(self, idents):
+        window, now, bucket, overlap = self._window_state()
+        keys = {}
+        for kind, ident in idents.items():
+            keys[kind] = (self._key(kind, ident, bucket), self._key(kind, ident, bucket - 1))
+        values = self.cache.get_many([k for pair in keys.values() for k in pair])
+        counts = {}
+        for kind, (current, previous) in keys.items():
+            counts[kind] = values.get(current, 0) + values.get(previous, 0) * overlap
+        return counts
+
+    def check(self, email, ip):
+        """Returns (allowed, retry_after_seconds, tripped_kinds) without counting the attempt."""
+        if not self.enabled:
+            return True, 0, []
+        limits = self.conf["LIMITS"]
+        counts = self._counts(self._identities(email, ip))
+        tripped = [kind for kind, count in counts.items() if count >= limits[kind]]
+        if not tripped:
+            return True, 0, []
+        window, now, _, _ = self._window_state()
+        return False, math.ceil(window - (now % window)), tripped
+
+    def register_failure(self, email, ip):
+        """Counts one failed attempt and returns the sliding counts per key kind."""
+        if not self.enabled:
+            return {}
+        window, _, bucket, _ = self._window_state()
+        idents = self._identities(email, ip)
+        for kind, ident in idents.items():
+            key = self._key(kind, ident, bucket)
+            self.cache.add(key, 0, timeout=window * 2)
+            try:
+                self.cache.incr(key)
+            except ValueError:  # evicted between add() and incr()
+                self.cache.set(key, 1, timeout=window * 2)
+        return self._counts(idents)
+
+    def register_rejection(self, email, ip, tripped):
+        """
+        Counts one throttled attempt against each tripped key kind (as returned by check()).
+
+        Returns True for the first rejection of any of those keys in the current window:
+        only that one is worth an audit row, the rest of a flood stays a counter here.
+        """
+        if not self.enabled:
+            return False
+        window, _, bucket, _ = self._window_state()
+        idents = self._identities(email, ip)
+        first = False
+        for kind in tripped:
+            key = self._key(f"rejected-{kind}", idents[kind], bucket)
+            if self.cache.add(key, 1, timeout=window * 2):
+                first = True
+                continue
+            try:
+                self.cache.incr(key)
+            except ValueError:  # evicted between add() and incr()
+                self.cache.set(key, 1, timeout=window * 2)
+        return first
+
+    def rejections(self, email, ip):
+        """Throttled attempts per key kind in the current window, as counted by register_rejection()."""
+        if not self.enabled:
+            return {}
+        _, _, bucket, _ = self._window_state()
+        keys = {kind: self._key(f"rejected-{kind}", ident, bucket)
+                for kind, ident in self._identities(email, ip).items()}
+        values = self.cache.get_many(list(keys.values()))
+        return {kind: values.get(key, 0) for kind, key in keys.items()}
+
+    def reset(self, email, ip):
+        """Clears the per-email counters after a successful login; the per-IP counter is kept."""
+        if not self.enabled:
+            return
+        _, _, bucket, _ = self._window_state()
+        idents = self._identities(email, ip)
+        idents.pop("ip", None)
+        self.cache.delete_many([
+            self._key(kind, ident, b) for kind, ident in idents.items() for b in (bucket, bucket - 1)
+        ])
@@ -1,12 +1,17 @@
-from datetime import timezone
-from core.interfaces.user_repository import IUserRepository as UserRepository
-from core.entities.user import  UserEntity
-from django_backend_starter.apps.loan.models import UserModel, AdminAudit, PasswordHistory
-from django.contrib.auth.hashers import check_password
+import uuid
+
+from django_backend_starter.core.interfaces.user_repository import IUserRepository as UserRepository
+from django_backend_starter.core.entities.user import UserEntity
+from django_backend_starter.apps.loan.models import UserModel, PasswordHistory
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from .hashing_service import password_hashing
 
 User = get_user_model()
 
+MAX_BULK_USERS = 5000
+
 class UserService:
     def __init__(self, repo: UserRepository):
         self.repo = repo
@@ -34,41 +39,60 @@ class UserService:
 
 
     def suspend_user(self, admin: UserModel, user: UserModel, reason: str):
-        user.suspend(reason)
-        AdminAudit.objects.create(
-            admin=admin,
-            target_user=user,
-            action="SUSPEND_USER",
-            reason=reason
-        )
+        self.bulk_suspend(admin, user_ids=[user.pk], reason=reason)
+        user.refresh_from_db(fields=["is_suspended", "suspension_reason", "suspension_time"])
 
     def reactivate_user(self, admin: UserModel, user: UserModel):
-        user.reactivate()
-        AdminAudit.objects.create(
-            admin=admin,
-            target_user=user,
-            action="REACTIVATE_USER"
+        self.bulk_reactivate(admin, user_ids=[user.pk])
+        user.refresh_from_db(fields=["is_suspended", "suspension_reason", "suspension_time"])
+
+    def bulk_suspend(self, admin: UserModel, user_ids=None, branch=None, region=None, reason=""):
+        """Suspends the selected users and revokes their refresh tokens; returns per-user results."""
+        return self.repo.set_suspension(
+            True, admin=admin, user_ids=self._check_ids(user_ids), branch=branch, region=region, reason=reason
         )
-        
+
+    def bulk_reactivate(self, admin: UserModel, user_ids=None, branch=None, region=None):
+        return self.repo.set_suspension(
+            False, admin=admin, user_ids=self._check_ids(user_ids), branch=branch, region=region
+        )
+
+    @staticmethod
+    def _check_ids(user_ids):
+        if user_ids is None:
+            return None
+        if not isinstance(user_ids, (list, tuple)) or not user_ids:
+            raise ValueError("user_ids must be a non-empty list")
+        if len(user_ids) > MAX_BULK_USERS:
+            raise ValueError(f"At most {MAX_BULK_USERS} user_ids per request")
+        try:
+            return [uuid.UUID(str(pk)) for pk in user_ids]
+        except ValueError:
+            raise ValueError("user_ids must be UUIDs")
+
     def reset_password_admin(self, user: UserModel, new_password: str, history_limit=4):
-         # Check last N passwords
-        last_passwords = user.password_history.all()[:history_limit]
-        for old in last_passwords:
-            if check_password(new_password, old.password_hash):
-                raise ValueError(f"Cannot reuse the last {history_limit} passwords.")
+        """
+        Changes the password unless it matches one of the last `history_limit` ones.
 
-        # Save new password
-        user.set_password(new_password)
-        user.save()
+        History hashes are verified concurrently on the hashing executor (stopping at
+        the first match), the new password is hashed once,
+        only the password columns are updated and old history is pruned with one DELETE.
+        """
+        if not new_password:
+            raise ValueError("New password is required.")
+
+        # Check last N passwords
+        history = list(user.password_history.values_list("pk", "password_hash")[:history_limit])
+        if password_hashing.check_any(new_password, [password_hash for _, password_hash in history]):
+            raise ValueError(f"Cannot reuse the last {history_limit} passwords.")
 
-        
         user.set_password(new_password)
         user.password_last_changed = timezone.now()  # ✅ update last changed
-        user.save()
-        
-        PasswordHistory.objects.create(user=user, password_hash=user.password)
-        
-        # Optional: prune old history
-        if last_passwords.count() >= history_limit:
-            for old in last_passwords[history_limit:]:
-                old.delete()
\ No newline at end of file
+
+        with transaction.atomic():
+            user.save(update_fields=["password", "password_last_changed"])
+            entry = PasswordHistory.objects.create(user=user, password_hash=user.password)
+
+            # Prune everything but the newest `history_limit` entries
+            keep = [entry.pk] + [pk for pk, _ in history[:history_limit - 1]]
+            PasswordHistory.objects.filter(user=user).exclude(pk__in=keep).delete()
@@ -0,0 +1,242 @@
+# core/sessions/write_behind.py
+import atexit
+import logging
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends.base import VALID_KEY_CHARS
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+from django.utils.crypto import get_random_string
+
+from django_backend_starter.core.repositories.sqlite_writer import sqlite_writer
+from django_backend_starter.core.utils.shared_cache import is_shared_cache
+
+KEY_PREFIX = "django_backend_starter.sessions.write_behind"
+
+DEFAULTS = {
+    "FLUSH_INTERVAL": 1.0,  # seconds between background upserts to django_session
+    "MAX_PENDING": 10000,   # pending sessions before the caller flushes inline
+}
+
+logger = logging.getLogger("django.contrib.sessions")
+
+_DELETED = object()
+
+# Left in the cache under a deleted session's key, so no worker serves or re-saves it
+TOMBSTONE = "__deleted__"
+
+
+def get_write_behind_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "SESSION_WRITE_BEHIND", {}))
+    return conf
+
+
+class SessionWriteBehind:
+    """
+    Coalesces session writes per key and persists them to the session table in
+    the background: one bulk upsert and one bulk DELETE per flush.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.queued = 0
+        self.written = 0
+        self.deleted = 0
+        self.flush_count = 0
+        self.flush_errors = 0
+
+    def save(self, session_key, data, expire_date):
+        self._put(session_key, (dict(data), expire_date))
+
+    def delete(self, session_key):
+        self._put(session_key, _DELETED)
+
+    def pending(self, session_key):
+        """Returns (data, expire_date), _DELETED or None for a write this process has not flushed yet."""
+        return self._pending.get(session_key)
+
+    def _put(self, session_key, entry):
+        with self._lock:
+            self._pending[session_key] = entry
+            self.queued += 1
+            full = len(self._pending) >= get_write_behind_settings()["MAX_PENDING"]
+        if full:
+            self.flush()
+        else:
+            self._ensure_thread()
+
+    def flush(self):
+        from django.contrib.sessions.models import Session
+
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        store = SessionStore()
+        # A session logged out on another worker since this one saved it must stay deleted
+        cached = store._cache.get_many([KEY_PREFIX + key for key, entry in batch.items() if entry is not _DELETED])
+        deletes = [
+            key for key, entry in batch.items() if entry is _DELETED or cached.get(KEY_PREFIX + key) == TOMBSTONE
+        ]
+        saves = [
+            Session(session_key=key, session_data=store.encode(entry[0]), expire_date=entry[1])
+            for key, entry in batch.items() if key not in deletes
+        ]
+
+        def write():
+            Session.objects.bulk_create(
+                saves, batch_size=500, update_conflicts=True,
+                unique_fields=["session_key"], update_fields=["session_data", "expire_date"],
+            )
+            Session.objects.filter(session_key__in=deletes).delete()
+
+        try:
+            sqlite_writer.run(write)
+        except Exception:
+            self.flush_errors += 1
+            with self._lock:
+                # Retry on the next flush unless the session was written again meanwhile
+                for key, entry in batch.items():
+                    self._pending.setdefault(key, entry)
+            raise
+        finally:
+            self.flush_count += 1
+        self.written += len(saves)
+        self.deleted += len(deletes)
+        return len(batch)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="session-write-behind", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(get_write_behind_settings()["FLUSH_INTERVAL"])
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                logger.exception("Session write-behind flush failed")
+
+    def stats(self):
+        return {
+            "pending": len(self._pending),
+            "queued": self.queued,
+            "written": self.written,
+            "deleted": self.deleted,
+            "flush_count": self.flush_count,
+            "flush_errors": self.flush_errors,
+        }
+
+
+session_writer = SessionWriteBehind()
+
+
+@atexit.register
+def _flush_sessions():
+    try:
+        session_writer.flush()
+    except Exception:
+        pass
+
+
+class SessionStore(CachedDBStore):
+    """
+    Session engine that serves sessions from SESSION_CACHE_ALIAS and writes them
+    to the database behind the request (see SessionWriteBehind).
+
+    New session keys are claimed with an atomic cache add instead of a DB lookup,
+    so login, reads and updates run no session queries while the cache holds the
+    session; the database copy is what a cold cache falls back to.
+
+    Every worker has to see the others' sessions and logouts, so SESSION_CACHE_ALIAS
+    must be a shared cache; a deleted session leaves a tombstone there until it
+    would have expired.
+    """
+
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        if not is_shared_cache(settings.SESSION_CACHE_ALIAS):
+            raise ImproperlyConfigured(
+                "SESSION_STORE 'cache' needs SESSION_CACHE_ALIAS to be a shared cache (Redis, Memcached); "
+                f"'{settings.SESSION_CACHE_ALIAS}' is local to each process"
+            )
+        super().__init__(session_key)
+
+    def load(self):
+        pending = session_writer.pending(self.session_key) if self.session_key else None
+        data = None
+        try:
+            data = self._cache.get(self.cache_key)
+        except Exception:
+            pass  # invalid key for this cache backend: fall through to a new session
+        if pending is _DELETED or data == TOMBSTONE:
+            self._session_key = None
+            return {}
+        if data is None and pending is not None:
+            data = pending[0]
+        if data is None:
+            return super().load()
+        return data
+
+    def exists(self, session_key):
+        pending = session_writer.pending(session_key)
+        if pending is not None:
+            return pending is not _DELETED
+        return super().exists(session_key)
+
+    def create(self):
+        while True:
+            session_key = get_random_string(32, VALID_KEY_CHARS)
+            if self._cache.add(self.cache_key_prefix + session_key, {}, self.get_expiry_age()):
+                break
+        self._session_key = session_key
+        self.modified = True
+        self.save(must_create=True)
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if not must_create and self._cache.get(self.cache_key) == TOMBSTONE:
+            return  # logged out (on any worker) while this request held the session
+        data = self._get_session(no_load=must_create)
+        self._cache.set(self.cache_key, data, self.get_expiry_age())
+        session_writer.save(self.session_key, data, self.get_expiry_date())
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        self._cache.set(self.cache_key_prefix + session_key, TOMBSTONE, settings.SESSION_COOKIE_AGE)
+        session_writer.delete(session_key)
+
+    # Cache round trips are short and the queue is in-process, so the async API simply wraps the sync one
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    async def aexists(self, session_key):
+        return await sync_to_async(self.exists)(session_key)
+
+    async def acreate(self):
+        return await sync_to_async(self.create)()
+
+    async def asave(self, must_create=False):
+        return await sync_to_async(self.save)(must_create)
+
+    async def adelete(self, session_key=None):
+        return await sync_to_async(self.delete)(session_key)
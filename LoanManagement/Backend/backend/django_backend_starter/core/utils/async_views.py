@@ -0,0 +1,39 @@
+# core/utils/async_views.py
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers may be coroutines (DRF itself only dispatches sync handlers).
+
+    Authentication, permission and throttle checks (APIView.initial) may query the
+    database, so they run in the sync thread; the handler then runs on the event
+    loop and awaits its own DB and hashing work. Served by the ASGI application,
+    a worker is not held by a request while it waits. Under WSGI Django runs the
+    view in an event loop of its own, so the same view works in both deployments.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -1,4 +1,4 @@
-from rest_framework_simplejwt.tokens import RefreshToken
+from django_backend_starter.core.authentication.tokens import CompactRefreshToken
 
 def set_refresh_cookie(response, refresh_token):
     """
@@ -18,6 +18,6 @@ def rotate_refresh_token(old_refresh):
     """
     Rotate refresh token: issue new one and blacklist old one.
     """
-    new_refresh = RefreshToken.for_user(old_refresh.user)
+    new_refresh = CompactRefreshToken.for_user(old_refresh.user)
     old_refresh.blacklist()  # Requires simplejwt.token_blacklist app
     return new_refresh
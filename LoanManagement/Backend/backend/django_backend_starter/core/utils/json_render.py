@@ -0,0 +1,169 @@
+# core/utils/json_render.py
+import dataclasses
+import json
+import typing
+from json.encoder import encode_basestring
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class EntityJSONEncoder(JSONEncoder):
+    """DRF's encoder plus dataclass entities (slotted, so they have no __dict__)."""
+
+    def default(self, obj):
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+        return super().default(obj)
+
+
+# Same output as DRF's JSONRenderer defaults (UNICODE_JSON, COMPACT_JSON, STRICT_JSON)
+_fallback = EntityJSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode
+
+_encoders = {}
+
+
+_BOOLS = {True: "true", False: "false", None: "null"}
+
+
+def _key(key):
+    """A dict key as json.dumps writes it: bools, None, ints and floats become strings."""
+    if isinstance(key, str):
+        return encode_basestring(key)
+    if key is None or key is True or key is False:
+        return f'"{_BOOLS[key]}"'
+    if isinstance(key, (int, float)):
+        return f'"{_fallback(key)}"'  # int.__repr__ / float.__repr__; NaN and infinity raise
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _escape_separators(text):
+    # As JSONRenderer does: valid JSON, but U+2028/U+2029 end a line in JavaScript before ES2019
+    return text.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+
+
+# Inline expression per annotated type; {v} is the attribute access. None, or a value of
+# another type than annotated (an int in a bool field, a float in an int field), goes to
+# _fallback. Expressions sit inside a '-quoted f-string, so they cannot use ' themselves.
+_FIELD_TEMPLATES = {
+    str: "(_esc({v}) if type({v}) is str else _fallback({v}))",
+    bool: "(_bools[{v}] if type({v}) is bool else _fallback({v}))",
+    int: "(_int({v}) if type({v}) is int else _fallback({v}))",
+}
+
+
+def compile_encoder(cls):
+    """
+    Generates `encode(obj) -> str` for a dataclass as a single f-string: keys are
+    pre-encoded and each field is an inline expression picked from its annotation,
+    so encoding an entity makes no per-field type dispatch or function call.
+    """
+    hints = typing.get_type_hints(cls)
+    parts = []
+    for n, field in enumerate(dataclasses.fields(cls)):
+        template = _FIELD_TEMPLATES.get(hints.get(field.name), "_fallback({v})")
+        key = json.dumps(field.name).replace("{", "{{").replace("}", "}}")
+        parts.append(f"{',' if n else ''}{key}:{{{template.format(v='obj.' + field.name)}}}")
+    source = "def encode(obj):\n    return f'{{" + "".join(parts) + "}}'\n"
+    namespace = {
+        "_esc": encode_basestring, "_bools": _BOOLS, "_int": int.__repr__, "_fallback": _fallback,
+    }
+    exec(source, namespace)
+    return namespace["encode"]
+
+
+def encoder_for(cls):
+    encoder = _encoders.get(cls)
+    if encoder is None and dataclasses.is_dataclass(cls):
+        encoder = _encoders[cls] = compile_encoder(cls)
+    return encoder
+
+
+def _needs_walk(value):
+    return isinstance(value, (dict, list, tuple)) or encoder_for(type(value)) is not None
+
+
+def encode_json(value) -> str:
+    """
+    JSON for API payloads. Entities go through their compiled encoder; containers
+    holding entities are walked here; anything else is handed to DRF's encoder
+    in one call, so plain dicts and lists still use the C encoder. U+2028 and
+    U+2029 are escaped as JSONRenderer does.
+    """
+    out = []
+    _write(value, out)
+    return _escape_separators("".join(out))
+
+
+def _write(value, out):
+    encoder = encoder_for(type(value))
+    if encoder is not None:
+        out.append(encoder(value))
+    elif isinstance(value, dict):
+        if not any(_needs_walk(v) for v in value.values()):
+            out.append(_fallback(value))
+            return
+        out.append("{")
+        for n, (k, v) in enumerate(value.items()):
+            out.append(("," if n else "") + _key(k) + ":")
+            _write(v, out)
+        out.append("}")
+    elif isinstance(value, (list, tuple)):
+        out.append("[")
+        out.append(",".join(_encode_items(value)))
+        out.append("]")
+    else:
+        out.append(_fallback(value))
+
+
+def _encode_items(items):
+    if items:
+        first = type(items[0])
+        encoder = encoder_for(first)
+        if encoder is not None and all(type(item) is first for item in items):
+            return map(encoder, items)
+    if not any(_needs_walk(item) for item in items):
+        return map(_fallback, items)
+    return map(encode_json, items)
+
+
+def iter_json(envelope, key, items, chunk_size=1000, tail=None):
+    """
+    Yields `envelope` as JSON with `items` streamed in as the array under `key`,
+    `chunk_size` items per chunk, so large lists are never built as one string.
+    `tail()` may return members to append after the array (e.g. a cursor that is
+    only known once the items are exhausted).
+    """
+    head = encode_json({**{k: v for k, v in envelope.items() if k != key}, key: []})
+    # the placeholder array is always the last member
+    yield (head[:-3] + "[").encode()
+    chunk, separator = [], ""
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield _escape_separators(separator + ",".join(_encode_items(chunk))).encode()
+            chunk, separator = [], ","
+    if chunk:
+        yield _escape_separators(separator + ",".join(_encode_items(chunk))).encode()
+    extra = tail() if tail else None
+    yield ("]," + encode_json(extra)[1:]).encode() if extra else b"]}"
+
+
+def streaming_json_response(envelope, key, items, chunk_size=1000, tail=None, status=200):
+    return StreamingHttpResponse(
+        iter_json(envelope, key, items, chunk_size, tail), content_type="application/json", status=status
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes entities with compiled encoders and writes bytes directly."""
+    encoder_class = EntityJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            # Pretty-printing is for humans; the generic path is fine there
+            return super().render(data, accepted_media_type, renderer_context)
+        return encode_json(data).encode()
@@ -0,0 +1,157 @@
+# core/utils/metrics.py
+import os
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+DEFAULTS = {
+    "ENABLED": True,
+    "PREFIX": "probitas",
+    # request latency histogram bounds, in seconds
+    "BUCKETS": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+}
+
+# Per-series slots: count, latency sum, DB queries, DB seconds, hashing seconds, then one per bucket (+Inf last)
+_COUNT, _SECONDS, _QUERIES, _DB_SECONDS, _HASH_SECONDS, _BUCKETS = range(6)
+
+
+def get_metrics_settings():
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, "METRICS", {}))
+    return conf
+
+
+class RequestMetrics:
+    """
+    Per-process request aggregates sharded per thread. Each worker process keeps
+    its own, so the export labels every series with the worker's pid and a
+    scrape of one worker only covers its share of the traffic.
+
+    Each thread only ever writes its own shard, so recording a request takes no
+    lock (one lock per thread, once, to register the shard). Exporting sums the
+    shards; a scrape racing with a request may see it partially counted, which
+    the next scrape corrects.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []
+        self._register_lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._register_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, view, method, status, seconds, queries, db_seconds, hash_seconds):
+        key = (view, method, status)
+        shard = self._shard()
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = [0, 0.0, 0, 0.0, 0.0] + [0] * (len(self.buckets) + 1)
+        series[_COUNT] += 1
+        series[_SECONDS] += seconds
+        series[_QUERIES] += queries
+        series[_DB_SECONDS] += db_seconds
+        series[_HASH_SECONDS] += hash_seconds
+        series[_BUCKETS + bisect_left(self.buckets, seconds)] += 1
+
+    def totals(self):
+        """{(view, method, status): merged per-series slots} across all threads."""
+        merged = {}
+        with self._register_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, series in list(shard.items()):
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = list(series)
+                else:
+                    for i, value in enumerate(series):
+                        total[i] += value
+        return merged
+
+
+request_metrics = RequestMetrics(get_metrics_settings()["BUCKETS"])
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _flatten(prefix, stats):
+    for name, value in stats.items():
+        if isinstance(value, dict):
+            yield from _flatten(f"{prefix}_{name}", value)
+        elif isinstance(value, (bool, int, float)):
+            yield f"{prefix}_{name}", float(value)
+
+
+def component_stats():
+    """stats() of the in-process writers, caches and pools, keyed by component name."""
+    from django_backend_starter.core.repositories.audit_buffer import all_writer_stats
+    from django_backend_starter.core.repositories.db_routing import reads_by_alias
+    from django_backend_starter.core.repositories.sqlite_writer import sqlite_writer
+    from django_backend_starter.core.repositories.token_blacklist_filter import blacklist_filter
+    from django_backend_starter.core.services.hashing_service import password_hashing
+    from django_backend_starter.core.sessions.write_behind import session_writer
+
+    components = {f"audit_writer_{model.lower()}": stats for model, stats in all_writer_stats().items()}
+    components.update({
+        "password_hashing": password_hashing.stats(),
+        "jti_blacklist_filter": blacklist_filter.stats(),
+        "session_writer": session_writer.stats(),
+        "sqlite_writer": sqlite_writer.stats(),
+        "replica_reads": dict(reads_by_alias),
+    })
+    return components
+
+
+def render_prometheus():
+    """
+    Request aggregates and component stats in the Prometheus text exposition format
+    (0.0.4), for this worker process only: every series carries a pid label, so
+    scrapes of different workers never overwrite each other and can be summed
+    with `sum without (pid)`.
+    """
+    prefix = get_metrics_settings()["PREFIX"]
+    pid = os.getpid()  # per scrape: workers forked after import each have their own
+    totals = request_metrics.totals()
+    lines = []
+
+    name = f"{prefix}_request_duration_seconds"
+    lines += [f"# HELP {name} Request latency by view.", f"# TYPE {name} histogram"]
+    for (view, method, status), series in sorted(totals.items()):
+        labels = _labels(pid=pid, view=view, method=method, status=status)
+        cumulative = 0
+        for bound, count in zip(request_metrics.buckets + ("+Inf",), series[_BUCKETS:]):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {series[_SECONDS]:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {series[_COUNT]}")
+
+    for slot, suffix, help_text in (
+        (_QUERIES, "db_queries_total", "DB queries made by the request."),
+        (_DB_SECONDS, "db_seconds_total", "Time spent in DB queries made by the request."),
+        (_HASH_SECONDS, "hashing_seconds_total", "Password hashing time (queue wait + compute)."),
+    ):
+        name = f"{prefix}_request_{suffix}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (view, method, status), series in sorted(totals.items()):
+            value = series[slot]
+            lines.append(f"{name}{{{_labels(pid=pid, view=view, method=method, status=status)}}} "
+                         f"{value if slot == _QUERIES else f'{value:.6f}'}")
+
+    for component, stats in component_stats().items():
+        for metric, value in _flatten(f"{prefix}_{component}", stats):
+            lines += [f"# TYPE {metric} gauge", f"{metric}{{{_labels(pid=pid)}}} {value:g}"]
+    return "\n".join(lines) + "\n"
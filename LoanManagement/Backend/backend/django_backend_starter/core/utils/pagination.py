@@ -0,0 +1,68 @@
+# core/utils/pagination.py
+import base64
+import json
+import uuid
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(*values) -> str:
+    """Packs the last row's sort key(s) into an opaque, URL-safe cursor."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 1) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_limit(raw, default=50, maximum=200) -> int:
+    if raw in (None, ""):
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, maximum)
+
+
+def parse_bool(raw, name):
+    if raw in (None, ""):
+        return None
+    value = str(raw).lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    raise ValueError(f"{name} must be true or false")
+
+
+def parse_datetime_param(raw, name):
+    """Parses an ISO-8601 query parameter; naive values are taken in the current time zone."""
+    if raw in (None, ""):
+        return None
+    value = parse_datetime(str(raw))
+    if value is None:
+        raise ValueError(f"{name} must be an ISO-8601 datetime")
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def parse_uuid_param(raw, name):
+    if raw in (None, ""):
+        return None
+    try:
+        return uuid.UUID(str(raw))
+    except ValueError:
+        raise ValueError(f"{name} must be a UUID")
@@ -0,0 +1,18 @@
+# core/utils/shared_cache.py
+from django.conf import settings
+
+# Backends whose entries are only seen by the process that wrote them (or kept by none)
+PROCESS_LOCAL_BACKENDS = frozenset({
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+})
+
+
+def is_shared_cache(alias) -> bool:
+    """
+    True when every worker reading cache `alias` sees the writes and deletes of the
+    others (Redis, Memcached, database, file). Caches that other code invalidates
+    must be shared, or each worker keeps serving its own stale copy.
+    """
+    backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+    return backend not in PROCESS_LOCAL_BACKENDS
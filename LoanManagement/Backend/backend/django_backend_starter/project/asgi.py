@@ -0,0 +1,23 @@
+"""
+ASGI config for django_backend_starter project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/stable/howto/deployment/asgi/
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend_starter.project.settings')
+# Served from an event loop: route the hot endpoints to their async views
+os.environ.setdefault('ASYNC_VIEWS', 'on')
+
+application = get_asgi_application()
+
+# Same warm-up as wsgi.py, once per worker process (or once in a preloading master)
+if os.environ.get("DJANGO_WARMUP", "on") == "on":
+    from django_backend_starter.project.warmup import warm_up
+
+    warm_up(freeze=os.environ.get("DJANGO_GC_FREEZE", "on") == "on")
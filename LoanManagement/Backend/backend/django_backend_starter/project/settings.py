@@ -42,8 +42,10 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    'apps.loan.middleware.password_expiry.PasswordExpiryMiddleware',
+    "django_backend_starter.apps.loan.middleware.profile_snapshot.ProfileSnapshotAuthenticationMiddleware",
+    "django_backend_starter.apps.loan.middleware.read_your_writes.ReadYourWritesMiddleware",
+    "django_backend_starter.apps.loan.middleware.request_metrics.RequestMetricsMiddleware",
+    "django_backend_starter.apps.loan.middleware.password_expiry.PasswordExpiryMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -77,6 +79,15 @@ TEMPLATES = [
 # ----------------------
 WSGI_APPLICATION = "django_backend_starter.project.wsgi.application"
 
+# ----------------------
+# ASGI
+# ----------------------
+ASGI_APPLICATION = "django_backend_starter.project.asgi.application"
+# Route login, session login/me, audited JWT login and the agent list to their async
+# views. project/asgi.py turns this on; under WSGI each async view would need an
+# event loop of its own per request, so the sync views stay the default there.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "off") == "on"
+
 # ----------------------
 # DATABASE
 # ----------------------
@@ -85,7 +96,76 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # A file rather than SQLite's in-memory default, so tests that write from several
+        # threads see the same locking (and the WAL profile below) as a real deployment
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+    }
+}
+
+# SQLite production profile: WAL (readers never block the writer), a busy timeout instead
+# of immediate "database is locked", and write transactions that take the lock up front.
+# Write transactions that still hit a lock are retried with backoff (see SQLITE_WRITER).
+SQLITE_TUNING = {
+    "ENABLED": os.environ.get("SQLITE_TUNING", "on") == "on",
+    "BUSY_TIMEOUT_MS": 5000,
+    "SYNCHRONOUS": "NORMAL",           # durable in WAL mode except for the last commits on power loss
+    "MMAP_SIZE": 256 * 1024 * 1024,
+    "CACHE_SIZE_KB": 64 * 1024,
+}
+if SQLITE_TUNING["ENABLED"]:
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": ";".join((
+            "PRAGMA journal_mode=WAL",
+            f"PRAGMA busy_timeout={SQLITE_TUNING['BUSY_TIMEOUT_MS']}",
+            f"PRAGMA synchronous={SQLITE_TUNING['SYNCHRONOUS']}",
+            f"PRAGMA mmap_size={SQLITE_TUNING['MMAP_SIZE']}",
+            f"PRAGMA cache_size=-{SQLITE_TUNING['CACHE_SIZE_KB']}",
+            "PRAGMA temp_store=MEMORY",
+        )),
+        "transaction_mode": "IMMEDIATE",
+    }
+
+# ENABLED routes writes through one writer thread per process. bench_sqlite_logins has never
+# shown it beating direct writes on throughput (214 vs 285 logins/s, at best level at 8
+# threads with a lower p95 but a higher median), so it is off: writes run on the request
+# thread and are retried on lock errors with RETRIES/BACKOFF. SQLITE_WRITER=on to try it.
+SQLITE_WRITER = {
+    "ENABLED": os.environ.get("SQLITE_WRITER", "off") == "on",
+    "MAX_BATCH": 64,
+    "TIMEOUT": 30.0,
+    "RETRIES": 5,
+    "BACKOFF": 0.01,
+    "MAX_BACKOFF": 0.5,
+}
+
+# Read replicas, e.g. DB_REPLICAS="/var/lib/probitas/replica1.sqlite3:2,/var/lib/probitas/replica2.sqlite3"
+# (path[:weight]). Locally, sync_sqlite_replicas copies db.sqlite3 into each file.
+DATABASE_REPLICA_WEIGHTS = {}
+for _n, _spec in enumerate(filter(None, os.environ.get("DB_REPLICAS", "").split(",")), start=1):
+    _path, _, _weight = _spec.strip().partition(":")
+    DATABASES[f"replica_{_n}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": _path,
+        "TEST": {"MIRROR": "default"},
     }
+    DATABASE_REPLICA_WEIGHTS[f"replica_{_n}"] = int(_weight or 1)
+
+DATABASE_ROUTERS = ["django_backend_starter.core.repositories.db_routing.ReplicaRouter"]
+
+# Repository reads (replica_read names) that may be served by a replica; anything
+# else, anything inside a transaction and any read during a write request uses the primary
+DATABASE_ROUTING = {
+    "REPLICAS": DATABASE_REPLICA_WEIGHTS,
+    "ROUTED_READS": (
+        "agents.list",
+        "agents.stream",
+        "agents.search",
+        "audit.logins",
+        "audit.admin",
+        "audit.counts",
+        "rollup.series",
+    ),
+    "READ_YOUR_WRITES_SECONDS": 5,  # pinned by a signed cookie, and by CACHE_ALIAS when it is shared
 }
 
 # ----------------------
@@ -123,16 +203,44 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
 
 AUTH_USER_MODEL = "loan.UserModel"
 
+# Session requests resolve request.user through the principal cache
+AUTHENTICATION_BACKENDS = [
+    "django_backend_starter.core.authentication.principal_auth.CachedModelBackend",
+]
+
+# ----------------------
+# CACHES
+# ----------------------
+# Local memory per process; point "default" at Redis/Memcached to share across workers
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "probitas-default",
+    }
+}
+
+# Cached user principal (role, status, lockout, password age) used by authentication.
+# Needs a shared ALIAS: on a process-local cache (LocMemCache) it is off and auth reads the user row.
+PRINCIPAL_CACHE = {
+    "ALIAS": "default",
+    "TTL": 300,
+}
+
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         # allow both JWT and session auth
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "django_backend_starter.core.authentication.principal_auth.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        # encodes entities with precompiled per-class encoders (core/utils/json_render.py)
+        "django_backend_starter.core.utils.json_render.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 from datetime import timedelta
@@ -142,9 +250,31 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Blacklist lookups go through the in-process JTI filter (see JTI_BLACKLIST_FILTER)
+    "TOKEN_REFRESH_SERIALIZER": "django_backend_starter.core.authentication.tokens.CompactTokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "django_backend_starter.core.authentication.tokens.CompactTokenBlacklistSerializer",
+}
+
+# Per-process Bloom filter of blacklisted refresh-token JTIs; positives are confirmed in the DB
+JTI_BLACKLIST_FILTER = {
+    "ENABLED": True,
+    "CAPACITY": 1_000_000,
+    "ERROR_RATE": 0.001,
+    "REFRESH_INTERVAL": 1.0,
 }
 
 # Cookies for sessions (adjust for prod)
+# "db" is Django's database backend. "cache" serves sessions from SESSION_CACHE_ALIAS and
+# writes them to the DB in the background; it needs that alias to be a shared cache (Redis,
+# Memcached) and refuses to run on the process-local default.
+SESSION_STORE = os.environ.get("SESSION_STORE", "db")
+if SESSION_STORE == "cache":
+    SESSION_ENGINE = "django_backend_starter.core.sessions.write_behind"
+SESSION_WRITE_BEHIND = {
+    "FLUSH_INTERVAL": 1.0,
+    "MAX_PENDING": 10000,
+}
+
 SESSION_COOKIE_HTTPONLY = True
 CSRF_COOKIE_HTTPONLY = False
 SESSION_COOKIE_SECURE = False  # True in prod over HTTPS
@@ -161,3 +291,119 @@ CSRF_TRUSTED_ORIGINS = [
 
 # If you want credentials (cookies) to work with session auth:
 CORS_ALLOW_CREDENTIALS = True
+
+# ----------------------
+# LOGIN AUDIT BUFFER
+# ----------------------
+# "sync" commits every LoginAudit row before the response (the compliance default).
+# "buffered" queues rows in-process and writes them with bulk_create; events still in the
+# queue are lost if the process is killed, so only opt in where that is acceptable.
+AUDIT_BUFFER = {
+    "MODE": os.environ.get("AUDIT_BUFFER_MODE", "sync"),
+    "MAX_QUEUE": 10000,
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL": 1.0,
+    "OVERFLOW": "sync",  # "sync" | "block" | "drop_oldest" | "drop_newest"
+}
+
+# Each distinct User-Agent (and, optionally, client IP) of LoginAudit rows is stored once in a
+# lookup table. Migration 0007 moved the rows written before this into the tables;
+# run backfill_audit_dimensions after turning an option on to do the same
+AUDIT_DIMENSIONS = {
+    "USER_AGENTS": True,
+    "IP_ADDRESSES": False,
+    "CACHE_SIZE": 4096,
+}
+
+# ----------------------
+# EMPLOYEE IDS
+# ----------------------
+# Each worker reserves this many EMP### numbers at a time from the EmployeeIdSequence table
+EMPLOYEE_ID_BLOCK_SIZE = 50
+
+# ----------------------
+# FAILED LOGIN THROTTLE
+# ----------------------
+# Sliding-window failure counts per email, IP and (email, IP), kept in the cache
+LOGIN_THROTTLE = {
+    "ENABLED": True,
+    "ALIAS": "default",
+    "WINDOW": 900,
+    "LIMITS": {"email": 5, "ip": 50, "email_ip": 5},
+}
+
+# ----------------------
+# PASSWORD HASHING
+# ----------------------
+# PBKDF2 hashing/verification runs on a per-worker pool instead of the request thread.
+# "process" | "thread" | "inline"; WORKERS is the pool size per web worker process. A hash
+# not done within TIMEOUT seconds (pool backed up or dead) is computed inline instead.
+PASSWORD_HASHING = {
+    "BACKEND": os.environ.get("PASSWORD_HASHING_BACKEND", "process"),
+    "WORKERS": 2,
+    "TIMEOUT": 30,
+}
+
+# ----------------------
+# AGENT IMPORTS
+# ----------------------
+# agents/import/ stores the upload here and returns 202; a `manage.py import_agents --job`
+# process imports it and keeps <id>.json (status and row summary) next to it
+AGENT_IMPORT = {
+    "DIR": BASE_DIR / "agent_imports",
+}
+
+# ----------------------
+# AUDIT RETENTION
+# ----------------------
+# archive_audits moves audit rows older than RETENTION_DAYS into gzip JSONL segments under DIR
+AUDIT_ARCHIVE = {
+    "DIR": BASE_DIR / "audit_archive",
+    "RETENTION_DAYS": 180,
+    "BATCH_SIZE": 2000,
+}
+
+# ----------------------
+# LOGIN ACTIVITY ROLLUPS
+# ----------------------
+# Hourly counts behind audit/logins/rollup/, folded in from LoginAudit past a high-water mark
+# by `manage.py rollup_login_activity` (run it every minute or so); ids skipped by late
+# commits are re-checked for GAP_SECONDS. REFRESH_ON_READ makes the GET endpoint write.
+LOGIN_ROLLUP = {
+    "BATCH_SIZE": 5000,
+    "SETTLE_SECONDS": 10,
+    "GAP_SECONDS": 600,
+    "REFRESH_ON_READ": False,
+}
+
+# ----------------------
+# AGENT SEARCH
+# ----------------------
+# FTS5 index behind agents/search/, created by migration 0011 and kept in sync on user saves;
+# rebuild_agent_search refills it. Without it, search falls back to prefix matching on the user table
+AGENT_SEARCH = {
+    "WEIGHTS": {"name": 3.0, "email": 5.0, "employee_id": 10.0, "branch": 1.0, "region": 1.0},
+    "MAX_EXPANSIONS": 5,
+    "VOCABULARY_TTL": 300,
+}
+
+# ----------------------
+# ORG SUMMARY
+# ----------------------
+# Agent counts per region/branch behind agents/summary/, cached until an agent changes.
+# ALIAS must be a shared cache in production; on LocMem every request recomputes the counts.
+ORG_SUMMARY = {
+    "ALIAS": "default",
+    "TTL": 3600,
+}
+
+# ----------------------
+# METRICS
+# ----------------------
+# Per-view latency histograms, DB and hashing time, served on /api/metrics/ (admins only).
+# Each worker process exports its own aggregates, labelled with its pid; scrape every worker.
+METRICS = {
+    "ENABLED": True,
+    "PREFIX": "probitas",
+    "BUCKETS": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+}
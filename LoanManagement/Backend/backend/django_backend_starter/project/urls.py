@@ -3,6 +3,6 @@ from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path("api/", include("apps.loan.urls")),
+    path("api/", include("django_backend_starter.apps.loan.urls")),
 
 ]
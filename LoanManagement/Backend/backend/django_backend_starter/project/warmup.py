@@ -0,0 +1,50 @@
+# project/warmup.py
+import gc
+
+from django.apps import apps
+from django.contrib.auth.hashers import get_hashers
+from django.db import connections
+from django.urls import get_resolver
+
+
+def warm_up(freeze=True):
+    """
+    Loads what every worker needs before a prefork master forks: the URLconf (and
+    with it every view, service and repository module), model metadata, password
+    hashers, DRF/SimpleJWT settings and the compiled JSON encoders.
+
+    Nothing here opens a connection, starts a thread or builds a process pool;
+    those are created lazily in each worker. Connections opened by earlier code
+    are closed so workers never share a socket. With `freeze`, the objects
+    created so far are moved to the permanent GC generation, so collections in
+    the workers do not touch (and copy) the pages they live on.
+    """
+    get_resolver().url_patterns
+    get_resolver()._populate()
+
+    for model in apps.get_models():
+        model._meta.get_fields()
+        model._meta._property_names
+
+    get_hashers()
+
+    from rest_framework.settings import api_settings as drf_settings
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+    from rest_framework_simplejwt.state import token_backend
+
+    drf_settings.DEFAULT_AUTHENTICATION_CLASSES
+    drf_settings.DEFAULT_RENDERER_CLASSES
+    drf_settings.DEFAULT_PARSER_CLASSES
+    drf_settings.DEFAULT_PERMISSION_CLASSES
+    jwt_settings.AUTH_TOKEN_CLASSES
+    token_backend.get_leeway()
+
+    from django_backend_starter.core.entities.user import UserEntity
+    from django_backend_starter.core.utils.json_render import encoder_for
+
+    encoder_for(UserEntity)
+
+    connections.close_all()
+    if freeze:
+        gc.collect()
+        gc.freeze()
@@ -10,6 +10,13 @@ https://docs.djangoproject.com/en/stable/howto/deployment/wsgi/
 import os
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend_starter.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend_starter.project.settings')
 
 application = get_wsgi_application()
+
+# Under a preloading server (gunicorn --preload) this runs once in the master and
+# the workers fork with everything loaded; otherwise each worker warms up at boot.
+if os.environ.get("DJANGO_WARMUP", "on") == "on":
+    from django_backend_starter.project.warmup import warm_up
+
+    warm_up(freeze=os.environ.get("DJANGO_GC_FREEZE", "on") == "on")
@@ -3,9 +3,6 @@
 import os
 import sys
 
-import sys, os
-sys.path.append(os.path.join(os.path.dirname(__file__), "django_backend_starter"))
-
 
 def main():
     """Run administrative tasks."""
@@ -74,8 +74,9 @@ class Server {
   //   *******************
   // get agents
   //   *******************
-  static getAgents() {
+  static getAgents(params = {}) {
     return axios.get(`${BASE_API_URL}/all/agents/`, {
+      params,
       headers: {
         "Content-Type": "application/json",
         "X-CSRFToken": Server.getCSRFToken(),
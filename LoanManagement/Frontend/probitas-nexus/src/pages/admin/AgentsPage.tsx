@@ -92,13 +92,29 @@ const AgentsPage = () => {
     },
   });
 
+  // The listing is paginated: follow next_cursor until every agent is loaded
+  const fetchAllAgents = async () => {
+    const results: any[] = [];
+    let cursor: string | null = null;
+    do {
+      const response = await Server.getAgents({
+        stream: true,
+        limit: 10000,
+        ...(cursor ? { cursor } : {}),
+      });
+      results.push(...response.data.results);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return results;
+  };
+
   const getAgents = () => {
-    Server.getAgents()
-      .then((response) => {
-        console.log("Fetched agents:", response.data);
+    fetchAllAgents()
+      .then((results) => {
+        console.log("Fetched agents:", results.length);
 
         // Normalize keys
-        const normalizedAgents = response.data.map((agent: any) => ({
+        const normalizedAgents = results.map((agent: any) => ({
           ...agent,
           employeeId: agent.employee_id, // map to what your table expects
           phone: agent.contact_number,